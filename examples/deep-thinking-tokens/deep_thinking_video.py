@@ -11,6 +11,10 @@ Render:
   4K:     manim -qk deep_thinking_video.py DeepThinkingVideo
 """
 
+from pathlib import Path
+import importlib.util
+import sys
+
 from manim import *
 import numpy as np
 
@@ -65,12 +69,43 @@ THINK_DATA = [
     ("Think@n",   94.7, 155.4, GREEN),
 ]
 
+# ── Scaffold components ───────────────────────────────────────────────
+# The glyph cache behind txt(), the chart and dot-cloud components, the
+# frame pipeline and the scene timeline are the scaffold's, loaded from
+# references/manim-scaffold.py rather than pasted here. Leave FORMAT
+# unset: the scaffold sizes the frame on import, and this layout is
+# landscape only.
+def _load_scaffold(name="manim_scaffold"):
+    if name not in sys.modules:
+        path = (Path(__file__).resolve().parents[2] / "references"
+                / "manim-scaffold.py")
+        spec = importlib.util.spec_from_file_location(name, path)
+        sys.modules[name] = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(sys.modules[name])
+    return sys.modules[name]
+
+
+_load_scaffold()
+from manim_scaffold import (  # noqa: E402
+    GLYPHS, TIMELINE, BarSet, Chart, DotCloud, FadeRows, GrowBars, GrowDots,
+    frame_pipeline, peak_rss_mb, scene_timeline,
+)
+
 
 class DeepThinkingVideo(Scene):
     """Animated explainer for the Deep-Thinking Tokens paper."""
 
     FONT = "Avenir Next"
 
+    def setup(self):
+        frame_pipeline(self.renderer)
+        if TIMELINE:
+            scene_timeline(self)
+
+    def tear_down(self):
+        logger.info(f"Peak RSS {peak_rss_mb():.0f} MB "
+                    f"({config.pixel_width}x{config.pixel_height})")
+
     def construct(self):
         self.camera.background_color = BG
         self.character = None
@@ -107,11 +142,22 @@ class DeepThinkingVideo(Scene):
         max_mult_for_width = max_render_px / (char_w_factor * font_size * max(len(longest_line), 1))
         mult = min(10, 400 / max(font_size, 1), max_mult_for_width)
         mult = max(mult, 1)  # never go below 1x
-        t = Text(s, font=DeepThinkingVideo.FONT,
-                 font_size=round(font_size * mult),
-                 color=color, weight=weight, **kw)
-        t.scale(1 / mult)
-        return t
+
+        def build():
+            t = Text(s, font=DeepThinkingVideo.FONT,
+                     font_size=round(font_size * mult),
+                     color=color, weight=weight, **kw)
+            return t.scale(1 / mult)
+
+        # Memoized: repeated labels and warm re-renders skip Pango. The
+        # outlines are keyed without the color and recolored on the copy
+        # (unless kw colors substrings), so "r = 0" in any color is one
+        # entry
+        key = GLYPHS.key(s, DeepThinkingVideo.FONT, font_size, mult, weight,
+                         ManimColor(color).to_hex() if kw else None,
+                         sorted(kw.items()))
+        text = GLYPHS.get(key, s, build)
+        return text if kw else text.set_color(color)
 
     def pill(self, text, color, w=2.4, h=0.48, fs=20):
         """Pill-shaped label - frosted glass effect."""
@@ -125,31 +171,36 @@ class DeepThinkingVideo(Scene):
 
     def scene_wipe(self, target_pos=ORIGIN):
         """Fade out everything except persistent elements."""
-        keep = set()
-        if self.character:
-            keep.add(self.character)
-        if self.logo:
-            keep.add(self.logo)
-        others = [m for m in self.mobjects if m not in keep]
-        fade_anims = [FadeOut(m, shift=DOWN * 0.2) for m in others]
-        if fade_anims:
-            self.play(*fade_anims, run_time=0.5)
+        anims = self._wipe_anims()
+        if anims:
+            self.play(*anims, run_time=0.5)
 
     def scene_wipe_simple(self, target_pos=ORIGIN):
         """Simple wipe - fade everything."""
+        anims = self._wipe_anims()
+        if anims:
+            self.play(
+                *anims,
+                rate_func=rate_functions.ease_in_out_cubic,
+                run_time=0.5,
+            )
+
+    def _wipe_anims(self):
+        """All departing mobjects as one batched FadeOut (or no anims)."""
         keep = set()
         if self.character:
             keep.add(self.character)
         if self.logo:
             keep.add(self.logo)
         others = [m for m in self.mobjects if m not in keep]
-        fade_anims = [FadeOut(m, shift=DOWN * 0.2) for m in others]
-        if fade_anims:
-            self.play(
-                *fade_anims,
-                rate_func=rate_functions.ease_in_out_cubic,
-                run_time=0.5,
-            )
+        if not others:
+            return []
+        # play() would add the Group on top of everything; add it now and
+        # keep the persistent elements drawn over it
+        group = Group(*others)
+        self.add(group)
+        self.bring_to_front(*[m for m in self.mobjects if m in keep])
+        return [FadeOut(group, shift=DOWN * 0.2)]
 
     def glow_highlight(self, mobject, color=YELLOW):
         """Glow highlight around a mobject."""
@@ -167,6 +218,47 @@ class DeepThinkingVideo(Scene):
         ).move_to(mobject.get_center())
         return VGroup(outer, inner)
 
+    # ── Charts ──
+
+    def hbar_chart(self, data, top_y=2.1, bar_h=0.36, row_gap=0.14,
+                   zero_x=0.5, max_w=3.8, vmax=1.0, label_left=-6.2,
+                   fmt="{:+.3f}", label_fs=15, value_fs=14, radius=0.0,
+                   fill_opacity=0.88, emphasize=(), value_buff=0.1):
+        """Horizontal bars from (label, value, color) rows, top_y down.
+
+        Negative values grow left from zero_x, so this is also the
+        diverging chart. Labels are pinned to label_left; rows named in
+        `emphasize` get WHITE BOLD text, the rest MUTED.
+        """
+        names, vals, cols = zip(*data)
+        v = np.asarray(vals, dtype=float)
+        n = len(v)
+        y = top_y - np.arange(n) * (bar_h + row_gap)
+        w = np.abs(v) * max_w / vmax
+        neg = v < 0
+        x0 = np.where(neg, zero_x - w, zero_x)
+        bars = BarSet(
+            np.column_stack([x0, y - bar_h / 2, x0 + w, y + bar_h / 2]),
+            cols, np.where(neg[:, None], RIGHT, LEFT),
+            radius=radius, fill_opacity=fill_opacity,
+        )
+
+        labels, values = VGroup(), VGroup()
+        ends = np.where(neg, x0, x0 + w)
+        for name, val, yi, end, is_neg in zip(names, vals, y, ends, neg):
+            style = (dict(color=WHITE, weight=BOLD) if name in emphasize
+                     else dict(color=MUTED))
+            lbl = self.txt(name, font_size=label_fs, **style)
+            lbl.set_y(yi)
+            lbl.align_to(np.array([label_left, 0, 0]), LEFT)
+            vtxt = self.txt(fmt.format(val), font_size=value_fs, **style)
+            vtxt.next_to(np.array([end, yi, 0]), LEFT if is_neg else RIGHT,
+                         buff=value_buff)
+            labels.add(lbl)
+            values.add(vtxt)
+        shifts = np.where(neg[:, None], LEFT, RIGHT) * 0.05
+        return Chart(bars, labels, values, value_shift=shifts)
+
     # ── Scene 1: Hook ────────────────────────────────────────────────
 
     def scene_1_hook(self):
@@ -321,33 +413,22 @@ class DeepThinkingVideo(Scene):
         st_label.set_y(SHALLOW_Y)
         st_label.align_to(np.array([ROW_LABEL_X, 0, 0]), LEFT)
 
+        # One dot per layer under each box
+        centers = np.array([l.get_center() for l in layers])
+
         # Deep-thinking token dots (predictions CHANGE color)
-        dt_dots = VGroup()
-        dot_colors_deep = [RED, RED, YELLOW, YELLOW, GREEN]
-        for i, layer in enumerate(layers):
-            dot = Dot(
-                point=layer.get_center() + DOWN * 1.1,
-                radius=0.15,
-                color=dot_colors_deep[i],
-                fill_opacity=0.9,
-            )
-            dt_dots.add(dot)
+        dt_dots = DotCloud(centers + DOWN * 1.1, radius=0.15,
+                           colors=[RED, RED, YELLOW, YELLOW, GREEN],
+                           opacities=0.9)
 
         # Shallow token dots (predictions STAY same)
-        st_dots = VGroup()
-        for i, layer in enumerate(layers):
-            dot = Dot(
-                point=layer.get_center() + DOWN * 2.5,
-                radius=0.15,
-                color=ACCENT,
-                fill_opacity=0.4,
-            )
-            st_dots.add(dot)
+        st_dots = DotCloud(centers + DOWN * 2.5, radius=0.15,
+                           colors=ACCENT, opacities=0.4)
 
         self.play(
             FadeIn(dt_label), FadeIn(st_label),
-            LaggedStart(*[GrowFromCenter(d) for d in dt_dots], lag_ratio=0.1),
-            LaggedStart(*[GrowFromCenter(d) for d in st_dots], lag_ratio=0.1),
+            GrowDots(dt_dots, lag_ratio=0.1),
+            GrowDots(st_dots, lag_ratio=0.1),
             run_time=0.8,
         )
 
@@ -393,6 +474,12 @@ class DeepThinkingVideo(Scene):
         n = len(CORR_DATA)
         bottom_y = TOP_Y - (n - 1) * (BAR_H + ROW_GAP)
 
+        chart = self.hbar_chart(
+            CORR_DATA, top_y=TOP_Y, bar_h=BAR_H, row_gap=ROW_GAP,
+            zero_x=ZERO_X, max_w=MAX_W, label_left=LABEL_LEFT,
+            emphasize={name for name, _, col in CORR_DATA if col != MUTED},
+        )
+
         # Zero line
         zero_line = DashedLine(
             start=np.array([ZERO_X, TOP_Y + 0.3, 0]),
@@ -404,67 +491,16 @@ class DeepThinkingVideo(Scene):
 
         self.play(Create(zero_line), FadeIn(zero_label), run_time=0.3)
 
-        bars = VGroup()
-        labels = VGroup()
-        values = VGroup()
-
-        for i, (name, r_val, col) in enumerate(CORR_DATA):
-            y = TOP_Y - i * (BAR_H + ROW_GAP)
-            bar_w = abs(r_val) * MAX_W
-            is_highlight = col != MUTED
-
-            bar = Rectangle(
-                width=bar_w, height=BAR_H,
-                fill_color=col, fill_opacity=0.88, stroke_width=0,
-            )
-            if r_val < 0:
-                bar.move_to(np.array([ZERO_X - bar_w / 2, y, 0]))
-            else:
-                bar.move_to(np.array([ZERO_X + bar_w / 2, y, 0]))
-
-            lbl = self.txt(
-                name, font_size=15,
-                color=WHITE if is_highlight else MUTED,
-                weight=BOLD if is_highlight else NORMAL,
-            )
-            lbl.set_y(y)
-            lbl.align_to(np.array([LABEL_LEFT, 0, 0]), LEFT)
-
-            vtxt = self.txt(
-                f"{r_val:+.3f}", font_size=14,
-                color=WHITE if is_highlight else MUTED,
-                weight=BOLD if is_highlight else NORMAL,
-            )
-            if r_val < 0:
-                vtxt.next_to(bar, LEFT, buff=0.1)
-            else:
-                vtxt.next_to(bar, RIGHT, buff=0.1)
-
-            bars.add(bar)
-            labels.add(lbl)
-            values.add(vtxt)
-
-        self.play(
-            LaggedStart(*[FadeIn(l) for l in labels], lag_ratio=0.05),
-            run_time=0.4,
-        )
+        self.play(FadeRows(chart.labels, lag_ratio=0.05), run_time=0.4)
         self.play(
-            LaggedStart(
-                *[GrowFromEdge(b, LEFT if CORR_DATA[i][1] >= 0 else RIGHT)
-                  for i, b in enumerate(bars)],
-                lag_ratio=0.07,
-            ),
-            LaggedStart(
-                *[FadeIn(v, shift=LEFT * 0.05 if CORR_DATA[i][1] < 0 else RIGHT * 0.05)
-                  for i, v in enumerate(values)],
-                lag_ratio=0.07,
-            ),
+            chart.grow(lag_ratio=0.07),
             run_time=1.4,
             rate_func=rate_functions.ease_out_cubic,
         )
 
-        glow_dtr = self.glow_highlight(bars[-1], color=GREEN)
-        glow_tok = self.glow_highlight(bars[0], color=RED)
+        bars = chart.bars
+        glow_dtr = self.glow_highlight(bars.box(-1), color=GREEN)
+        glow_tok = self.glow_highlight(bars.box(0), color=RED)
         self.play(FadeIn(glow_dtr), FadeIn(glow_tok), run_time=0.4)
         self.wait(0.8)
 
@@ -494,23 +530,14 @@ class DeepThinkingVideo(Scene):
             ("Think@n", 94.7, 155.4, GREEN),
         ]
 
-        def make_bar_row(name, value, max_val, unit, col, y):
-            mlbl = self.txt(name, font_size=18, color=WHITE, weight=BOLD)
-            mlbl.set_y(y)
-            mlbl.align_to(np.array([LABEL_LEFT, 0, 0]), LEFT)
-
-            bar_w = (value / max_val) * BAR_MAX_W
-            bar = RoundedRectangle(
-                width=bar_w, height=BAR_H, corner_radius=0.06,
-                fill_color=col, fill_opacity=0.85, stroke_width=0,
+        def bar_rows(rows, top_y, max_val, unit):
+            return self.hbar_chart(
+                rows, top_y=top_y, bar_h=BAR_H, row_gap=ROW_GAP,
+                zero_x=BAR_LEFT, max_w=BAR_MAX_W, vmax=max_val,
+                label_left=LABEL_LEFT, fmt="{}" + unit, label_fs=18,
+                value_fs=19, radius=0.06, fill_opacity=0.85,
+                emphasize={name for name, *_ in rows}, value_buff=0.12,
             )
-            bar.move_to(np.array([BAR_LEFT + bar_w / 2, y, 0]))
-
-            val = self.txt(f"{value}{unit}", font_size=19,
-                           color=WHITE, weight=BOLD)
-            val.next_to(bar, RIGHT, buff=0.12)
-
-            return mlbl, bar, val
 
         # ── Accuracy ──
         acc_title = self.txt("Accuracy", font_size=20,
@@ -519,20 +546,11 @@ class DeepThinkingVideo(Scene):
         acc_title.align_to(np.array([LABEL_LEFT, 0, 0]), LEFT)
         self.play(FadeIn(acc_title), run_time=0.2)
 
-        acc_items = []
-        for i, (name, acc, cost, col) in enumerate(methods):
-            y = 1.2 - i * (BAR_H + ROW_GAP)
-            acc_items.append(make_bar_row(name, acc, 100, "%", col, y))
-
-        acc_bars = VGroup(*[item[1] for item in acc_items])
-        acc_extras = VGroup(*[VGroup(item[0], item[2]) for item in acc_items])
-
+        acc = bar_rows([(name, a, col) for name, a, _, col in methods],
+                       1.2, 100, "%")
         self.play(
-            *[FadeIn(e) for e in acc_extras],
-            LaggedStart(
-                *[GrowFromEdge(b, LEFT) for b in acc_bars],
-                lag_ratio=0.15,
-            ),
+            FadeIn(VGroup(acc.labels, acc.values)),
+            GrowBars(acc.bars, lag_ratio=0.15),
             run_time=0.8,
         )
 
@@ -544,30 +562,22 @@ class DeepThinkingVideo(Scene):
         self.play(FadeIn(cost_title), run_time=0.2)
 
         max_cost = 307.6
-        cost_items = []
-        for i, (name, acc, cost, col) in enumerate(methods):
-            y = -1.3 - i * (BAR_H + ROW_GAP)
-            cost_items.append(make_bar_row(name, cost, max_cost, "k", col, y))
-
-        cost_bars = VGroup(*[item[1] for item in cost_items])
-        cost_extras = VGroup(*[VGroup(item[0], item[2]) for item in cost_items])
-
+        cost = bar_rows([(name, c, col) for name, _, c, col in methods],
+                        -1.3, max_cost, "k")
         self.play(
-            *[FadeIn(e) for e in cost_extras],
-            LaggedStart(
-                *[GrowFromEdge(b, LEFT) for b in cost_bars],
-                lag_ratio=0.15,
-            ),
+            FadeIn(VGroup(cost.labels, cost.values)),
+            GrowBars(cost.bars, lag_ratio=0.15),
             run_time=0.8,
         )
 
         # Cost saving annotation
+        think_cost = cost.bars.box(-1)
         saving = self.txt("~50% less cost", font_size=20,
                           color=GREEN, weight=BOLD)
-        saving.next_to(cost_bars[-1], RIGHT, buff=1.0)
+        saving.next_to(think_cost, RIGHT, buff=1.0)
 
         arrow = Arrow(
-            saving.get_left(), cost_bars[-1].get_right() + RIGHT * 0.15,
+            saving.get_left(), think_cost.get_right() + RIGHT * 0.15,
             buff=0.08, color=GREEN, stroke_width=2,
             max_tip_length_to_length_ratio=0.3,
         )
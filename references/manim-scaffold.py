@@ -7,6 +7,8 @@ Render:
   Test:   manim -ql script.py PaperVideo
   Final:  manim -qh script.py PaperVideo
   4K:     manim -qk script.py PaperVideo
+  Matrix: python scripts/render_matrix.py script.py PaperVideo -qh
+  One:    FORMAT=vertical PALETTE=light manim -qh script.py PaperVideo
 
 GIF:
   ffmpeg -i <mp4> -vf "fps=15,scale=720:-1:flags=lanczos,split[s0][s1]; \
@@ -14,19 +16,74 @@ GIF:
     -loop 0 output.gif
 """
 
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import os
+
 from manim import *
+import manim
 import numpy as np
 
-# ── Palette (GitHub Dark Theme) ───────────────────────────────────────
-BG      = "#0d1117"
-SURFACE = "#161b22"
-BORDER  = "#30363d"
-WHITE   = "#e6edf3"
-MUTED   = "#8b949e"
-ACCENT  = "#58a6ff"   # blue link
-YELLOW  = "#f0c040"
-RED     = "#f85149"
-GREEN   = "#2ecc71"
+# ── Palette (GitHub Dark Theme; PALETTE=light for GitHub Light) ──────
+# Chosen at import, so data tables below pick up the same colors. WHITE
+# is the primary text color: near-black in the light palette.
+PALETTES = {
+    "dark": {
+        "BG": "#0d1117", "SURFACE": "#161b22", "BORDER": "#30363d",
+        "WHITE": "#e6edf3", "MUTED": "#8b949e", "ACCENT": "#58a6ff",
+        "YELLOW": "#f0c040", "RED": "#f85149", "GREEN": "#2ecc71",
+    },
+    "light": {
+        "BG": "#ffffff", "SURFACE": "#f6f8fa", "BORDER": "#d0d7de",
+        "WHITE": "#1f2328", "MUTED": "#656d76", "ACCENT": "#0969da",
+        "YELLOW": "#bf8700", "RED": "#cf222e", "GREEN": "#1a7f37",
+    },
+}
+PALETTE = PALETTES[os.environ.get("PALETTE", "dark")]
+BG      = PALETTE["BG"]
+SURFACE = PALETTE["SURFACE"]
+BORDER  = PALETTE["BORDER"]
+WHITE   = PALETTE["WHITE"]
+MUTED   = PALETTE["MUTED"]
+ACCENT  = PALETTE["ACCENT"]   # blue link
+YELLOW  = PALETTE["YELLOW"]
+RED     = PALETTE["RED"]
+GREEN   = PALETTE["GREEN"]
+
+# ── Formats (FORMAT=landscape | vertical | square) ────────────────────
+# Frame size in Manim units (the short side stays 8, so font sizes read
+# the same in every format) and the layout constants scenes and chart
+# helpers use instead of literals. scripts/render_matrix.py renders the
+# MATRIX of (format, palette) variants in one job.
+FORMATS = {
+    "landscape": {"frame": (128 / 9, 8.0), "LABEL_LEFT": -5.8,
+                  "BAR_LEFT": -3.0, "MAX_W": 6.5, "BASE_Y": -2.55},
+    "vertical":  {"frame": (8.0, 128 / 9), "LABEL_LEFT": -3.7,
+                  "BAR_LEFT": -1.6, "MAX_W": 4.3, "BASE_Y": -3.2},
+    "square":    {"frame": (8.0, 8.0), "LABEL_LEFT": -3.7,
+                  "BAR_LEFT": -1.6, "MAX_W": 4.3, "BASE_Y": -2.55},
+}
+MATRIX = [("landscape", "dark"), ("vertical", "dark"), ("square", "dark"),
+          ("landscape", "light")]
+FORMAT = FORMATS[os.environ.get("FORMAT", "landscape")]
+LABEL_LEFT = FORMAT["LABEL_LEFT"]   # left edge of every row label
+BAR_LEFT   = FORMAT["BAR_LEFT"]     # where row-chart bars start
+MAX_W      = FORMAT["MAX_W"]        # longest row-chart bar
+BASE_Y     = FORMAT["BASE_Y"]       # baseline of vertical bar charts
+
+
+def use_format(frame_w, frame_h):
+    """Size Manim's frame and pixels for a format at the current -q
+    quality: the short side keeps the quality's pixel count (1080 at
+    -qh), so -qh vertical is 1080x1920."""
+    px_per_unit = min(config.pixel_width, config.pixel_height) / 8.0
+    config.frame_width, config.frame_height = frame_w, frame_h
+    config.pixel_width = 2 * round(frame_w * px_per_unit / 2)
+    config.pixel_height = 2 * round(frame_h * px_per_unit / 2)
+
+
+use_format(*FORMAT["frame"])
 
 # ── Paper-Specific Colors ─────────────────────────────────────────────
 # Replace with your paper's entity colors
@@ -61,6 +118,728 @@ ASSETS = "assets"  # adjust path to your logo/image directory
 # Character height (if using a persistent character)
 CHAR_H = 1.4
 
+# ── Glyph cache ───────────────────────────────────────────────────────
+# txt() memoizes rendered glyph outlines: an in-memory LRU plus one .npz
+# per string on disk, so warm re-renders skip Pango entirely. Set the dir
+# to None to disable the disk layer; delete it after reinstalling a font.
+GLYPH_CACHE_DIR  = os.environ.get("GLYPH_CACHE_DIR", "media/glyph_cache")
+GLYPH_CACHE_SIZE = 512   # templates kept in memory
+
+
+class GlyphText(VGroup):
+    """Text rebuilt from cached glyph outlines (one VMobject per glyph).
+
+    Behaves like the `Text` that txt() used to return for layout and
+    animation (next_to, arrange, FadeIn, .animate, indexing glyphs).
+    """
+
+    def __init__(self, text, glyphs, **kwargs):
+        super().__init__(**kwargs)
+        self.text = text
+        self.original_text = text
+        for points, fill, stroke, stroke_w in glyphs:
+            g = VMobject(stroke_width=stroke_w)
+            g.set_points(points)
+            g.set_fill(ManimColor(tuple(fill)), opacity=fill[3])
+            g.set_stroke(ManimColor(tuple(stroke)), width=stroke_w,
+                         opacity=stroke[3])
+            self.add(g)
+
+    def __repr__(self):
+        return f"GlyphText({self.text!r})"
+
+
+class GlyphCache:
+    """Content-addressed cache of txt() results.
+
+    Keys hash every input that changes the outlines (string, font, size,
+    multiplier, weight, color, extra Text kwargs) plus the Manim version.
+    Lookups go memory LRU -> .npz on disk -> Pango. Hits return a copy of
+    a template, so callers can move and recolor the result freely.
+    """
+
+    def __init__(self, directory=GLYPH_CACHE_DIR, maxsize=GLYPH_CACHE_SIZE):
+        self.directory = Path(directory) if directory else None
+        self.maxsize = maxsize
+        self._lru = OrderedDict()
+        self.hits = self.disk_hits = self.misses = 0
+
+    @staticmethod
+    def key(*parts):
+        raw = repr((manim.__version__,) + parts).encode()
+        return hashlib.sha256(raw).hexdigest()[:24]
+
+    def get(self, key, text, build):
+        """Return a fresh copy for `key`, calling `build()` on a full miss."""
+        tpl = self._lru.get(key)
+        if tpl is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return tpl.copy()
+
+        glyphs = self._load(key)
+        if glyphs is None:
+            self.misses += 1
+            glyphs = self.glyphs_of(build())
+            self._save(key, glyphs)
+        else:
+            self.disk_hits += 1
+
+        tpl = GlyphText(text, glyphs)
+        self._lru[key] = tpl
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+        return tpl.copy()
+
+    @staticmethod
+    def glyphs_of(mob):
+        """Flatten a mobject into (points, fill, stroke, stroke_w) rows."""
+        return [
+            (np.array(m.points, dtype=float),
+             np.array(m.get_fill_rgbas()[0], dtype=float),
+             np.array(m.get_stroke_rgbas()[0], dtype=float),
+             float(m.get_stroke_width()))
+            for m in mob.family_members_with_points()
+        ]
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.npz"
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as z:
+                return [
+                    (z[f"p{i}"], z["fill"][i], z["stroke"][i],
+                     float(z["stroke_w"][i]))
+                    for i in range(len(z["stroke_w"]))
+                ]
+        except (OSError, KeyError, ValueError):
+            return None   # truncated or stale entry - rebuild it
+
+    def _save(self, key, glyphs):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {f"p{i}": g[0] for i, g in enumerate(glyphs)}
+        arrays["fill"] = np.array([g[1] for g in glyphs]).reshape(-1, 4)
+        arrays["stroke"] = np.array([g[2] for g in glyphs]).reshape(-1, 4)
+        arrays["stroke_w"] = np.array([g[3] for g in glyphs], dtype=float)
+        # Write-then-rename so parallel renders never read a partial file
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+
+GLYPHS = GlyphCache()
+
+
+# ── Charts ────────────────────────────────────────────────────────────
+# Chart helpers lay out every row of a CHART_DATA-style table in one
+# NumPy pass. Bars that share a color are one VMobject with a closed
+# subpath per bar, so a 50-row chart is a handful of mobjects, and
+# GrowBars / FadeRows animate all rows as one animation each.
+ARC = 0.5523   # Bezier handle length for a quarter circle (fraction of r)
+
+
+def bar_points(corners, radius=0.0):
+    """Bezier points for axis-aligned bars, one closed subpath per bar.
+
+    `corners` is (n, 4) rows of (x0, y0, x1, y1). Corners are rounded by
+    `radius`, clamped to half of each bar's short side. Returns (n*k, 3),
+    bar i's points contiguous, traced counter-clockwise from the top
+    edge like Rectangle.
+    """
+    x0, y0, x1, y1 = np.asarray(corners, dtype=float).T
+    z = np.zeros_like(x0)
+
+    def pt(x, y):
+        return np.stack([x, y, z], axis=-1)
+
+    if radius > 0:
+        r = np.clip(np.minimum(x1 - x0, y1 - y0) / 2, 0, radius)
+        # (start, end, sharp corner) - the corner is None on straight edges
+        curves = [
+            (pt(x1 - r, y1), pt(x0 + r, y1), None),
+            (pt(x0 + r, y1), pt(x0, y1 - r), pt(x0, y1)),
+            (pt(x0, y1 - r), pt(x0, y0 + r), None),
+            (pt(x0, y0 + r), pt(x0 + r, y0), pt(x0, y0)),
+            (pt(x0 + r, y0), pt(x1 - r, y0), None),
+            (pt(x1 - r, y0), pt(x1, y0 + r), pt(x1, y0)),
+            (pt(x1, y0 + r), pt(x1, y1 - r), None),
+            (pt(x1, y1 - r), pt(x1 - r, y1), pt(x1, y1)),
+        ]
+    else:
+        ur, ul, dl, dr = pt(x1, y1), pt(x0, y1), pt(x0, y0), pt(x1, y0)
+        curves = [(ur, ul, None), (ul, dl, None), (dl, dr, None),
+                  (dr, ur, None)]
+
+    segments = []
+    for a, b, corner in curves:
+        if corner is None:
+            h1, h2 = a + (b - a) / 3, a + 2 * (b - a) / 3
+        else:
+            h1, h2 = a + ARC * (corner - a), b + ARC * (corner - b)
+        segments.append(np.stack([a, h1, h2, b], axis=1))
+    return np.concatenate(segments, axis=1).reshape(-1, 3)
+
+
+def row_alphas(alpha, n, lag_ratio, rate_func):
+    """Per-row progress of a staggered animation, as LaggedStart times
+    its children: row i starts at i * lag_ratio of one row's duration.
+    rate_func runs once per distinct value: rows that have not started
+    or have finished share 0 and 1, so a frame costs only its moving
+    rows."""
+    span = (n - 1) * lag_ratio + 1
+    local = np.clip(alpha * span - np.arange(n) * lag_ratio, 0, 1)
+    values, inverse = np.unique(local, return_inverse=True)
+    return np.array([rate_func(a) for a in values])[inverse]
+
+
+class BarSet(VGroup):
+    """The bars of one chart: one VMobject per color, one subpath per bar.
+
+    Bar i is row i of the data whatever its color; use box(i) (not
+    indexing) to get at a single bar. `edges` is the edge each bar grows
+    from (DOWN, LEFT, RIGHT, ...), one vector or one per bar.
+    """
+
+    def __init__(self, corners, colors, edges, radius=0.0,
+                 fill_opacity=0.9, **kwargs):
+        super().__init__(**kwargs)
+        corners = np.asarray(corners, dtype=float)
+        self.n = len(corners)
+        self.radius = radius
+        self.edges = np.array(np.broadcast_to(edges, (self.n, 3)),
+                              dtype=float)
+        hexes = [ManimColor(c).to_hex() for c in colors]
+        self.rows = []   # bar indices drawn by each submobject
+        for color in dict.fromkeys(hexes):
+            self.rows.append(np.flatnonzero([h == color for h in hexes]))
+            self.add(VMobject(fill_color=color, fill_opacity=fill_opacity,
+                              stroke_width=0))
+        self.set_corners(corners)
+
+    def corners(self):
+        """(n, 4) x0, y0, x1, y1 of every bar, read back from the points
+        so a chart that was moved or scaled after building still grows
+        from the right place."""
+        out = np.zeros((self.n, 4))
+        for sub, rows in zip(self.submobjects, self.rows):
+            pts = sub.points.reshape(len(rows), -1, 3)
+            out[rows, :2] = pts.min(axis=1)[:, :2]
+            out[rows, 2:] = pts.max(axis=1)[:, :2]
+        return out
+
+    def set_corners(self, corners):
+        for sub, rows in zip(self.submobjects, self.rows):
+            sub.set_points(bar_points(corners[rows], self.radius))
+        return self
+
+    def box(self, i):
+        """An invisible Rectangle over bar i, for next_to/glow_highlight."""
+        x0, y0, x1, y1 = self.corners()[i]
+        return Rectangle(width=x1 - x0, height=y1 - y0, stroke_width=0,
+                         fill_opacity=0).move_to([(x0 + x1) / 2,
+                                                  (y0 + y1) / 2, 0])
+
+
+class GrowBars(Animation):
+    """GrowFromEdge for every bar of a BarSet, as one animation.
+
+    lag_ratio staggers the bars like LaggedStart; rate_func applies to
+    each bar, as it would to each GrowFromEdge.
+    """
+
+    def __init__(self, bars, lag_ratio=0.07, **kwargs):
+        super().__init__(bars, lag_ratio=lag_ratio, introducer=True,
+                         **kwargs)
+
+    def begin(self):
+        full = self.mobject.corners()
+        ex, ey = self.mobject.edges[:, 0], self.mobject.edges[:, 1]
+        base = full.copy()
+        # Collapse each bar onto its growth edge
+        base[ex < 0, 2] = full[ex < 0, 0]
+        base[ex > 0, 0] = full[ex > 0, 2]
+        base[ey < 0, 3] = full[ey < 0, 1]
+        base[ey > 0, 1] = full[ey > 0, 3]
+        self.full, self.base = full, base
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        t = row_alphas(alpha, self.mobject.n, self.lag_ratio, self.rate_func)
+        self.mobject.set_corners(
+            self.base + (self.full - self.base) * t[:, None])
+
+
+class FadeRows(Animation):
+    """FadeIn(row, shift=...) for every row of a group, as one animation.
+
+    `shift` is one vector or one per row (diverging charts move negative
+    values in from the other side).
+    """
+
+    def __init__(self, rows, shift=ORIGIN, lag_ratio=0.07, **kwargs):
+        super().__init__(rows, lag_ratio=lag_ratio, introducer=True,
+                         **kwargs)
+        self.shifts = np.broadcast_to(np.asarray(shift, dtype=float),
+                                      (len(rows), 3))
+
+    def begin(self):
+        self.start = [
+            [(m, m.points.copy(), m.get_fill_opacity(), m.get_stroke_opacity())
+             for m in row.family_members_with_points()]
+            for row in self.mobject
+        ]
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        t = row_alphas(alpha, len(self.start), self.lag_ratio, self.rate_func)
+        for a, shift, row in zip(t, self.shifts, self.start):
+            for m, points, fill, stroke in row:
+                m.points = points + shift * (a - 1)
+                m.set_fill(opacity=fill * a, family=False)
+                m.set_stroke(opacity=stroke * a, family=False)
+
+
+class Chart(VGroup):
+    """A laid-out chart: bars, row labels and value texts.
+
+    bars[i], labels[i] and values[i] all belong to row i. `bars` may be
+    a list of BarSets drawn back to front (paired charts); .bars is the
+    front one.
+    """
+
+    def __init__(self, bars, labels, values, value_shift=ORIGIN):
+        bar_sets = list(bars) if isinstance(bars, (list, tuple)) else [bars]
+        super().__init__(*bar_sets, labels, values)
+        self.bar_sets = bar_sets
+        self.bars = bar_sets[-1]
+        self.labels = labels
+        self.values = values
+        self.value_shift = value_shift
+
+    def grow(self, lag_ratio=0.07):
+        """Bars grow while their values fade in, row by row - the batched
+        form of LaggedStart(GrowFromEdge...) + LaggedStart(FadeIn...)."""
+        return AnimationGroup(
+            *[GrowBars(b, lag_ratio=lag_ratio) for b in self.bar_sets],
+            FadeRows(self.values, shift=self.value_shift,
+                     lag_ratio=lag_ratio),
+        )
+
+
+# ── Dot clouds ────────────────────────────────────────────────────────
+# A DotCloud keeps thousands of dots (one per token, say) as NumPy rows
+# of center, radius, color and opacity. Dots that share a color and
+# opacity are one VMobject with a closed subpath per dot, so a cloud is
+# as many mobjects as it has shades, and GrowDots sets every radius
+# with one array operation per frame.
+
+def _unit_circle():
+    """Four quarter arcs of the unit circle, counter-clockwise from +x."""
+    ends = np.array([[1, 0], [0, 1], [-1, 0], [0, -1], [1, 0]], dtype=float)
+    a, b = ends[:-1], ends[1:]
+    # The tangent at a point of the unit circle is the point turned 90deg
+    ta, tb = a[:, ::-1] * [-1, 1], b[:, ::-1] * [-1, 1]
+    arcs = np.stack([a, a + ARC * ta, b - ARC * tb, b], axis=1)
+    return np.pad(arcs.reshape(-1, 2), ((0, 0), (0, 1)))
+
+
+UNIT_CIRCLE = _unit_circle()   # (16, 3)
+
+
+def dot_points(centers, radii):
+    """Bezier points for circles, one closed subpath per dot.
+
+    `centers` is (n, 3); `radii` is one radius or one per dot. Returns
+    (n*16, 3), dot i's points contiguous.
+    """
+    centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), len(centers))
+    return (centers[:, None] + radii[:, None, None] * UNIT_CIRCLE).reshape(-1, 3)
+
+
+def grid_points(n, cols, spacing=0.12, center=ORIGIN):
+    """Centers of n dots in rows of `cols`, left to right then down, like
+    tokens in a paragraph; the block is centered on `center`."""
+    i = np.arange(n)
+    rows = (n - 1) // cols + 1
+    x = (i % cols - (min(n, cols) - 1) / 2) * spacing
+    y = ((rows - 1) / 2 - i // cols) * spacing
+    return np.stack([x, y, np.zeros(n)], axis=-1) + center
+
+
+def ramp(values, colors, steps=8):
+    """One color per value in [0, 1], from `steps` shades of the gradient
+    through `colors`. A DotCloud colored by ramp() is at most `steps`
+    mobjects, however many dots it has."""
+    shades = color_gradient(colors, steps)
+    idx = np.clip((np.asarray(values) * steps).astype(int), 0, steps - 1)
+    return [shades[i] for i in idx]
+
+
+class DotCloud(VGroup):
+    """Dots as arrays: one VMobject per (color, opacity), one subpath per dot.
+
+    `colors` and `opacities` are one value or one per dot. Dot i is row i
+    whatever its shade; use dot(i) (not indexing) to get at a single dot.
+    Opacities are rounded to 0.05 so that near-equal ones share a shade.
+    """
+
+    def __init__(self, centers, radius=0.05, colors=WHITE, opacities=0.9,
+                 **kwargs):
+        super().__init__(**kwargs)
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        self.n = len(centers)
+        if isinstance(colors, (str, ManimColor)):
+            colors = [colors]
+        hexes = np.broadcast_to([ManimColor(c).to_hex() for c in colors],
+                                self.n)
+        alphas = np.broadcast_to(np.round(np.asarray(opacities) * 20) / 20,
+                                 self.n)
+        shades = list(zip(hexes, alphas))
+        self.rows = []   # dot indices drawn by each submobject
+        for color, alpha in dict.fromkeys(shades):
+            self.rows.append(np.flatnonzero(
+                (hexes == color) & (alphas == alpha)))
+            self.add(VMobject(fill_color=str(color),
+                              fill_opacity=float(alpha), stroke_width=0))
+        self.set_dots(centers, radius)
+
+    def dots(self):
+        """(n, 3) centers and (n,) radii of every dot, read back from the
+        points so a cloud that was moved or scaled after building still
+        grows from the right place."""
+        centers, radii = np.zeros((self.n, 3)), np.zeros(self.n)
+        for sub, rows in zip(self.submobjects, self.rows):
+            pts = sub.points.reshape(len(rows), -1, 3)
+            centers[rows] = pts.mean(axis=1)
+            radii[rows] = pts[:, 0, 0] - centers[rows, 0]
+        return centers, radii
+
+    def set_dots(self, centers, radii):
+        radii = np.broadcast_to(np.asarray(radii, dtype=float), self.n)
+        for sub, rows in zip(self.submobjects, self.rows):
+            sub.set_points(dot_points(centers[rows], radii[rows]))
+        return self
+
+    def dot(self, i):
+        """An invisible Circle over dot i, for next_to/glow_highlight."""
+        centers, radii = self.dots()
+        return Circle(radius=radii[i], stroke_width=0,
+                      fill_opacity=0).move_to(centers[i])
+
+
+class GrowDots(Animation):
+    """GrowFromCenter for every dot of a DotCloud, as one animation.
+
+    lag_ratio staggers the dots like LaggedStart; for a cloud of n dots,
+    about k / n makes k dots grow at once.
+    """
+
+    def __init__(self, cloud, lag_ratio=0.1, **kwargs):
+        super().__init__(cloud, lag_ratio=lag_ratio, introducer=True,
+                         **kwargs)
+
+    def begin(self):
+        self.centers, self.radii = self.mobject.dots()
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        t = row_alphas(alpha, self.mobject.n, self.lag_ratio, self.rate_func)
+        self.mobject.set_dots(self.centers, self.radii * t)
+
+
+# ── Character variants ────────────────────────────────────────────────
+# build_character() rebuilds every primitive (seam overlaps, eyes) on
+# each call. CHARACTERS builds each variant once per height and hands
+# out copies; each pair of variants is aligned for ReplacementTransform
+# once, so swap_variant() is two copies and a shift.
+
+class CharacterRegistry:
+    """Variant templates and pre-aligned morph pairs for build_fn(h, variant).
+
+    Characters from get() and pair() carry .variant_key = (build_fn, h,
+    variant), so a character can be checked against its template.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._pairs = {}
+
+    def template(self, build_fn, variant="default", h=CHAR_H):
+        key = (build_fn, h, variant)
+        if key not in self._templates:
+            char = build_fn(h=h, variant=variant)
+            char.variant_key = key
+            self._templates[key] = char
+        return self._templates[key]
+
+    def get(self, build_fn, variant="default", h=CHAR_H):
+        """An independent copy of the variant, ready to place and add."""
+        return self.template(build_fn, variant, h).copy()
+
+    def pair(self, build_fn, old, new, h=CHAR_H):
+        """Copies of two variants, cores on the same point, with the
+        submobject trees and curve counts already matched (align_data)."""
+        key = (build_fn, h, old, new)
+        if key not in self._pairs:
+            source = self.get(build_fn, old, h)
+            target = self.get(build_fn, new, h)
+            target.shift(source[0].get_center() - target[0].get_center())
+            source.align_data(target)
+            self._pairs[key] = (source, target)
+        source, target = self._pairs[key]
+        return source.copy(), target.copy()
+
+    def offset(self, char):
+        """How far `char` was moved from its template, or None if it was
+        changed any other way (eyes shifted, stretched, recolored)."""
+        key = getattr(char, "variant_key", None)
+        if key is None:
+            return None
+        build_fn, h, variant = key
+        tpl = self.template(build_fn, variant, h)
+        shift = char[0].get_center() - tpl[0].get_center()
+        a = tpl.family_members_with_points()
+        b = char.family_members_with_points()
+        if len(a) != len(b):
+            return None
+        for m, n in zip(a, b):
+            if m.points.shape != n.points.shape or not np.allclose(
+                    n.points, m.points + shift, atol=1e-6):
+                return None
+            for attr in ("fill_rgbas", "stroke_rgbas"):
+                if not np.array_equal(getattr(m, attr, None),
+                                      getattr(n, attr, None)):
+                    return None
+        return shift
+
+
+CHARACTERS = CharacterRegistry()
+
+
+# ── Frame pipeline ────────────────────────────────────────────────────
+# Cairo draws each frame straight into one of a ring of FRAME_BUFFERS
+# preallocated arrays, and that array is handed to the encoder thread
+# as is, without a copy. The encoder returns it to the ring once the
+# frame is encoded, so frame N+1 is rasterized while x264 encodes frame
+# N. When every buffer is in flight the rasterizer waits, so a slow
+# encoder cannot queue up frames without bound, and memory stays flat
+# at any length or resolution. FRAME_BUFFERS = 0 restores Manim's own
+# unbounded queue of copied frames (the baseline benchmark.py --stock
+# compares against).
+#
+# A static stretch - a self.wait(), or any run of identical frames - is
+# encoded as its first frame plus HOLD_TAIL closing copies, with the
+# timestamps skipping the frames in between, instead of once per frame.
+# The closing copies stop x264's B-frame reordering from cutting the
+# partial file's duration short, so the combined MP4 (and a GIF made
+# from it) keeps exactly the same frame timing.
+FRAME_BUFFERS = 6   # being drawn + queued + being encoded + the held run
+HOLD_FRAMES = True
+HOLD_TAIL = 3
+
+
+def frame_pipeline(renderer):
+    """Install the ring-buffered, run-length frame path on a Manim 0.19
+    Cairo renderer and its SceneFileWriter.
+
+    render() points the camera at a free ring buffer, draws, and passes
+    the buffer on; any other frame (a frozen wait) is copied into one.
+    The writer thread's encode_and_write_frame holds a frame back while
+    the next ones are identical to it, writes the run when the picture
+    changes, and returns buffers to the ring. A None frame writes the
+    last run and restarts the timestamps; the thread of every partial
+    movie file ends with one. Hold frames are skipped for
+    `--format gif`, which numbers frames sequentially when it combines.
+    """
+    import av
+    import queue
+
+    writer = renderer.file_writer
+    camera = renderer.camera
+    if not hasattr(camera, "pixel_array"):
+        return    # OpenGL renderer
+    hold = HOLD_FRAMES and config.format != "gif"
+    writing = manim.utils.file_ops.write_to_movie
+    stock_render = renderer.render
+    stock_write = writer.write_frame
+    own = camera.pixel_array    # drawn into outside render()
+    ring = {}     # id -> buffer; keeps Cairo's cached contexts valid
+    free = queue.Queue()
+    for _ in range(FRAME_BUFFERS):
+        free.put(None)    # allocated on first use
+    release = free.put if FRAME_BUFFERS else (lambda frame: None)
+    run = {"frame": None, "count": 0, "pts": 0}
+
+    def take_buffer(like):
+        while True:    # wait while every buffer is in flight
+            try:
+                buf = free.get(timeout=1.0)
+                break
+            except queue.Empty:
+                if not writer.writer_thread.is_alive():
+                    raise RuntimeError("the frame encoder thread stopped")
+        if buf is None or buf.shape != like.shape:
+            buf = np.empty_like(like)
+            ring[id(buf)] = buf
+        return buf
+
+    def write_frame(frame, num_frames=1):
+        if not writing():    # --format png: Manim writes image files
+            return stock_write(frame, num_frames)
+        if ring.get(id(frame)) is not frame:
+            buf = take_buffer(frame)
+            np.copyto(buf, frame)
+            frame = buf
+        writer.queue.put((num_frames, frame))
+
+    def render(scene, time, moving_mobjects):
+        if renderer.skip_animations or not writing():
+            return stock_render(scene, time, moving_mobjects)
+        camera.pixel_array = take_buffer(own)
+        try:
+            renderer.update_frame(scene, moving_mobjects)
+            renderer.add_frame(camera.pixel_array)    # handed off, no copy
+        finally:
+            camera.pixel_array = own
+
+    def write_run():
+        frame, n, start = run["frame"], run["count"], run["pts"]
+        if hold:
+            tail = range(max(start + 1, start + n - HOLD_TAIL), start + n)
+            stamps = (start, *tail)
+        else:
+            stamps = range(start, start + n)
+        for pts in stamps:
+            av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+            av_frame.pts = pts
+            for packet in writer.video_stream.encode(av_frame):
+                writer.video_container.mux(packet)
+        run["pts"] = start + n
+        release(frame)
+
+    def encode_and_write_frame(frame, num_frames):
+        held = run["frame"]
+        if hold and held is not None and frame is not None and (
+                np.array_equal(frame, held)):
+            run["count"] += num_frames
+            release(frame)
+            return
+        if held is not None:
+            write_run()
+        run["frame"], run["count"] = frame, num_frames
+        if frame is None:
+            run["pts"] = 0
+
+    def listen_and_write():
+        while True:
+            num_frames, frame = writer.queue.get()
+            if frame is None:
+                break
+            writer.encode_and_write_frame(frame, num_frames)
+        writer.encode_and_write_frame(None, 0)
+
+    # All looked up on the instance: listen_and_write when
+    # open_partial_movie_stream starts the thread, the rest per frame (so
+    # the timing wrappers of the scripts/ tools still apply)
+    if FRAME_BUFFERS:
+        writer.write_frame = write_frame
+        renderer.render = render
+    writer.encode_and_write_frame = encode_and_write_frame
+    writer.listen_and_write = listen_and_write
+
+
+# ── Scene timeline ────────────────────────────────────────────────────
+# Every scene_N_* method and scene wipe is recorded by the partial movie
+# files it spans. Manim encodes each play() and wait() as its own
+# partial file, whose first frame is a keyframe, and joins them with a
+# stream copy: every scene boundary is a keyframe of the final MP4.
+# Once the movie is combined, the spans become times in
+# <movie>.timeline.json, and scripts/scene_index.py cuts per-scene
+# clips, chapters and thumbnails from it with `-c copy`, without
+# decoding.
+TIMELINE = True
+TIMELINE_METHODS = r"scene_\d+_\w+|scene_wipe\w*"
+
+
+def scene_timeline(scene):
+    """Record the span of every TIMELINE_METHODS call on `scene`, and
+    write the sidecar index after Manim combines the movie."""
+    import functools
+    import json
+    import re
+
+    import av
+
+    writer = scene.renderer.file_writer
+    spans = []    # (name, first partial file, end partial file)
+
+    def recorded(name, method):
+        @functools.wraps(method)
+        def call(*args, **kwargs):
+            first = len(writer.partial_movie_files)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                spans.append((name, first, len(writer.partial_movie_files)))
+        return call
+
+    for name in dir(type(scene)):
+        if re.fullmatch(TIMELINE_METHODS, name):
+            setattr(scene, name, recorded(name, getattr(scene, name)))
+
+    stock_combine = writer.combine_to_movie
+
+    def combine_to_movie():
+        stock_combine()
+        movie = Path(writer.movie_file_path)
+        if config.format == "gif" or not movie.exists():
+            return
+        # Where each partial file starts in the movie; skipped sections
+        # (None) take no time
+        starts = [0.0]
+        for path in writer.partial_movie_files:
+            seconds = 0.0
+            if path is not None:
+                with av.open(str(path)) as partial:
+                    seconds = partial.duration / av.time_base
+            starts.append(starts[-1] + seconds)
+        scenes = [
+            {"name": name,
+             "kind": "wipe" if name.startswith("scene_wipe") else "scene",
+             "start": round(starts[first], 4), "end": round(starts[end], 4)}
+            for name, first, end in sorted(spans, key=lambda s: s[1:])
+            if starts[end] > starts[first]
+        ]
+        movie.with_suffix(".timeline.json").write_text(json.dumps({
+            "movie": movie.name,
+            "fps": config.frame_rate,
+            "duration": round(starts[-1], 4),
+            "scenes": scenes,
+        }, indent=2))
+
+    writer.combine_to_movie = combine_to_movie
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process, in MB."""
+    import resource
+    import sys
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
 
 class PaperVideo(Scene):
     """Animated paper explainer - replace with your paper name.
@@ -72,11 +851,20 @@ class PaperVideo(Scene):
     - Each scene is a method called sequentially from construct()
     """
 
+    def setup(self):
+        frame_pipeline(self.renderer)
+        if TIMELINE:
+            scene_timeline(self)
+
+    def tear_down(self):
+        logger.info(f"Peak RSS {peak_rss_mb():.0f} MB "
+                    f"({config.pixel_width}x{config.pixel_height})")
+
     def construct(self):
         self.camera.background_color = BG
 
         # ── Persistent character (optional - remove if not using) ──
-        # self.character = build_character(h=CHAR_H, variant="default")
+        # self.character = CHARACTERS.get(build_character, "default")
         # self.character.to_corner(UL, buff=0.45)
         # self.add(self.character)
         self.character = None  # set to None if no character
@@ -103,7 +891,7 @@ class PaperVideo(Scene):
     FONT = "Avenir Next"  # replace with your preferred font
 
     @staticmethod
-    def txt(s, font_size=24, color=WHITE, weight=NORMAL, **kw):
+    def txt(s, font_size=24, color=None, weight=NORMAL, **kw):
         """Render text with correct kerning (Pango scale trick).
 
         Pango's kerning breaks at small pixel sizes. Render at Nx the
@@ -121,7 +909,14 @@ class PaperVideo(Scene):
             t1 = self.txt("First line", font_size=42, weight=BOLD)
             t2 = self.txt("Second line", font_size=42, weight=BOLD)
             title = VGroup(t1, t2).arrange(DOWN, buff=0.12)
+
+        Results are memoized in GLYPHS, so repeated labels and warm
+        re-renders return a copy of cached glyph outlines instead of
+        running Pango again. Outlines are keyed without the color (unless
+        kw colors substrings) and recolored on the copy, so the dark and
+        light palettes share them.
         """
+        color = WHITE if color is None else color
         longest_line = max(s.split("\n"), key=len)
         char_w_factor = 0.70          # avg char width as fraction of font_size
         max_render_px = 2800          # stay under Pango's ~3000px wrap limit
@@ -130,11 +925,18 @@ class PaperVideo(Scene):
         )
         mult = min(10, 400 / max(font_size, 1), max_mult_for_width)
         mult = max(mult, 1)           # never go below 1x
-        t = Text(s, font=PaperVideo.FONT,
-                 font_size=round(font_size * mult),
-                 color=color, weight=weight, **kw)
-        t.scale(1 / mult)
-        return t
+
+        def build():
+            t = Text(s, font=PaperVideo.FONT,
+                     font_size=round(font_size * mult),
+                     color=color, weight=weight, **kw)
+            return t.scale(1 / mult)
+
+        key = GLYPHS.key(s, PaperVideo.FONT, font_size, mult, weight,
+                         ManimColor(color).to_hex() if kw else None,
+                         sorted(kw.items()))
+        text = GLYPHS.get(key, s, build)
+        return text if kw else text.set_color(color)
 
     def pill(self, text, color, w=2.4, h=0.48, fs=20):
         """Pill-shaped label - frosted glass effect on dark background."""
@@ -147,25 +949,29 @@ class PaperVideo(Scene):
         return VGroup(rect, label)
 
     def scene_wipe(self, target_pos=ORIGIN):
-        """Fade out everything except character + logo, slide character."""
-        keep = set()
-        if self.character:
-            keep.add(self.character)
-        if self.logo:
-            keep.add(self.logo)
+        """Fade out everything except character + logo, slide character.
 
-        others = [m for m in self.mobjects if m not in keep]
-        fade_anims = [FadeOut(m, shift=DOWN * 0.2) for m in others]
-
-        if self.character:
-            self.play(*fade_anims,
-                      self.character.animate.move_to(target_pos),
-                      run_time=0.5)
-        else:
-            self.play(*fade_anims, run_time=0.5)
+        Departing mobjects fade as a single Group animation instead of one
+        FadeOut each, so a data-heavy scene (bars, labels, values, glows)
+        is one animation per frame rather than hundreds.
+        """
+        anims = self._wipe_anims(target_pos)
+        if anims:
+            self.play(*anims, run_time=0.5)
 
     def scene_wipe_simple(self, target_pos=ORIGIN):
         """Wipe + straight-line slide to target position."""
+        anims = self._wipe_anims(target_pos)
+        if anims:
+            self.play(
+                *anims,
+                rate_func=rate_functions.ease_in_out_cubic,
+                run_time=0.5,
+            )
+
+    def _wipe_anims(self, target_pos):
+        """One batched FadeOut for everything but the persistent elements,
+        plus the character slide."""
         keep = set()
         if self.character:
             keep.add(self.character)
@@ -173,17 +979,18 @@ class PaperVideo(Scene):
             keep.add(self.logo)
 
         others = [m for m in self.mobjects if m not in keep]
-        fade_anims = [FadeOut(m, shift=DOWN * 0.2) for m in others]
-
-        anims = fade_anims[:]
+        anims = []
+        if others:
+            # Group (not VGroup) so ImageMobjects can leave with the rest.
+            # play() would add the Group on top of everything; add it now
+            # and keep the character and logo drawn over it
+            group = Group(*others)
+            self.add(group)
+            self.bring_to_front(*[m for m in self.mobjects if m in keep])
+            anims.append(FadeOut(group, shift=DOWN * 0.2))
         if self.character:
             anims.append(self.character.animate.move_to(target_pos))
-
-        self.play(
-            *anims,
-            rate_func=rate_functions.ease_in_out_cubic,
-            run_time=0.5,
-        )
+        return anims
 
     def swap_variant(self, build_fn, new_variant, run_time=0.3):
         """Morph character to a new variant via ReplacementTransform.
@@ -192,19 +999,39 @@ class PaperVideo(Scene):
         build_character(h, variant) that returns VGroup(core, decoration).
 
         Aligns by core center (child[0]) so decorations don't shift the body.
+        Variants come from CHARACTERS: built once, then copied. If the
+        character has only been moved since it left the registry, the
+        morph runs between a pre-aligned pair of copies.
         """
         if not self.character:
             return
-        new_char = build_fn(h=CHAR_H, variant=new_variant)
-        # Align via core center to avoid decoration bbox drift
-        offset = self.character[0].get_center() - new_char[0].get_center()
-        new_char.shift(offset)
-        self.play(ReplacementTransform(self.character, new_char),
-                  run_time=run_time)
+        shift = CHARACTERS.offset(self.character)
+        if shift is None:
+            new_char = CHARACTERS.get(build_fn, new_variant)
+            # Align via core center to avoid decoration bbox drift
+            offset = self.character[0].get_center() - new_char[0].get_center()
+            new_char.shift(offset)
+            self.play(ReplacementTransform(self.character, new_char),
+                      run_time=run_time)
+            self.character = new_char
+            return
+
+        old_variant = self.character.variant_key[2]
+        source, target = CHARACTERS.pair(build_fn, old_variant, new_variant)
+        source.shift(shift)
+        target.shift(shift)
+        self.replace(self.character, source)    # same picture, same depth
+        self.play(ReplacementTransform(source, target), run_time=run_time)
+        # Swap the aligned target for a plain copy so the next swap can
+        # use a cached pair again
+        new_char = CHARACTERS.get(build_fn, new_variant)
+        new_char.shift(target[0].get_center() - new_char[0].get_center())
+        self.replace(target, new_char)
         self.character = new_char
 
-    def glow_highlight(self, mobject, color=YELLOW):
+    def glow_highlight(self, mobject, color=None):
         """Create a glow highlight around a mobject (typically a bar)."""
+        color = YELLOW if color is None else color
         outer = RoundedRectangle(
             width=mobject.width + 0.22, height=mobject.height + 0.22,
             corner_radius=0.06,
@@ -219,6 +1046,122 @@ class PaperVideo(Scene):
         ).move_to(mobject.get_center())
         return VGroup(outer, inner)
 
+    # ── Charts ──
+
+    def vbar_chart(self, data, bar_w=0.82, gap=0.28, max_h=3.4,
+                   base_y=None, vmax=100, fmt="{}%"):
+        """Vertical bars from (label, value, color) rows, centered on x=0.
+
+        Labels sit under the baseline (BASE_Y), values just above each
+        bar.
+        """
+        base_y = BASE_Y if base_y is None else base_y
+        names, vals, cols = zip(*data)
+        v = np.asarray(vals, dtype=float)
+        n = len(v)
+        x = (np.arange(n) - (n - 1) / 2) * (bar_w + gap)
+        top = base_y + max_h * v / vmax
+        bars = BarSet(
+            np.column_stack([x - bar_w / 2, np.full(n, base_y),
+                             x + bar_w / 2, top]),
+            cols, DOWN, fill_opacity=0.92,
+        )
+
+        labels, values = VGroup(), VGroup()
+        for name, val, xi, yi in zip(names, vals, x, top):
+            lbl = self.txt(name, font_size=17, color=MUTED)
+            lbl.move_to(np.array([xi, base_y - 0.55, 0]))
+            vtxt = self.txt(fmt.format(val), font_size=19, weight=BOLD)
+            vtxt.next_to(np.array([xi, yi, 0]), UP, buff=0.07)
+            labels.add(lbl)
+            values.add(vtxt)
+        return Chart(bars, labels, values, value_shift=DOWN * 0.08)
+
+    def hbar_chart(self, data, top_y=2.1, bar_h=0.36, row_gap=0.14,
+                   zero_x=None, max_w=None, vmax=1.0, label_left=None,
+                   fmt="{:+.3f}", label_fs=15, value_fs=14, radius=0.0,
+                   fill_opacity=0.88, emphasize=(), value_buff=0.1):
+        """Horizontal bars from (label, value, color) rows, top_y down.
+
+        Negative values grow left from zero_x, so this is also the
+        diverging chart. Labels are pinned to label_left; rows named in
+        `emphasize` get WHITE BOLD text, the rest MUTED. By default the
+        labels sit on LABEL_LEFT and zero is centered in the MAX_W span
+        that starts at BAR_LEFT.
+        """
+        label_left = LABEL_LEFT if label_left is None else label_left
+        max_w = MAX_W / 2 if max_w is None else max_w
+        zero_x = BAR_LEFT + MAX_W / 2 if zero_x is None else zero_x
+        names, vals, cols = zip(*data)
+        v = np.asarray(vals, dtype=float)
+        n = len(v)
+        y = top_y - np.arange(n) * (bar_h + row_gap)
+        w = np.abs(v) * max_w / vmax
+        neg = v < 0
+        x0 = np.where(neg, zero_x - w, zero_x)
+        bars = BarSet(
+            np.column_stack([x0, y - bar_h / 2, x0 + w, y + bar_h / 2]),
+            cols, np.where(neg[:, None], RIGHT, LEFT),
+            radius=radius, fill_opacity=fill_opacity,
+        )
+
+        labels, values = VGroup(), VGroup()
+        ends = np.where(neg, x0, x0 + w)
+        for name, val, yi, end, is_neg in zip(names, vals, y, ends, neg):
+            style = (dict(color=WHITE, weight=BOLD) if name in emphasize
+                     else dict(color=MUTED))
+            lbl = self.txt(name, font_size=label_fs, **style)
+            lbl.set_y(yi)
+            lbl.align_to(np.array([label_left, 0, 0]), LEFT)
+            vtxt = self.txt(fmt.format(val), font_size=value_fs, **style)
+            vtxt.next_to(np.array([end, yi, 0]), LEFT if is_neg else RIGHT,
+                         buff=value_buff)
+            labels.add(lbl)
+            values.add(vtxt)
+        shifts = np.where(neg[:, None], LEFT, RIGHT) * 0.05
+        return Chart(bars, labels, values, value_shift=shifts)
+
+    def paired_chart(self, data, top_y=1.6, bar_h=0.42, row_gap=0.3,
+                     bar_left=None, max_w=None, vmax=None, label_left=None):
+        """Gap chart from (label, metric_a, metric_b) rows.
+
+        metric_a is a light bar, metric_b a solid bar over it in the
+        same color (COLORS[label]); the gap is written past the end.
+        Defaults follow the format: LABEL_LEFT, BAR_LEFT, MAX_W.
+        """
+        bar_left = BAR_LEFT if bar_left is None else bar_left
+        max_w = MAX_W if max_w is None else max_w
+        label_left = LABEL_LEFT if label_left is None else label_left
+        names, a, b = zip(*data)
+        a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+        n = len(a)
+        vmax = vmax or max(a.max(), b.max())
+        y = top_y - np.arange(n) * (bar_h + row_gap)
+        cols = [COLORS.get(name, ACCENT) for name in names]
+
+        def corners(vals):
+            return np.column_stack([np.full(n, bar_left), y - bar_h / 2,
+                                    bar_left + vals * max_w / vmax,
+                                    y + bar_h / 2])
+
+        back = BarSet(corners(a), cols, LEFT, radius=0.06, fill_opacity=0.3)
+        front = BarSet(corners(b), cols, LEFT, radius=0.06,
+                       fill_opacity=0.92)
+
+        labels, values = VGroup(), VGroup()
+        ends = bar_left + np.maximum(a, b) * max_w / vmax
+        for name, gap, yi, end in zip(names, a - b, y, ends):
+            lbl = self.txt(name, font_size=17, color=WHITE, weight=BOLD)
+            lbl.set_y(yi)
+            lbl.align_to(np.array([label_left, 0, 0]), LEFT)
+            vtxt = self.txt(f"{-gap:+g}", font_size=17, color=RED,
+                            weight=BOLD)
+            vtxt.next_to(np.array([end, yi, 0]), RIGHT, buff=0.12)
+            labels.add(lbl)
+            values.add(vtxt)
+        return Chart([back, front], labels, values,
+                     value_shift=RIGHT * 0.05)
+
     # ── Scene 1: Hook ─────────────────────────────────────────────────
 
     def scene_1_hook(self):
@@ -252,7 +1195,10 @@ class PaperVideo(Scene):
         pills = VGroup(*[
             self.pill(name, color, w=2.3, h=0.42, fs=17)
             for name, color in COLORS.items()
-        ]).arrange(RIGHT, buff=0.25).move_to(ORIGIN)
+        ]).arrange(RIGHT, buff=0.25)
+        if pills.width > config.frame_width - 1:    # vertical / square
+            pills.arrange_in_grid(cols=2, buff=0.25)
+        pills.move_to(ORIGIN)
 
         self.play(
             FadeIn(heading),
@@ -268,42 +1214,11 @@ class PaperVideo(Scene):
 
     def scene_3_results(self):
         """Animated bar chart with headline numbers."""
-        BAR_W  = 0.82
-        GAP    = 0.28
-        MAX_H  = 3.4
-        BASE_Y = -2.55
-
-        n = len(CHART_DATA)
-        total_w = n * BAR_W + (n - 1) * GAP
-        start_x = -total_w / 2 + BAR_W / 2
-
-        bars = VGroup()
-        labels = VGroup()
-        values = VGroup()
-
-        for i, (name, val, col) in enumerate(CHART_DATA):
-            x = start_x + i * (BAR_W + GAP)
-            h = MAX_H * val / 100
-
-            bar = Rectangle(
-                width=BAR_W, height=h,
-                fill_color=col, fill_opacity=0.92, stroke_width=0,
-            )
-            bar.move_to(np.array([x, BASE_Y + h / 2, 0]))
-
-            lbl = self.txt(name, font_size=17, color=MUTED)
-            lbl.move_to(np.array([x, BASE_Y - 0.55, 0]))
-
-            vtxt = self.txt(f"{val}%", font_size=19, weight=BOLD)
-            vtxt.next_to(bar, UP, buff=0.07)
-
-            bars.add(bar)
-            labels.add(lbl)
-            values.add(vtxt)
+        chart = self.vbar_chart(CHART_DATA)
 
         baseline = Line(
-            start=np.array([-total_w / 2 - 0.3, BASE_Y, 0]),
-            end=np.array([total_w / 2 + 0.3, BASE_Y, 0]),
+            start=chart.bars.get_corner(DL) + LEFT * 0.3,
+            end=chart.bars.get_corner(DR) + RIGHT * 0.3,
             color=BORDER, stroke_width=1.5,
         )
 
@@ -313,11 +1228,9 @@ class PaperVideo(Scene):
 
         # Animate
         self.play(FadeIn(sec), Create(baseline), run_time=0.5)
-        self.play(*[FadeIn(l) for l in labels], run_time=0.3)
+        self.play(FadeIn(chart.labels), run_time=0.3)
         self.play(
-            LaggedStart(*[GrowFromEdge(b, DOWN) for b in bars], lag_ratio=0.07),
-            LaggedStart(*[FadeIn(v, shift=DOWN * 0.08) for v in values],
-                         lag_ratio=0.07),
+            chart.grow(lag_ratio=0.07),
             run_time=1.6,
             rate_func=rate_functions.ease_out_cubic,
         )
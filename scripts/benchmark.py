@@ -0,0 +1,380 @@
+"""Render benchmark suite for the scaffold and the worked example.
+
+Renders PaperVideo (references/manim-scaffold.py) and DeepThinkingVideo
+(examples/deep-thinking-tokens/) at each quality tier, timing every
+scene_N_* segment, and microbenchmarks the helpers the scripts lean on:
+txt() (cold and warm glyph cache), pill(), glow_highlight(), a 60-row
+hbar_chart() and a scene_wipe() over a few hundred mobjects, reported
+before/after against the old one-FadeOut-per-mobject wipe. Every
+measurement runs in a fresh process so peak RSS and caches are per run.
+--stock adds a second render per tier with FRAME_BUFFERS = 0, Manim's
+own writer path (every frame copied onto an unbounded queue), so the
+frame ring is measured against stock Manim (reported as
+`Class@q[stock]`, with the ratio).
+
+Usage:
+  python scripts/benchmark.py                          # -ql -qm -qh, all
+  python scripts/benchmark.py -q l --micro-only -o bench.json
+  python scripts/benchmark.py -q l --script my_video.py:MyVideo
+  python scripts/benchmark.py -q l --compare baseline.json --threshold 0.15
+  python scripts/benchmark.py -q h --no-micro --stock
+
+--compare exits with status 1 if any wall time or helper mean grew by
+more than the threshold (default 10%) against the stored baseline.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from scene_tools import (
+    load_scene, peak_rss_mb, quality_config, split_construct,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SCRIPTS = [
+    (ROOT / "references" / "manim-scaffold.py", "PaperVideo"),
+    (ROOT / "examples" / "deep-thinking-tokens" / "deep_thinking_video.py",
+     "DeepThinkingVideo"),
+]
+
+
+# ── Child-process measurements ───────────────────────────────────────
+
+def _isolate(glyph_dir):
+    """Point the txt() glyph cache at `glyph_dir` (before the script is
+    imported) so every run starts from a known cache state."""
+    os.environ["GLYPH_CACHE_DIR"] = glyph_dir
+
+
+# Script settings per render variant: globals of the module defining
+# frame_pipeline() (the script, or the scaffold the example loads it
+# from), set before the render
+VARIANTS = {
+    "stock": {"FRAME_BUFFERS": 0},
+}
+
+
+def _render(script, scene_name, quality, media_dir, glyph_dir,
+            variant=None):
+    """Full render with per-segment wall times. Runs in a child."""
+    from manim import tempconfig
+
+    _isolate(glyph_dir)
+    module, base = load_scene(script, scene_name)
+    pipeline = getattr(module, "frame_pipeline", None)
+    owner = sys.modules[pipeline.__module__] if pipeline else module
+    for key, value in VARIANTS.get(variant, {}).items():
+        setattr(owner, key, value)
+    plan = split_construct(base)
+    marks = []
+
+    # Sampled at every scene_N_* boundary. Peak RSS is a high-water mark,
+    # so a scene's growth is how far it pushed the peak up
+    def mark(seg, scene):
+        marks.append((seg.name, time.perf_counter(), scene.renderer.time,
+                      peak_rss_mb()))
+
+    def construct(self):
+        plan.run(self, before=mark)
+        marks.append((None, time.perf_counter(), self.renderer.time,
+                      peak_rss_mb()))
+
+    scene_cls = type(base.__name__, (base,), {"construct": construct})
+    overrides = quality_config(quality)
+    overrides.update({
+        "input_file": str(Path(script).resolve()),
+        "media_dir": media_dir,
+        "disable_caching": True,
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+    })
+    fps = overrides["frame_rate"]
+    t0 = time.perf_counter()
+    with tempconfig(overrides):
+        scene_cls().render()
+    wall = time.perf_counter() - t0
+
+    scenes = []
+    for (name, t_a, s_a, m_a), (_, t_b, s_b, m_b) in zip(marks, marks[1:]):
+        frames = round((s_b - s_a) * fps)
+        scenes.append({
+            "name": name,
+            "wall": round(t_b - t_a, 4),
+            "frames": frames,
+            "fps": round(frames / max(t_b - t_a, 1e-9), 2),
+            "peak_rss_mb": round(m_b, 1),
+            "rss_growth_mb": round(m_b - m_a, 1),
+        })
+    frames = sum(s["frames"] for s in scenes)
+    return {
+        "kind": "render",
+        "name": f"{base.__name__}@{quality}"
+                + (f"[{variant}]" if variant else ""),
+        "script": str(script),
+        "quality": quality,
+        "wall": round(wall, 4),
+        "frames": frames,
+        "fps": round(frames / wall, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "scenes": scenes,
+    }
+
+
+def _time(fn, n):
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {
+        "n": n,
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p50_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+    }
+
+
+def _micro(script, scene_name, n, glyph_dir, wipe_count):
+    """Helper microbenchmarks on a dry-run scene. Runs in a child."""
+    from manim import BLUE, DOWN, FadeOut, Rectangle, tempconfig
+    from scene_tools import dry_run_scene
+
+    _isolate(glyph_dir)
+    module, cls = load_scene(script, scene_name)
+    results = []
+
+    def record(name, stats):
+        results.append({"kind": "micro",
+                        "name": f"{cls.__name__}.{name}", **stats})
+
+    with tempconfig({"dry_run": True, "progress_bar": "none",
+                     "verbosity": "WARNING"}):
+        scene = dry_run_scene(cls)
+        scene.character = scene.logo = None
+        cache = getattr(module, "GLYPHS", None)
+
+        labels = [f"Label {i}" for i in range(n)]
+        it = iter(labels)
+        record("txt[cold]", _time(lambda: cls.txt(next(it), font_size=20), n))
+        if cache is not None:
+            record("txt[warm]", _time(lambda: cls.txt("Label 0",
+                                                      font_size=20), n))
+            # Disk layer only: drop the in-memory templates first
+            it = iter(labels)
+
+            def disk_hit():
+                cache._lru.clear()
+                cls.txt(next(it), font_size=20)
+
+            record("txt[disk]", _time(disk_hit, n))
+
+        record("pill", _time(lambda: scene.pill("Entity A", BLUE), n))
+        bar = Rectangle(width=0.8, height=2.4)
+        record("glow_highlight",
+               _time(lambda: scene.glow_highlight(bar), n))
+        if hasattr(scene, "hbar_chart"):
+            rows = [(f"Row {i}", (i % 13 - 6) / 6, BLUE) for i in range(60)]
+            record("hbar_chart[60]", _time(lambda: scene.hbar_chart(
+                rows, top_y=3.5, bar_h=0.08, row_gap=0.03), n))
+
+    # scene_wipe needs real frames: rasterize (but do not encode) a wipe
+    # of `wipe_count` mobjects at -ql, against the old one-FadeOut-per-
+    # mobject wipe as a reference
+    wipe_times = {"scene_wipe": [], "scene_wipe_unbatched": []}
+
+    def unbatched(scene):
+        scene.play(*[FadeOut(m, shift=DOWN * 0.2) for m in scene.mobjects],
+                   run_time=0.5)
+
+    class WipeBench(cls):
+        def construct(self):
+            self.character = self.logo = None
+            for _ in range(max(n // 10, 3)):
+                for name, wipe in (("scene_wipe", type(self).scene_wipe),
+                                   ("scene_wipe_unbatched", unbatched)):
+                    self.add(*[
+                        Rectangle(width=0.1, height=0.5, fill_color=BLUE,
+                                  fill_opacity=0.9).shift(DOWN * (i % 7) * 0.1)
+                        for i in range(wipe_count)
+                    ])
+                    t0 = time.perf_counter()
+                    wipe(self)
+                    wipe_times[name].append((time.perf_counter() - t0) * 1000)
+
+    overrides = quality_config("l")
+    overrides.update({"write_to_movie": False, "disable_caching": True,
+                      "progress_bar": "none", "verbosity": "WARNING"})
+    with tempconfig(overrides):
+        WipeBench().render()
+    for name, samples in wipe_times.items():
+        record(f"{name}[{wipe_count}]", {
+            "n": len(samples),
+            "mean_ms": round(statistics.fmean(samples), 4),
+            "p50_ms": round(statistics.median(samples), 4),
+            "min_ms": round(min(samples), 4),
+        })
+    # Before (one FadeOut per mobject) / after (one batched FadeOut)
+    before = statistics.fmean(wipe_times["scene_wipe_unbatched"])
+    after = statistics.fmean(wipe_times["scene_wipe"])
+    batched = next(r for r in results
+                   if r["name"] == f"{cls.__name__}.scene_wipe[{wipe_count}]")
+    batched.update({"before_ms": round(before, 4),
+                    "speedup": round(before / after, 2)})
+    for r in results:
+        r["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return results
+
+
+def _in_child(fn, *args):
+    """Run fn in a fresh spawned interpreter and return its result."""
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(fn, *args).result()
+
+
+# ── Suite / comparison ───────────────────────────────────────────────
+
+def run_suite(scripts, qualities, micro=True, renders=True, n=50,
+              wipe_count=300, media_dir=None, variants=()):
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        media_dir = media_dir or str(Path(tmp) / "media")
+        for script, scene_name in scripts:
+            if micro:
+                glyphs = tempfile.mkdtemp(dir=tmp)
+                for r in _in_child(_micro, str(script), scene_name, n,
+                                   glyphs, wipe_count):
+                    results.append(r)
+                    line = f"  {r['name']:<42} {r['mean_ms']:>9.3f} ms"
+                    if "speedup" in r:
+                        line += (f"  (before {r['before_ms']:.3f} ms, "
+                                 f"{r['speedup']:.2f}x)")
+                    print(line)
+            if renders:
+                for q in qualities:
+                    runs = {}
+                    for variant in (None, *variants):
+                        glyphs = tempfile.mkdtemp(dir=tmp)
+                        r = _in_child(_render, str(script), scene_name, q,
+                                      media_dir, glyphs, variant)
+                        results.append(r)
+                        runs[variant] = r
+                        print(f"  {r['name']:<42} {r['wall']:>8.2f} s "
+                              f"{r['fps']:>7.1f} fps "
+                              f"{r['peak_rss_mb']:>7.0f} MB")
+                        for sc in r["scenes"]:
+                            print(f"    {sc['name']:<40} {sc['wall']:>8.2f} s "
+                                  f"{sc['fps']:>7.1f} fps "
+                                  f"{sc['peak_rss_mb']:>7.0f} MB "
+                                  f"(+{sc['rss_growth_mb']:.0f})")
+                    for variant in variants:
+                        base, other = runs[None], runs[variant]
+                        print(f"  [{variant}] takes "
+                              f"{other['wall'] / base['wall']:.2f}x the wall "
+                              f"time of {base['name']}; peak RSS "
+                              f"{other['peak_rss_mb']:.0f} MB vs "
+                              f"{base['peak_rss_mb']:.0f} MB")
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "manim": _manim_version(),
+        "results": results,
+    }
+
+
+def _manim_version():
+    import manim
+
+    return manim.__version__
+
+
+def _metric(result):
+    return result["wall"] if result["kind"] == "render" else result["mean_ms"]
+
+
+def compare(current, baseline, threshold):
+    """Return (rows, regressed) comparing matching results by name."""
+    old = {r["name"]: r for r in baseline["results"]}
+    rows, regressed = [], False
+    for r in current["results"]:
+        if r["name"] not in old:
+            continue
+        before, after = _metric(old[r["name"]]), _metric(r)
+        change = (after - before) / before if before else 0.0
+        flag = change > threshold
+        regressed |= flag
+        rows.append((r["name"], before, after, change, flag))
+        for s in r.get("scenes", []):
+            prev = {p["name"]: p for p in old[r["name"]].get("scenes", [])}
+            if s["name"] in prev and prev[s["name"]]["wall"]:
+                b = prev[s["name"]]["wall"]
+                c = (s["wall"] - b) / b
+                regressed |= c > threshold
+                rows.append((f"  {s['name']}", b, s["wall"], c,
+                             c > threshold))
+    return rows, regressed
+
+
+def _parse_script(text):
+    path, _, name = text.partition(":")
+    return Path(path), name or None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-q", "--quality", action="append",
+                        choices=["l", "m", "h", "p", "k"],
+                        help="quality tier (repeatable, default: l m h)")
+    parser.add_argument("--script", type=_parse_script, action="append",
+                        metavar="PATH[:Class]",
+                        help="benchmark this script instead of the defaults")
+    parser.add_argument("--micro-only", action="store_true")
+    parser.add_argument("--no-micro", action="store_true")
+    parser.add_argument("-n", type=int, default=50,
+                        help="iterations per microbenchmark (default: 50)")
+    parser.add_argument("--wipe-count", type=int, default=300,
+                        help="mobjects faded by the scene_wipe benchmark")
+    parser.add_argument("--stock", action="store_true",
+                        help="also render with FRAME_BUFFERS = 0 "
+                             "(Manim's own writer path)")
+    parser.add_argument("-o", "--output", default="bench.json")
+    parser.add_argument("--compare", metavar="BASELINE")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    report = run_suite(
+        args.script or DEFAULT_SCRIPTS,
+        args.quality or ["l", "m", "h"],
+        micro=not args.no_micro,
+        renders=not args.micro_only,
+        n=args.n,
+        wipe_count=args.wipe_count,
+        variants=["stock"] if args.stock else [],
+    )
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"wrote {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        rows, regressed = compare(report, baseline, args.threshold)
+        for name, before, after, change, flag in rows:
+            mark = "  REGRESSION" if flag else ""
+            print(f"{name:<44} {before:>10.3f} -> {after:>10.3f} "
+                  f"({change:+.1%}){mark}")
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""Layout-only dry run: overlapping text, off-frame elements, LABEL_LEFT.
+
+Runs construct() with every play() stepped straight to its end state and
+nothing rasterized or encoded (the dry run the segment tools use). After
+each play() it takes the bounding box of every text object and every
+leaf shape on screen, puts them in a uniform-grid spatial index and
+reports:
+
+  overlap     two text objects whose boxes intersect
+  off-frame   anything reaching past the 14.2 x 8 frame
+  label-left  a text whose left edge is near, but not on, LABEL_LEFT
+              (and LABEL_LEFT values that differ between scenes)
+
+Each issue is reported once, at the play() where it first appears.
+
+Usage:
+  python scripts/check_layout.py script.py PaperVideo
+  python scripts/check_layout.py script.py PaperVideo --json layout.json
+
+Exits with status 1 if there is any overlap or off-frame issue.
+"""
+
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+import argparse
+import ast
+import json
+import math
+import sys
+import time
+
+from scene_tools import (
+    SCENE_METHOD, call_site, dry_run_scene, load_scene, quality_config,
+)
+
+TEXT_TYPES = {
+    "Text", "MarkupText", "Paragraph", "GlyphText", "Tex", "MathTex",
+    "SingleStringMathTex", "DecimalNumber", "Integer", "Code",
+}
+MIN_OVERLAP = 0.02   # ignore intersections thinner than this (units)
+FRAME_TOL = 0.01
+LABEL_NEAR = 0.3     # a left edge this near LABEL_LEFT was meant to be on it
+LABEL_TOL = 0.005
+CELL = 1.0           # grid cell size in frame units
+
+
+@dataclass
+class Issue:
+    kind: str
+    message: str
+    method: str
+    line: int
+    code: str
+    time: float
+
+
+@dataclass
+class Unit:
+    """A text object or a leaf shape, with its bounding box."""
+
+    mobject: object
+    is_text: bool
+    box: tuple    # x0, y0, x1, y1
+
+    @property
+    def name(self):
+        m = self.mobject
+        text = (getattr(m, "text", None) or getattr(m, "tex_string", None)
+                or getattr(m, "number", None))
+        if text is None:
+            return type(m).__name__
+        return f"{type(m).__name__}({str(text)[:32]!r})"
+
+
+def _is_text(mob):
+    return any(c.__name__ in TEXT_TYPES for c in type(mob).__mro__)
+
+
+def _visible(mob):
+    family = mob.family_members_with_points()
+    if not family:
+        return False
+    for m in family:
+        if not hasattr(m, "get_fill_opacity"):
+            return True    # images, points: no opacity to speak of
+        if m.get_fill_opacity() > 0 or (m.get_stroke_opacity() > 0
+                                        and m.get_stroke_width() > 0):
+            return True
+    return False
+
+
+def _box(mob):
+    import numpy as np
+
+    points = np.concatenate(
+        [m.points for m in mob.family_members_with_points()])
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+
+
+def layout_units(mobjects):
+    """Text objects (not split into glyphs) and leaf shapes, visible only."""
+    units, stack = [], list(reversed(mobjects))
+    while stack:
+        mob = stack.pop()
+        if _is_text(mob):
+            if _visible(mob):
+                units.append(Unit(mob, True, _box(mob)))
+        elif mob.submobjects:
+            stack.extend(reversed(mob.submobjects))
+        elif len(mob.points) and _visible(mob):
+            units.append(Unit(mob, False, _box(mob)))
+    return units
+
+
+class GridIndex:
+    """Uniform-grid spatial hash: each box is filed under every cell it
+    touches, so only boxes sharing a cell are ever compared."""
+
+    def __init__(self, cell=CELL):
+        self.cell = cell
+        self.cells = defaultdict(list)
+
+    def insert(self, i, box):
+        x0, y0, x1, y1 = (math.floor(v / self.cell) for v in box)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells[cx, cy].append(i)
+
+    def pairs(self):
+        seen = set()
+        for members in self.cells.values():
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    pair = (members[a], members[b])
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+
+def _intersection(a, b):
+    return (min(a[2], b[2]) - max(a[0], b[0]),
+            min(a[3], b[3]) - max(a[1], b[1]))
+
+
+def label_lefts(script):
+    """{function name: LABEL_LEFT value} for every numeric LABEL_LEFT
+    assignment in the script ("<module>" for a module-level one)."""
+    tree = ast.parse(Path(script).read_text())
+    found = {}
+
+    def scan(nodes, owner):
+        for node in nodes:
+            if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+                scan(node.body, node.name if isinstance(
+                    node, ast.FunctionDef) else owner)
+            elif isinstance(node, ast.Assign) and any(
+                    isinstance(t, ast.Name) and t.id == "LABEL_LEFT"
+                    for t in node.targets):
+                try:
+                    found[owner] = float(ast.literal_eval(node.value))
+                except ValueError:
+                    pass
+
+    scan(tree.body, "<module>")
+    return found
+
+
+class LayoutChecker:
+    def __init__(self, script, lefts):
+        self.script = Path(script).resolve()
+        self.lefts = lefts
+        self.issues = []
+        self.seen = set()
+        self.snapshots = 0
+        self.units = 0
+
+    def _report(self, key, kind, message, site, t):
+        if key in self.seen:
+            return
+        self.seen.add(key)
+        self.issues.append(Issue(kind, message, *site, round(t, 3)))
+
+    def snapshot(self, scene, site):
+        from manim import config
+
+        self.snapshots += 1
+        t = scene.renderer.time
+        units = layout_units(scene.mobjects)
+        self.units += len(units)
+        xr = config.frame_x_radius + FRAME_TOL
+        yr = config.frame_y_radius + FRAME_TOL
+
+        index = GridIndex()
+        for i, u in enumerate(units):
+            x0, y0, x1, y1 = u.box
+            if x0 < -xr or x1 > xr or y0 < -yr or y1 > yr:
+                past = max(-xr - x0, x1 - xr, -yr - y0, y1 - yr)
+                self._report(("off", id(u.mobject)), "off-frame",
+                             f"{u.name} is {past:.2f} past the frame edge",
+                             site, t)
+            if u.is_text:
+                index.insert(i, u.box)
+
+        for i, j in index.pairs():
+            a, b = units[i], units[j]
+            w, h = _intersection(a.box, b.box)
+            if w > MIN_OVERLAP and h > MIN_OVERLAP:
+                key = ("overlap", *sorted((id(a.mobject), id(b.mobject))))
+                self._report(key, "overlap",
+                             f"{a.name} and {b.name} overlap by "
+                             f"{w:.2f} x {h:.2f}", site, t)
+
+        method = site[0]
+        targets = ([self.lefts[method]] if method in self.lefts
+                   else sorted(set(self.lefts.values())))
+        for u in units:
+            if not u.is_text:
+                continue
+            for left in targets:
+                off = u.box[0] - left
+                if LABEL_TOL < abs(off) < LABEL_NEAR:
+                    self._report(("left", id(u.mobject)), "label-left",
+                                 f"{u.name} starts at x={u.box[0]:.3f}, "
+                                 f"{off:+.3f} from LABEL_LEFT={left:g}",
+                                 site, t)
+
+
+def check(script, scene_name=None, quality="l"):
+    # quality only sets the frame shape; every 16:9 tier is 14.2 x 8
+    """Dry-run the script and return (issues, checker, seconds)."""
+    from manim import tempconfig
+
+    t0 = time.perf_counter()
+    module, base = load_scene(script, scene_name)
+    lefts = label_lefts(script)
+    # LABEL_LEFT = FORMAT["LABEL_LEFT"] (the scaffold) is no literal:
+    # take the value the script's import gave it
+    value = getattr(module, "LABEL_LEFT", None)
+    if "<module>" not in lefts and isinstance(value, (int, float)):
+        lefts["<module>"] = float(value)
+    checker = LayoutChecker(script, lefts)
+
+    class Checked(base):
+        def play(self, *args, **kwargs):
+            super().play(*args, **kwargs)
+            checker.snapshot(self, call_site(checker.script))
+
+    Checked.__name__ = base.__name__
+    overrides = quality_config(quality)
+    overrides.update({"dry_run": True, "progress_bar": "none",
+                      "verbosity": "WARNING"})
+    with tempconfig(overrides):
+        scene = dry_run_scene(Checked)
+        scene.setup()
+        scene.construct()
+
+    per_scene = {k: v for k, v in lefts.items() if SCENE_METHOD.match(k)}
+    if len(set(per_scene.values())) > 1:
+        values = ", ".join(f"{k}={v:g}" for k, v in per_scene.items())
+        checker.issues.append(Issue(
+            "label-left", f"LABEL_LEFT differs between scenes ({values})",
+            "<script>", 0, "", 0.0))
+    return checker.issues, checker, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("script")
+    parser.add_argument("scene", nargs="?", default=None)
+    parser.add_argument("--json", metavar="PATH", help="write issues as JSON")
+    args = parser.parse_args(argv)
+
+    issues, checker, seconds = check(args.script, args.scene)
+    for issue in issues:
+        where = f"{issue.method}:L{issue.line}" if issue.line else issue.method
+        print(f"  {issue.kind:<10} {where:<28} t={issue.time:6.2f}s  "
+              f"{issue.message}")
+    errors = sum(i.kind != "label-left" for i in issues)
+    print(f"{checker.snapshots} plays, {checker.units} boxes checked in "
+          f"{seconds:.2f}s: {errors} errors, {len(issues) - errors} warnings")
+    if args.json:
+        Path(args.json).write_text(json.dumps(
+            [asdict(i) for i in issues], indent=2))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
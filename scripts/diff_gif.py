@@ -0,0 +1,319 @@
+"""GIF encoder that writes only what changed between frames.
+
+The scaffold's videos are mostly a static BG with small moving regions:
+a bar growing, a pill fading in, the character sliding. This encoder
+takes frames that ffmpeg has already mapped to the recipe's palette
+(same fps, scale, palettegen and dither). It then, with NumPy:
+
+- compares each frame with what the viewer currently sees, and writes
+  only the bounding rectangle of the changed pixels;
+- marks unchanged pixels inside that rectangle with the palette's
+  transparent entry. Those runs cost LZW a few bits, so two distant
+  changes in one rectangle stay cheap;
+- merges frames with no change into the previous frame's delay, so a
+  wait() of 3 seconds is one image, not 45.
+
+paletteuse runs with diff_mode=rectangle, so dithering is redone only
+inside the rectangle that changed. Dithered BG pixels would otherwise
+flicker between indices and show up as changes. Dither noise on moving
+gradients and glows still flickers; --fuzz (lossy) leaves a pixel as
+shown while its color stays within a few levels.
+
+Usage:
+  python scripts/diff_gif.py media/videos/script/1080p60/PaperVideo.mp4
+  python scripts/diff_gif.py in.mp4 --fps 15 --width 720 --colors 196 \\
+      -o exports/paper.gif --compare
+  python scripts/diff_gif.py in.mp4 --fuzz 12 --compare
+
+--compare also runs the ffmpeg recipe with the same settings and prints
+both file sizes, encode times and SSIM against the input.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import itertools
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from gif_budget import GIF_CACHE_DIR, Trial, palette, score
+
+# Frames LZW-encoded per task when running in parallel
+CHUNK = 16
+
+
+@dataclass
+class Stats:
+    frames: int = 0        # frames decoded
+    images: int = 0        # images written (after merging)
+    pixels: int = 0        # pixels written, over all images
+    width: int = 0
+    height: int = 0
+    seconds: float = 0.0
+
+
+# ── LZW ──────────────────────────────────────────────────────────────
+
+def lzw(data, min_size=8):
+    """GIF LZW code stream for `data` (palette indices), packed into
+    255-byte sub-blocks."""
+    clear, end = 1 << min_size, (1 << min_size) + 1
+    out = bytearray()
+    acc = nbits = 0
+    size = min_size + 1
+    codes, next_code = {}, end + 1
+
+    acc, nbits = clear, size
+    prefix = data[0]
+    for byte in data[1:]:
+        key = prefix << 8 | byte
+        code = codes.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        acc |= prefix << nbits
+        nbits += size
+        while nbits >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            nbits -= 8
+        if next_code < 4096:
+            codes[key] = next_code
+            next_code += 1
+            if next_code > 1 << size and size < 12:
+                size += 1
+        else:
+            # Table full: start over, as most encoders do
+            acc |= clear << nbits
+            nbits += size
+            codes, next_code, size = {}, end + 1, min_size + 1
+        prefix = byte
+    acc |= prefix << nbits
+    nbits += size
+    # The decoder adds its last entry on reading `prefix`, and may grow
+    # the code size before it reads the end code
+    if len(data) > 1 and next_code == 1 << size and size < 12:
+        size += 1
+    acc |= end << nbits
+    nbits += size
+    while nbits > 0:
+        out.append(acc & 0xFF)
+        acc >>= 8
+        nbits -= 8
+
+    blocks = bytearray([min_size])
+    for i in range(0, len(out), 255):
+        chunk = out[i:i + 255]
+        blocks.append(len(chunk))
+        blocks += chunk
+    blocks.append(0)
+    return bytes(blocks)
+
+
+def _lzw_many(images):
+    return [lzw(image) for image in images]
+
+
+# ── Frame diffing ────────────────────────────────────────────────────
+
+def dirty_rects(frames, transparent=None, colors=None, fuzz=0):
+    """Yield (x, y, sub-image, repeat) from full palette-index frames.
+
+    `repeat` counts the frames the image stays up (1 plus the unchanged
+    frames merged into it). Pixels inside the rectangle that already
+    show the right index are set to `transparent`, if given. With
+    `fuzz`, a pixel whose color (`colors`, the (256, 3) palette) is
+    within `fuzz` levels per channel of the one shown counts as
+    unchanged: lossy, but it drops the dither noise that flickers
+    between neighboring palette entries from frame to frame.
+    """
+    if fuzz:
+        colors = np.asarray(colors, dtype=np.int16)
+    canvas = pending = None
+    for frame in frames:
+        if canvas is None:
+            canvas = frame.copy()
+            pending = [0, 0, frame, 1]
+            continue
+        changed = frame != canvas
+        if fuzz:
+            diff = np.abs(colors[frame[changed]] - colors[canvas[changed]])
+            changed[changed] = diff.max(axis=1) > fuzz
+        rows = np.flatnonzero(changed.any(axis=1))
+        if rows.size == 0:
+            pending[3] += 1
+            continue
+        cols = np.flatnonzero(changed.any(axis=0))
+        y0, y1, x0, x1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+        sub = frame[y0:y1, x0:x1].copy()
+        if transparent is not None:
+            sub[~changed[y0:y1, x0:x1]] = transparent
+        canvas[changed] = frame[changed]
+        yield tuple(pending)
+        pending = [x0, y0, sub, 1]
+    if pending is not None:
+        yield tuple(pending)
+
+
+# ── GIF container ────────────────────────────────────────────────────
+
+def _header(width, height, colors):
+    """Header, global color table and the loop-forever extension."""
+    return (b"GIF89a"
+            + np.array([width, height], "<u2").tobytes()
+            + bytes([0xF7, 0, 0])          # 256-entry global table
+            + colors.tobytes()
+            + b"\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00")
+
+
+def _image(x, y, w, h, delay, transparent, data):
+    """Graphic control extension, image descriptor and image data."""
+    flags = 0x04 | (transparent is not None)    # disposal 1: keep
+    return (bytes([0x21, 0xF9, 4, flags]) + int(delay).to_bytes(2, "little")
+            + bytes([transparent or 0, 0, 0x2C])
+            + np.array([x, y, w, h], "<u2").tobytes() + b"\x00" + data)
+
+
+def read_frames(src, fps, width, height, palette_path, dither, info):
+    """Yield the palette-index frames of `src` after the recipe's
+    filters. Before the first, fills `info` with the palette as (256, 3)
+    RGB ("colors") and its transparent index or None ("transparent")."""
+    cmd = ["ffmpeg", "-loglevel", "error", "-i", str(src),
+           "-i", str(palette_path), "-lavfi",
+           f"[0:v]fps={fps},scale={width}:{height}:flags=lanczos[x];"
+           f"[x][1:v]paletteuse=dither={dither}:diff_mode=rectangle",
+           "-f", "rawvideo", "-pix_fmt", "pal8", "-"]
+    size = width * height
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    try:
+        while True:
+            raw = proc.stdout.read(size + 1024)
+            if len(raw) < size + 1024:
+                break
+            if not info:
+                # pal8 frames end with the palette as 32-bit BGRA
+                bgra = np.frombuffer(raw[size:], np.uint8).reshape(256, 4)
+                clear = np.flatnonzero(bgra[:, 3] == 0)
+                info["colors"] = bgra[:, 2::-1].copy()
+                info["transparent"] = int(clear[0]) if clear.size else None
+            yield np.frombuffer(raw, np.uint8, size).reshape(height, width)
+    finally:
+        proc.stdout.close()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def encode(src, out, fps=15, width=720, colors=196, dither="bayer",
+           fuzz=0, jobs=None, cache_dir=None):
+    """Write the GIF; returns Stats. LZW runs on up to `jobs` processes
+    (default: one per core). See dirty_rects() for `fuzz`."""
+    import av
+
+    t0 = time.perf_counter()
+    with av.open(str(src)) as container:
+        stream = container.streams.video[0]
+        width = min(width, stream.width)
+        height = round(width * stream.height / stream.width)
+    cache_dir = Path(cache_dir or GIF_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    info = {}
+    frames = read_frames(src, fps, width, height,
+                         palette(src, width, colors, cache_dir), dither, info)
+    # The transparent index is known once the first frame is read
+    first = next(frames, None)
+    if first is None:
+        raise SystemExit(f"{src}: no frames decoded")
+    transparent = info["transparent"]
+    rects = list(dirty_rects(itertools.chain([first], frames), transparent,
+                             info["colors"], fuzz))
+    images = [np.ascontiguousarray(sub).tobytes() for _, _, sub, _ in rects]
+    workers = jobs or os.cpu_count() or 1
+    if workers > 1 and len(images) > CHUNK:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = [images[i:i + CHUNK]
+                      for i in range(0, len(images), CHUNK)]
+            data = [d for part in pool.map(_lzw_many, chunks) for d in part]
+    else:
+        data = _lzw_many(images)
+
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    stats = Stats(images=len(rects), width=width, height=height)
+    with open(out, "wb") as f:
+        f.write(_header(width, height, info["colors"]))
+        for i, ((x, y, sub, repeat), lzw_data) in enumerate(zip(rects, data)):
+            # Delays are whole centiseconds: round the running total so
+            # the error does not build up
+            delay = (round((stats.frames + repeat) * 100 / fps)
+                     - round(stats.frames * 100 / fps))
+            stats.frames += repeat
+            stats.pixels += sub.size
+            f.write(_image(x, y, sub.shape[1], sub.shape[0], delay,
+                           transparent if i else None, lzw_data))
+        f.write(b"\x3B")
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+def recipe(src, out, fps=15, width=720, colors=196, dither="bayer"):
+    """The ffmpeg recipe from rules/rendering.md, for comparison."""
+    t0 = time.perf_counter()
+    subprocess.run([
+        "ffmpeg", "-y", "-loglevel", "error", "-i", str(src), "-vf",
+        f"fps={fps},scale={width}:-1:flags=lanczos,split[s0][s1];"
+        f"[s0]palettegen=max_colors={colors}[p];"
+        f"[s1][p]paletteuse=dither={dither}",
+        "-loop", "0", str(out)], check=True)
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("input", help="rendered MP4 (or any video)")
+    parser.add_argument("-o", "--output",
+                        help="output GIF (default: exports/<stem>.gif)")
+    parser.add_argument("--fps", type=int, default=15)
+    parser.add_argument("--width", type=int, default=720)
+    parser.add_argument("--colors", type=int, default=196)
+    parser.add_argument("--dither", default="bayer")
+    parser.add_argument("--fuzz", type=int, default=0, metavar="LEVELS",
+                        help="treat colors within LEVELS (0-255, per "
+                             "channel) of the shown pixel as unchanged; "
+                             "lossy (default: 0, exact)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="LZW worker processes (default: one per core)")
+    parser.add_argument("--compare", action="store_true",
+                        help="also run the ffmpeg recipe and compare")
+    args = parser.parse_args(argv)
+
+    src = Path(args.input)
+    out = Path(args.output or f"exports/{src.stem}.gif")
+    settings = dict(fps=args.fps, width=args.width, colors=args.colors,
+                    dither=args.dither)
+    stats = encode(src, out, fuzz=args.fuzz, jobs=args.jobs, **settings)
+    size = out.stat().st_size
+    print(f"{out}: {size / 1024:.0f}KB in {stats.seconds:.2f}s "
+          f"({stats.frames} frames -> {stats.images} images, "
+          f"{stats.pixels / max(stats.frames, 1) / 1000:.0f}K px/frame)")
+    if args.compare:
+        ref = out.with_name(f"{out.stem}_recipe.gif")
+        seconds = recipe(src, ref, **settings)
+        ref_size = ref.stat().st_size
+        print(f"{ref}: {ref_size / 1024:.0f}KB in {seconds:.2f}s "
+              f"(ffmpeg recipe)")
+        ours, theirs = (score(src, Trial(**settings, path=path), args.fps,
+                              (stats.width, stats.height))
+                        for path in (out, ref))
+        print(f"size {size / ref_size:.0%} of the recipe, "
+              f"time {stats.seconds / seconds:.1f}x, SSIM "
+              f"{ours.ssim:.4f} vs {theirs.ssim:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Single-decode multi-output export (GIF variants, thumbnails, clips).
+
+The recipes in references/ffmpeg-recipes.md are separate ffmpeg runs, and
+each one decodes the whole MP4 again. This builds one filtergraph that
+decodes the render once, splits it into a branch per artifact, and gives
+every GIF variant its own palette.
+
+Usage:
+  python scripts/export_media.py media/videos/script/1080p60/PaperVideo.mp4
+  python scripts/export_media.py in.mp4 --gifs standard small hq \\
+      --thumb 3 --thumb 12 --clip 5:12 --scale 1280x720 -o exports/
+  python scripts/export_media.py in.mp4 --separate    # old way, for timing
+
+Prints the size of every artifact and the wall time. A single pass
+encodes all artifacts at once, so it has one total; --separate also
+times each artifact's own run. --json writes the same report to a file.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+# Mirrors the GIF table in rules/rendering.md
+GIF_VARIANTS = {
+    "standard": dict(fps=15, width=720, colors=196, dither="bayer",
+                     suffix=""),
+    "small":    dict(fps=12, width=480, colors=128, dither="bayer",
+                     suffix="_small"),
+    "hq":       dict(fps=20, width=1080, colors=256, dither="sierra2_4a",
+                     suffix="_hq"),
+}
+
+
+@dataclass
+class Artifact:
+    """One output of the export pass: a filter chain and encoder args."""
+
+    kind: str
+    path: Path
+    chain: str                 # filters applied to this artifact's branch
+    out_args: list
+    seconds: float = None      # own encode time (--separate only)
+    size: int = 0
+    extra: dict = field(default_factory=dict)
+
+
+def gif_chain(fps, width, colors, dither, tag):
+    """fps/scale then a per-variant palettegen -> paletteuse pair."""
+    return (
+        f"fps={fps},scale={width}:-1:flags=lanczos,split[{tag}a][{tag}b];"
+        f"[{tag}a]palettegen=max_colors={colors}[{tag}p];"
+        f"[{tag}b][{tag}p]paletteuse=dither={dither}"
+    )
+
+
+def plan_artifacts(src, out_dir, gifs=("standard", "small", "hq"),
+                   thumbs=(), clips=(), scales=(), thumb_size=None):
+    src, out_dir = Path(src), Path(out_dir)
+    stem = src.stem
+    arts = []
+    for name in gifs:
+        v = GIF_VARIANTS[name]
+        arts.append(Artifact(
+            "gif", out_dir / f"{stem}{v['suffix']}.gif",
+            gif_chain(v["fps"], v["width"], v["colors"], v["dither"],
+                      f"g{len(arts)}"),
+            ["-loop", "0"], extra={"variant": name},
+        ))
+    for t in thumbs:
+        scale = f",scale={thumb_size.replace('x', ':')}" if thumb_size else ""
+        # A short trim keeps the branch from buffering the rest of the video
+        arts.append(Artifact(
+            "thumbnail", out_dir / f"{stem}_thumb_{t:g}s.png",
+            f"trim=start={t}:duration=0.5,setpts=PTS-STARTPTS{scale}",
+            ["-frames:v", "1", "-update", "1"], extra={"at": t},
+        ))
+    for start, end in clips:
+        arts.append(Artifact(
+            "clip", out_dir / f"{stem}_clip_{start:g}-{end:g}.mp4",
+            f"trim=start={start}:end={end},setpts=PTS-STARTPTS",
+            ["-c:v", "libx264", "-crf", "18", "-pix_fmt", "yuv420p",
+             "-movflags", "+faststart"],
+            extra={"start": start, "end": end},
+        ))
+    for size in scales:
+        w, h = size.split("x")
+        arts.append(Artifact(
+            "mp4", out_dir / f"{stem}_{h}p.mp4",
+            f"scale={w}:{h}:flags=lanczos",
+            ["-c:v", "libx264", "-crf", "18", "-pix_fmt", "yuv420p",
+             "-movflags", "+faststart"],
+            extra={"size": size},
+        ))
+    return arts
+
+
+def single_pass_cmd(src, arts):
+    """One ffmpeg invocation: decode once, split, one output per branch."""
+    n = len(arts)
+    graph = [f"[0:v]split={n}" + "".join(f"[in{i}]" for i in range(n))]
+    for i, art in enumerate(arts):
+        graph.append(f"[in{i}]{art.chain}[out{i}]")
+    cmd = ["ffmpeg", "-y", "-loglevel", "error", "-i", str(src),
+           "-filter_complex", ";".join(graph)]
+    for i, art in enumerate(arts):
+        cmd += ["-map", f"[out{i}]", "-an", *art.out_args, str(art.path)]
+    return cmd
+
+
+def separate_cmds(src, arts):
+    """The per-recipe way: one full decode per artifact."""
+    return [
+        ["ffmpeg", "-y", "-loglevel", "error", "-i", str(src),
+         "-filter_complex", f"[0:v]{art.chain}[out]", "-map", "[out]",
+         "-an", *art.out_args, str(art.path)]
+        for art in arts
+    ]
+
+
+def export(src, out_dir, separate=False, **kwargs):
+    """Run the export and fill in each artifact's size, and in separate
+    mode its encode time. In a single pass the branches run side by side
+    in one ffmpeg, so there is no per-artifact cost, only the wall time.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    arts = plan_artifacts(src, out_dir, **kwargs)
+    if not arts:
+        raise SystemExit("nothing to export")
+
+    t0 = time.time()
+    if separate:
+        for art, cmd in zip(arts, separate_cmds(src, arts)):
+            start = time.time()
+            subprocess.run(cmd, check=True)
+            art.seconds = time.time() - start
+    else:
+        subprocess.run(single_pass_cmd(src, arts), check=True)
+    wall = time.time() - t0
+    for art in arts:
+        art.size = art.path.stat().st_size
+    return arts, wall
+
+
+def report(arts, wall, mode):
+    lines = [f"{'artifact':<44} {'size':>10} {'time':>8}"]
+    for art in arts:
+        took = ("       -" if art.seconds is None
+                else f"{art.seconds:>7.2f}s")
+        lines.append(f"{art.path.name:<44} {art.size / 1024:>8.0f}KB {took}")
+    lines.append(f"{mode} wall time: {wall:.2f}s"
+                 + (f" for all {len(arts)} artifacts" if mode == "single-pass"
+                    else ""))
+    return "\n".join(lines)
+
+
+def _clip(text):
+    start, end = text.split(":")
+    return float(start), float(end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("input", help="rendered MP4")
+    parser.add_argument("-o", "--out-dir", default="exports")
+    parser.add_argument("--gifs", nargs="*", choices=sorted(GIF_VARIANTS),
+                        default=["standard", "small", "hq"])
+    parser.add_argument("--thumb", type=float, action="append", default=[],
+                        metavar="SEC", help="thumbnail at SEC (repeatable)")
+    parser.add_argument("--thumb-size", metavar="WxH",
+                        help="scale thumbnails, e.g. 1280x720")
+    parser.add_argument("--clip", type=_clip, action="append", default=[],
+                        metavar="START:END", help="re-encoded clip (repeatable)")
+    parser.add_argument("--scale", action="append", default=[],
+                        metavar="WxH", help="scaled MP4 copy (repeatable)")
+    parser.add_argument("--separate", action="store_true",
+                        help="one ffmpeg run per artifact (for comparison)")
+    parser.add_argument("--json", metavar="PATH", help="write report as JSON")
+    args = parser.parse_args(argv)
+
+    arts, wall = export(
+        args.input, args.out_dir, separate=args.separate, gifs=args.gifs,
+        thumbs=args.thumb, clips=args.clip, scales=args.scale,
+        thumb_size=args.thumb_size,
+    )
+    mode = "separate" if args.separate else "single-pass"
+    print(report(arts, wall, mode))
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "input": str(args.input),
+            "mode": mode,
+            "wall_seconds": round(wall, 3),
+            "artifacts": [
+                {"kind": a.kind, "path": str(a.path), "bytes": a.size,
+                 "seconds": (round(a.seconds, 3) if a.seconds is not None
+                             else None), **a.extra}
+                for a in arts
+            ],
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
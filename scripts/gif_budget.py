@@ -0,0 +1,279 @@
+"""Find the best GIF that fits a byte budget.
+
+The GIF recipes fix fps, width, palette size and dither (15 fps, 720 px,
+196 colors, bayer). When a platform caps uploads, finding settings that
+fit means re-running ffmpeg by hand. This searches those four settings
+for a target size, runs the trial encodes in parallel, and keeps the
+highest-quality GIF that fits.
+
+Search:
+1. Palettes. One palette per (width, colors), built from every frame of
+   the source and cached in GIF_CACHE_DIR (default media/gif_cache),
+   keyed by the source file. Trials that differ only in fps or dither
+   share a palette, and so do later runs on the same render.
+2. Probe. Every (fps, width) pair is encoded at its cheapest setting:
+   fewest colors, first dither. A pair whose probe is over budget is
+   dropped, since more colors or another dither only add bytes.
+3. Refine. For each fps, the KEEP_WIDTHS widest pairs that fit are
+   encoded at every other (colors, dither).
+4. Score. Every trial that fits is compared with the source by SSIM at
+   the highest fps and width searched, so fewer frames and fewer pixels
+   cost quality as well as fewer colors do. The best SSIM wins; ties go
+   to the smaller file.
+
+Usage:
+  python scripts/gif_budget.py media/videos/script/1080p60/PaperVideo.mp4 \\
+      --budget 15M
+  python scripts/gif_budget.py in.mp4 --budget 5M --fps 10 12 15 \\
+      --width 480 600 720 --json exports/budget.json -o exports/small.gif
+
+Prints every trial (size, SSIM, whether it fits) and writes the winner.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+GIF_CACHE_DIR = os.environ.get("GIF_CACHE_DIR", "media/gif_cache")
+
+# Search space. Colors ascend and dithers go roughly smallest file first:
+# the probe uses the first of each
+FPS = (10, 12, 15, 20)
+WIDTHS = (480, 600, 720, 900, 1080)
+COLORS = (96, 128, 196, 256)
+DITHERS = ("bayer", "sierra2_4a")
+
+# Fitting widths refined per fps: narrower ones rarely beat the widest
+# that fits, as colors cost fewer bytes than pixels
+KEEP_WIDTHS = 2
+
+_SSIM = re.compile(r"All:([\d.]+)")
+
+
+@dataclass
+class Trial:
+    """One encode of the search."""
+
+    fps: int
+    width: int
+    colors: int
+    dither: str
+    path: Path = None
+    size: int = 0
+    ssim: float = None
+    seconds: float = 0.0
+
+    @property
+    def name(self):
+        return f"f{self.fps}_w{self.width}_c{self.colors}_{self.dither}"
+
+
+def parse_size(text):
+    """'15M', '800K', '5MB' or a byte count -> bytes (powers of 1024)."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMG]?)B?\s*", text.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"not a size: {text!r}")
+    scale = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    return int(float(match.group(1)) * scale[match.group(2)])
+
+
+def _run(cmd):
+    return subprocess.run(cmd, check=True, capture_output=True, text=True)
+
+
+def _source_info(src):
+    import av
+
+    with av.open(str(src)) as container:
+        stream = container.streams.video[0]
+        return (stream.width, stream.height,
+                float(stream.average_rate or 0))
+
+
+# ── Palettes ─────────────────────────────────────────────────────────
+
+def _source_key(src):
+    stat = Path(src).stat()
+    ident = f"{Path(src).resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}"
+    return hashlib.sha256(ident.encode()).hexdigest()[:16]
+
+
+def palette(src, width, colors, cache_dir):
+    """Path of the cached palette for (width, colors), built if needed."""
+    path = Path(cache_dir) / f"{_source_key(src)}_w{width}_c{colors}.png"
+    if not path.exists():
+        tmp = path.with_name(f".{path.stem}.{os.getpid()}.png")
+        _run(["ffmpeg", "-y", "-loglevel", "error", "-i", str(src),
+              "-vf", f"scale={width}:-1:flags=lanczos,"
+                     f"palettegen=max_colors={colors}",
+              "-frames:v", "1", "-update", "1", str(tmp)])
+        os.replace(tmp, path)    # concurrent runs may share the cache
+    return path
+
+
+# ── Trials ───────────────────────────────────────────────────────────
+
+def encode(src, trial, palette_path, out_dir):
+    trial.path = Path(out_dir) / f"{trial.name}.gif"
+    t0 = time.perf_counter()
+    _run(["ffmpeg", "-y", "-loglevel", "error", "-i", str(src),
+          "-i", str(palette_path), "-lavfi",
+          f"[0:v]fps={trial.fps},scale={trial.width}:-1:flags=lanczos[x];"
+          f"[x][1:v]paletteuse=dither={trial.dither}",
+          "-loop", "0", str(trial.path)])
+    trial.seconds = time.perf_counter() - t0
+    trial.size = trial.path.stat().st_size
+    return trial
+
+
+def score(src, trial, ref_fps, ref_size):
+    """SSIM of the GIF against the source, both brought to the reference
+    fps and size (the GIF upscaled, its frames held)."""
+    size = "{}:{}".format(*ref_size)
+    out = _run(["ffmpeg", "-loglevel", "info", "-nostats",
+                "-i", str(trial.path), "-i", str(src), "-lavfi",
+                f"[0:v]fps={ref_fps},scale={size}:flags=bicubic,"
+                f"format=yuv420p[a];"
+                f"[1:v]fps={ref_fps},scale={size}:flags=lanczos,"
+                f"format=yuv420p[b];[a][b]ssim",
+                "-f", "null", "-"])
+    match = _SSIM.search(out.stderr)
+    trial.ssim = float(match.group(1)) if match else 0.0
+    return trial
+
+
+def _parallel(pool, fn, items):
+    return [f.result() for f in [pool.submit(fn, *item) for item in items]]
+
+
+def search(src, budget, fps=FPS, widths=WIDTHS, colors=COLORS,
+           dithers=DITHERS, jobs=None, cache_dir=None, work_dir=None):
+    """Run the search. Returns (best trial or None, all trials).
+
+    Trial GIFs are written to work_dir; ffmpeg runs up to `jobs` at a
+    time (default: one per core).
+    """
+    src_width, src_height, src_fps = _source_info(src)
+    widths = sorted({min(w, src_width) for w in widths})
+    fps = sorted({min(f, round(src_fps)) if src_fps else f for f in fps})
+    colors, dithers = sorted(colors), list(dithers)
+    cache_dir = Path(cache_dir or GIF_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    trials = []
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        def run(batch):
+            needed = sorted({(t.width, t.colors) for t in batch})
+            paths = dict(zip(needed, _parallel(
+                pool, palette, [(src, w, c, cache_dir) for w, c in needed])))
+            trials.extend(_parallel(pool, encode, [
+                (src, t, paths[t.width, t.colors], work_dir) for t in batch]))
+
+        run([Trial(f, w, colors[0], dithers[0]) for f in fps for w in widths])
+        refine = []
+        for f in fps:
+            fits = sorted((t.width for t in trials
+                           if t.fps == f and t.size <= budget), reverse=True)
+            refine += [Trial(f, w, c, d) for w in fits[:KEEP_WIDTHS]
+                       for c in colors for d in dithers
+                       if (c, d) != (colors[0], dithers[0])]
+        run(refine)
+
+        fitting = [t for t in trials if t.size <= budget]
+        ref_size = (widths[-1], 2 * round(widths[-1] * src_height
+                                          / src_width / 2))
+        _parallel(pool, score, [(src, t, fps[-1], ref_size)
+                                for t in fitting])
+    best = max(fitting, key=lambda t: (t.ssim, -t.size), default=None)
+    return best, trials
+
+
+def report(trials, best, budget):
+    lines = [f"{'fps':>4} {'width':>6} {'colors':>6} {'dither':<11} "
+             f"{'size':>10} {'ssim':>7}"]
+    for t in sorted(trials, key=lambda t: (t.fps, t.width, t.colors,
+                                           t.dither)):
+        ssim = f"{t.ssim:.4f}" if t.ssim is not None else "-"
+        mark = " <- best" if t is best else (" over" if t.size > budget
+                                              else "")
+        lines.append(f"{t.fps:>4} {t.width:>6} {t.colors:>6} {t.dither:<11} "
+                     f"{t.size / 1024:>8.0f}KB {ssim:>7}{mark}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("input", help="rendered MP4")
+    parser.add_argument("--budget", type=parse_size, required=True,
+                        help="size cap, e.g. 15M, 5MB, 800K")
+    parser.add_argument("-o", "--output",
+                        help="where to write the winner "
+                             "(default: exports/<stem>_<budget>.gif)")
+    parser.add_argument("--fps", type=int, nargs="+", default=FPS)
+    parser.add_argument("--width", type=int, nargs="+", default=WIDTHS)
+    parser.add_argument("--colors", type=int, nargs="+", default=COLORS)
+    parser.add_argument("--dither", nargs="+", default=DITHERS,
+                        help="paletteuse dithers, smallest output first")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="parallel ffmpeg runs (default: one per core)")
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"palette cache (default: {GIF_CACHE_DIR})")
+    parser.add_argument("--keep", metavar="DIR",
+                        help="keep every trial GIF in DIR")
+    parser.add_argument("--json", metavar="PATH", help="write report as JSON")
+    args = parser.parse_args(argv)
+
+    src = Path(args.input)
+    output = Path(args.output or
+                  f"exports/{src.stem}_{args.budget // 1024}K.gif")
+    t0 = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="gif-budget-") as tmp:
+        best, trials = search(
+            src, args.budget, args.fps, args.width, args.colors,
+            args.dither, args.jobs, args.cache_dir, args.keep or tmp)
+        if best is not None:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(best.path, output)
+    wall = time.perf_counter() - t0
+
+    print(report(trials, best, args.budget))
+    print(f"{len(trials)} trials in {wall:.1f}s")
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "input": str(src),
+            "budget": args.budget,
+            "output": str(output) if best else None,
+            "wall_seconds": round(wall, 3),
+            "trials": [
+                {"fps": t.fps, "width": t.width, "colors": t.colors,
+                 "dither": t.dither, "bytes": t.size, "ssim": t.ssim,
+                 "fits": t.size <= args.budget, "best": t is best,
+                 "seconds": round(t.seconds, 3)}
+                for t in trials
+            ],
+        }, indent=2))
+    if best is None:
+        print(f"nothing fits in {args.budget / 1024:.0f}KB; "
+              "try lower --fps or --width", file=sys.stderr)
+        return 1
+    print(f"{output}: {best.size / 1024:.0f}KB of "
+          f"{args.budget / 1024:.0f}KB, SSIM {best.ssim:.4f} "
+          f"({best.fps} fps, {best.width}px, {best.colors} colors, "
+          f"{best.dither})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
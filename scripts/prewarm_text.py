@@ -0,0 +1,153 @@
+"""Pre-render a script's txt() labels across a process pool.
+
+Every txt("...") label in a script is known before construct() runs,
+yet each one is laid out by Pango at 10x size, serially, on the render's
+critical path. This pass finds the txt() calls statically (literals,
+module constants, f-strings of those, and loops over module data such as
+`for name, *_ in CHART_DATA`). It asks the script's own GlyphCache which
+of them are not on disk yet, and builds those in parallel worker
+processes. Each worker imports the script and calls the real txt(), so
+the glyphs land in GLYPH_CACHE_DIR under exactly the key the render
+looks up; construct() then loads outlines instead of running Pango.
+
+Usage:
+  python scripts/prewarm_text.py script.py PaperVideo
+  python scripts/prewarm_text.py script.py PaperVideo -j 4 --list
+
+render_segments.py (and so watch_preview.py and render_farm.py) run this
+pass before the dry run. Labels built from function arguments (pill(),
+chart helpers) are not found statically and are built on first use, as
+before.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import math
+import multiprocessing
+import os
+import sys
+import time
+
+from scene_tools import literal_calls, load_scene
+
+# Labels per extra worker: below this a process costs more to start
+# (importing Manim and the script) than it saves
+PER_WORKER = 8
+
+
+class _Recorded(Exception):
+    pass
+
+
+def pending(module, scene_class, script):
+    """(found, missing): the distinct txt() calls of the script, and the
+    ones whose glyphs are not in the disk cache."""
+    cache = getattr(module, "GLYPHS", None)
+    if cache is None or not hasattr(scene_class, "txt"):
+        return [], []
+    found = {}
+
+    def record(key, text, build):
+        raise _Recorded(key)
+
+    # txt() computes the key and hands it to GLYPHS.get(); record the key
+    # instead of building
+    cache.get = record
+    try:
+        for call in literal_calls(module, script, {"txt"}):
+            try:
+                scene_class.txt(*call[2], **call[3])
+            except _Recorded as rec:
+                found.setdefault(rec.args[0], call)
+            except Exception:
+                continue    # invalid call: the render will report it
+    finally:
+        cache.__dict__.pop("get", None)
+    if cache.directory is None:
+        return list(found.values()), []
+    missing = [call for key, call in found.items()
+               if not cache._path(key).exists()]
+    return list(found.values()), missing
+
+
+def _build(script, scene_name, calls):
+    """Build `calls` into the disk cache. Runs in a child."""
+    _, scene_class = load_scene(script, scene_name)
+    t0 = time.perf_counter()
+    for _, _, args, kwargs in calls:
+        scene_class.txt(*args, **kwargs)
+    return len(calls), time.perf_counter() - t0
+
+
+def prewarm_text(script, scene_name=None, jobs=None, module=None,
+                 scene_class=None):
+    """Build every statically known, uncached txt() label of `script`.
+
+    Small batches are built in this process (which also warms its own
+    in-memory cache); larger ones are spread over up to `jobs` spawned
+    workers (default: one per core). Returns a stats dict.
+    """
+    t0 = time.perf_counter()
+    if module is None:
+        module, scene_class = load_scene(script, scene_name)
+    found, missing = pending(module, scene_class, script)
+    workers = min(jobs or os.cpu_count() or 1,
+                  math.ceil(len(missing) / PER_WORKER))
+    build_s = 0.0
+    if workers <= 1:
+        for _, _, args, kwargs in missing:
+            s0 = time.perf_counter()
+            scene_class.txt(*args, **kwargs)
+            build_s += time.perf_counter() - s0
+    else:
+        # Longest labels first, dealt round-robin, so workers finish
+        # together
+        order = sorted(missing, key=lambda c: -len(str(c[2][:1])))
+        shares = [order[i::workers] for i in range(workers)]
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=ctx) as pool:
+            futures = [pool.submit(_build, str(script),
+                                   scene_class.__name__, share)
+                       for share in shares]
+            for future in futures:
+                build_s += future.result()[1]
+    return {
+        "labels": len(found),
+        "cached": len(found) - len(missing),
+        "built": len(missing),
+        "workers": max(workers, 1) if missing else 0,
+        "build_s": round(build_s, 3),       # summed over workers
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("script", help="path to the Manim script")
+    parser.add_argument("scene", nargs="?", help="Scene class name")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--list", action="store_true",
+                        help="print the labels found and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        module, scene_class = load_scene(args.script, args.scene)
+        found, missing = pending(module, scene_class, args.script)
+        todo = {id(c) for c in missing}
+        for call in found:
+            state = "missing" if id(call) in todo else "cached"
+            print(f"  line {call[0]:<5} {state:<8} {call[2][:1]} "
+                  f"{call[3] or ''}")
+        return 0
+    stats = prewarm_text(args.script, args.scene, args.jobs)
+    print(f"{stats['labels']} labels: {stats['cached']} cached, "
+          f"{stats['built']} built on {stats['workers']} worker(s) "
+          f"({stats['build_s']:.2f}s of Pango in "
+          f"{stats['seconds']:.2f}s wall)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
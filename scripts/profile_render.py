@@ -0,0 +1,241 @@
+"""Per-play() profiler with a timeline report.
+
+Renders a script with Scene.play (and therefore Scene.wait) wrapped, and
+records for every call: the enclosing scene method and source line, the
+number of animations (top-level and leaf, so LaggedStart children are
+counted), the moving mobjects and their total Bezier point count, frames
+produced, and time spent rasterizing vs encoding.
+
+Usage:
+  python scripts/profile_render.py script.py PaperVideo -ql
+  python scripts/profile_render.py script.py PaperVideo -qh --top 15
+
+Writes media/profile/<Class>_<q>.json (the timeline) and .folded (one
+"Class;method;line wall_ms" stack per play, for flamegraph.pl or
+speedscope), and prints a flame-style summary grouped by scene method.
+"""
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+import argparse
+import json
+import sys
+import time
+
+from scene_tools import add_render_args, call_site, load_scene, quality_config
+
+
+@dataclass
+class PlayRecord:
+    index: int
+    kind: str            # "play" or "wait"
+    method: str
+    line: int
+    code: str
+    start: float         # scene time, seconds
+    duration: float
+    animations: int
+    leaf_animations: int
+    mobjects: int
+    points: int
+    frames: int = 0
+    raster_s: float = 0.0
+    encode_s: float = 0.0
+    wall_s: float = 0.0
+    skipped: bool = False
+
+
+def _leaf_count(animations):
+    total = 0
+    for anim in animations:
+        children = getattr(anim, "animations", None)
+        total += _leaf_count(children) if children else 1
+    return total
+
+
+class Profiler:
+    """Wraps one scene's play(), renderer and file writer."""
+
+    def __init__(self, script):
+        self.script = Path(script).resolve()
+        self.records = []
+        self.current = None
+
+    def install(self, scene):
+        renderer = scene.renderer
+        writer = renderer.file_writer
+
+        update_frame = renderer.update_frame
+        get_frame = renderer.get_frame
+        add_frame = renderer.add_frame
+
+        def timed_update_frame(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return update_frame(*args, **kwargs)
+            finally:
+                self._add("raster_s", time.perf_counter() - t0)
+
+        def timed_get_frame():
+            t0 = time.perf_counter()
+            try:
+                return get_frame()
+            finally:
+                self._add("raster_s", time.perf_counter() - t0)
+
+        def counted_add_frame(frame, num_frames=1):
+            if not renderer.skip_animations and self.current is not None:
+                self.current.frames += num_frames
+            return add_frame(frame, num_frames)
+
+        renderer.update_frame = timed_update_frame
+        renderer.get_frame = timed_get_frame
+        renderer.add_frame = counted_add_frame
+
+        # Manim 0.19 encodes on a writer thread; the thread is joined at
+        # the end of every play, so its time belongs to the current record
+        encode = getattr(writer, "encode_and_write_frame", None)
+        if encode is not None:
+            def timed_encode(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return encode(*args, **kwargs)
+                finally:
+                    self._add("encode_s", time.perf_counter() - t0)
+
+            writer.encode_and_write_frame = timed_encode
+
+    def _add(self, field, seconds):
+        if self.current is not None:
+            setattr(self.current, field, getattr(self.current, field) + seconds)
+
+    def play(self, scene, play, args, kwargs):
+        from manim import Wait
+
+        method, line, code = call_site(self.script)
+        start = scene.renderer.time
+        rec = PlayRecord(
+            index=len(self.records), kind="play", method=method, line=line,
+            code=code, start=start, duration=0.0, animations=0,
+            leaf_animations=0, mobjects=0, points=0,
+        )
+        self.current = rec
+        t0 = time.perf_counter()
+        try:
+            play(*args, **kwargs)
+        finally:
+            rec.wall_s = time.perf_counter() - t0
+            self.current = None
+        anims = scene.animations or []
+        rec.kind = ("wait" if len(anims) == 1 and isinstance(anims[0], Wait)
+                    else "play")
+        rec.duration = scene.renderer.time - start
+        rec.animations = len(anims)
+        rec.leaf_animations = _leaf_count(anims)
+        family = [m for mob in scene.moving_mobjects for m in mob.get_family()]
+        rec.mobjects = len(family)
+        rec.points = sum(len(m.points) for m in family)
+        rec.skipped = rec.frames == 0 and rec.duration > 0
+        self.records.append(rec)
+
+
+def profile(script, scene_name=None, quality="l", media_dir="media",
+            use_cache=False):
+    from manim import tempconfig
+
+    _, base = load_scene(script, scene_name)
+    profiler = Profiler(script)
+
+    class Profiled(base):
+        def setup(self):
+            super().setup()
+            profiler.install(self)
+
+        def play(self, *args, **kwargs):
+            profiler.play(self, super().play, args, kwargs)
+
+    Profiled.__name__ = base.__name__
+    overrides = quality_config(quality)
+    overrides.update({
+        "input_file": str(Path(script).resolve()),
+        "media_dir": str(media_dir),
+        "disable_caching": not use_cache,
+        "progress_bar": "none",
+    })
+    t0 = time.perf_counter()
+    with tempconfig(overrides):
+        Profiled().render()
+    return base, profiler.records, time.perf_counter() - t0
+
+
+def folded(class_name, records):
+    """Brendan Gregg's folded-stack format, weighted by wall ms."""
+    return "".join(
+        f"{class_name};{r.method};L{r.line} {r.kind} "
+        f"{max(round(r.wall_s * 1000), 1)}\n"
+        for r in records
+    )
+
+
+def summary(records, total_wall, top=10, width=40):
+    """Flame-style text: scene methods, then their costliest plays."""
+    by_method = {}
+    for r in records:
+        by_method.setdefault(r.method, []).append(r)
+    longest = max((sum(r.wall_s for r in rs) for rs in by_method.values()),
+                  default=1.0) or 1.0
+
+    def bar(seconds):
+        return "█" * max(1, round(width * seconds / longest))
+
+    lines = []
+    for method, rs in by_method.items():
+        wall = sum(r.wall_s for r in rs)
+        frames = sum(r.frames for r in rs)
+        lines.append(f"{method:<28} {wall:7.2f}s {frames:6d}f  {bar(wall)}")
+        for r in sorted(rs, key=lambda r: r.wall_s, reverse=True)[:3]:
+            lines.append(
+                f"  L{r.line:<5} {r.kind:<4} {r.wall_s:7.2f}s "
+                f"raster {r.raster_s:5.2f}s enc {r.encode_s:5.2f}s  "
+                f"{bar(r.wall_s)}"
+            )
+    lines.append("")
+    lines.append(f"Top {top} plays by wall time (total {total_wall:.2f}s):")
+    for r in sorted(records, key=lambda r: r.wall_s, reverse=True)[:top]:
+        lines.append(
+            f"  {r.wall_s:6.2f}s  {r.method}:L{r.line}  "
+            f"{r.leaf_animations:3d} anims {r.mobjects:5d} mobs "
+            f"{r.points:7d} pts {r.frames:4d}f  {r.code[:48]}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_render_args(parser)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--cache", action="store_true",
+                        help="allow Manim's play cache (cached plays show 0 frames)")
+    parser.add_argument("-o", "--out-dir", default=None,
+                        help="report directory (default: <media-dir>/profile)")
+    args = parser.parse_args(argv)
+
+    base, records, wall = profile(args.script, args.scene, args.quality,
+                                  args.media_dir, use_cache=args.cache)
+    out_dir = Path(args.out_dir or Path(args.media_dir) / "profile")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = out_dir / f"{base.__name__}_{args.quality}"
+    stem.with_suffix(".json").write_text(json.dumps({
+        "scene": base.__name__,
+        "quality": args.quality,
+        "wall_s": round(wall, 4),
+        "plays": [asdict(r) for r in records],
+    }, indent=2))
+    stem.with_suffix(".folded").write_text(folded(base.__name__, records))
+    print(summary(records, wall, args.top))
+    print(f"\nwrote {stem}.json and {stem}.folded")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,439 @@
+"""Batch render farm: many scripts and storyboard specs, one job queue.
+
+Queues every PaperVideo-style script (*.py with a Scene subclass) and
+storyboard spec (*.toml / *.json, compiled with storyboard.py) found in
+the given files and directories, then renders them across a process
+pool. Each job is rendered through the segment cache of
+render_segments.py in its own media dir, in a fresh interpreter.
+
+The queue is a SQLite file (<farm-dir>/queue.db), so it survives
+crashes. A job still marked running when the farm starts again is put
+back in the queue, and its finished segments are reused. Re-running the
+command only renders jobs that are new or whose file changed; failed
+jobs wait for --retry-failed.
+
+Every job shares one glyph cache (GLYPH_CACHE_DIR), one batch-compiled
+formula cache (TEX_CACHE_DIR, see tex_cache.py) and one Manim text and
+Tex cache under <farm-dir>/shared, so a label or formula that appears
+in many papers is laid out once.
+
+Usage:
+  python scripts/render_farm.py papers/ -qh              # queue + run
+  python scripts/render_farm.py papers/ a.toml -qh -j 6
+  python scripts/render_farm.py --status
+  python scripts/render_farm.py --retry-failed
+
+Finished videos are copied to <farm-dir>/out/<id>_<name>_<quality>.mp4.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+import argparse
+import ast
+import fcntl
+import hashlib
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import time
+import traceback
+
+from scene_tools import QUALITY_FLAGS, peak_rss_mb, quality_config
+
+SPEC_SUFFIXES = {".toml", ".json"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id        INTEGER PRIMARY KEY,
+    source    TEXT NOT NULL,     -- what was queued: a script or a spec
+    script    TEXT NOT NULL,     -- what is rendered (compiled, for specs)
+    scene     TEXT,              -- Scene class; NULL = the only one
+    quality   TEXT NOT NULL,
+    key       TEXT NOT NULL,     -- hash of the source file
+    status    TEXT NOT NULL DEFAULT 'pending',
+    attempts  INTEGER NOT NULL DEFAULT 0,
+    queued    REAL,
+    started   REAL,
+    finished  REAL,
+    wall      REAL,
+    video_s   REAL,
+    frames    INTEGER,
+    segments  INTEGER,
+    rendered  INTEGER,
+    rss_mb    REAL,
+    output    TEXT,
+    error     TEXT,
+    UNIQUE (source, quality)
+)
+"""
+
+
+# ── Discovery ────────────────────────────────────────────────────────
+
+def _defines_scene(path):
+    """True if the file defines a class deriving from *Scene (AST only)."""
+    try:
+        tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    except (SyntaxError, UnicodeDecodeError):
+        return False
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            for base in node.bases:
+                name = getattr(base, "id", getattr(base, "attr", ""))
+                if name.endswith("Scene"):
+                    return True
+    return False
+
+
+def _is_spec(path):
+    """True if the file loads as a storyboard spec. Other .json / .toml
+    files (manifests, benchmark reports, pyproject.toml) do not."""
+    from storyboard import load_spec
+
+    try:
+        load_spec(path)
+    except Exception:
+        return False
+    return True
+
+
+def discover(inputs, skip=None):
+    """Scripts and specs under `inputs`, leaving out anything under
+    `skip` (the farm dir, with its compiled specs). A spec whose compiled
+    twin (same stem, .py) sits next to it is left out: the script wins.
+    A directory's .json / .toml files are kept only if they load as
+    specs; files named on the command line are always queued, so a
+    broken spec is reported rather than ignored."""
+    skip = Path(skip).resolve() if skip else None
+    found = []
+    for item in map(Path, inputs):
+        walked = item.is_dir()
+        files = sorted(item.rglob("*")) if walked else [item]
+        for f in files:
+            f = f.resolve()
+            if skip and f.is_relative_to(skip):
+                continue
+            if f.suffix == ".py" and _defines_scene(f):
+                found.append(f)
+            elif (f.suffix in SPEC_SUFFIXES
+                  and not f.with_suffix(".py").exists()
+                  and (not walked or _is_spec(f))):
+                found.append(f)
+    return found
+
+
+def file_key(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+
+
+# ── Queue ────────────────────────────────────────────────────────────
+
+class Queue:
+    """The SQLite job table. Only the scheduler process writes to it."""
+
+    def __init__(self, farm_dir):
+        # Absolute: workers chdir next to each job's source, and compiled
+        # specs are stored by path
+        self.farm_dir = Path(farm_dir).resolve()
+        self.farm_dir.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.farm_dir / "queue.db")
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def enqueue(self, source, quality):
+        """Add or refresh a job. Returns its status after the call."""
+        from storyboard import compile_script, load_spec
+
+        key = file_key(source)
+        row = self.db.execute(
+            "SELECT id, key, status FROM jobs WHERE source = ? "
+            "AND quality = ?", (str(source), quality)).fetchone()
+        if row and row["key"] == key:
+            return row["status"]
+
+        script, scene = source, None
+        if source.suffix in SPEC_SUFFIXES:
+            board = load_spec(source)
+            tag = hashlib.sha256(str(source).encode()).hexdigest()[:8]
+            compiled = self.farm_dir / "compiled" / f"{source.stem}_{tag}.py"
+            compiled.parent.mkdir(parents=True, exist_ok=True)
+            compiled.write_text(compile_script(board, source.name))
+            script, scene = compiled, board.scene_class
+        with self.db:
+            self.db.execute(
+                "INSERT INTO jobs (source, script, scene, quality, key, "
+                "queued) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, quality) DO UPDATE SET "
+                "script = excluded.script, scene = excluded.scene, "
+                "key = excluded.key, status = 'pending', attempts = 0, "
+                "queued = excluded.queued, error = NULL",
+                (str(source), str(script), scene, quality, key, time.time()))
+        return "pending"
+
+    def recover(self):
+        """Requeue jobs a crashed farm left running."""
+        with self.db:
+            return self.db.execute("UPDATE jobs SET status = 'pending' "
+                                   "WHERE status = 'running'").rowcount
+
+    def retry_failed(self):
+        with self.db:
+            return self.db.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0 "
+                "WHERE status = 'failed'").rowcount
+
+    def claim(self, prefer=None):
+        """Mark the next pending job running: job `prefer` if it is
+        pending, else the oldest."""
+        row = self.db.execute("SELECT * FROM jobs WHERE status = 'pending' "
+                              "ORDER BY id IS NOT ?, id LIMIT 1",
+                              (prefer,)).fetchone()
+        if row is None:
+            return None
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = 'running', started = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (time.time(), row["id"]))
+        return row
+
+    def finish(self, job_id, result):
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = 'done', finished = ?, wall = ?, "
+                "video_s = ?, frames = ?, segments = ?, rendered = ?, "
+                "rss_mb = ?, output = ?, error = NULL WHERE id = ?",
+                (time.time(), result["wall"], result["video_s"],
+                 result["frames"], result["segments"], result["rendered"],
+                 result["rss_mb"], result["output"], job_id))
+
+    def fail(self, job_id, error, max_attempts):
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET finished = ?, error = ?, status = CASE "
+                "WHEN attempts < ? THEN 'pending' ELSE 'failed' END "
+                "WHERE id = ?", (time.time(), error, max_attempts, job_id))
+
+    def release(self, job_id):
+        """Requeue a job that was cut short through no fault of its own."""
+        with self.db:
+            self.db.execute("UPDATE jobs SET status = 'pending', "
+                            "attempts = attempts - 1 WHERE id = ?", (job_id,))
+
+    def rows(self):
+        return self.db.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+
+
+# ── Worker ───────────────────────────────────────────────────────────
+
+def _job_dir(farm_dir, job_id, source):
+    return Path(farm_dir) / "jobs" / f"{job_id:04d}_{Path(source).stem}"
+
+
+def _worker(job, farm_dir):
+    """Render one job in a fresh interpreter. Runs in a child."""
+    from manim import config
+
+    farm_dir = Path(farm_dir).resolve()
+    shared = farm_dir / "shared"
+    # Relative paths in the script (ASSETS = "assets") resolve as they
+    # would with `manim` run next to it
+    os.chdir(Path(job["source"]).parent)
+    os.environ["GLYPH_CACHE_DIR"] = str(shared / "glyph_cache")
+    os.environ["TEX_CACHE_DIR"] = str(shared / "tex_cache")
+    config.text_dir = str(shared / "texts")
+    config.tex_dir = str(shared / "Tex")
+    from render_segments import plan_build, render_job, stitch
+
+    job_dir = _job_dir(farm_dir, job["id"], job["source"])
+    t0 = time.perf_counter()
+    # The farm already keeps every core busy: pre-render labels inline
+    build = plan_build(job["script"], job["scene"], job["quality"], job_dir,
+                       text_jobs=1)
+    for seg in build.jobs:
+        if seg.stale:
+            s0 = time.perf_counter()
+            render_job(build, seg)
+            seg.seconds = time.perf_counter() - s0
+    movie = stitch(build)
+    out = farm_dir / "out" / f"{job_dir.name}_{job['quality']}.mp4"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(movie, out)
+
+    video_s = sum(seg.duration for seg in build.jobs)
+    return {
+        "wall": round(time.perf_counter() - t0, 3),
+        "video_s": round(video_s, 3),
+        "frames": round(video_s * quality_config(job["quality"])["frame_rate"]),
+        "segments": len(build.jobs),
+        "rendered": sum(seg.stale for seg in build.jobs),
+        "rss_mb": round(peak_rss_mb(), 1),
+        "output": str(out),
+    }
+
+
+# ── Scheduler ────────────────────────────────────────────────────────
+
+def run(queue, jobs=None, max_attempts=2):
+    """Keep `jobs` workers busy until the queue is empty. Each worker
+    process renders one job and exits (max_tasks_per_child=1), so no
+    Manim config or module state leaks from one paper to the next.
+
+    When a worker dies (OOM, segfault) the pool breaks and every job in
+    flight fails with it, so the death cannot be pinned on one of them.
+    Those jobs are requeued without losing an attempt and then run one
+    at a time; a job that breaks the pool while running alone is the
+    one charged.
+    """
+    workers = jobs or os.cpu_count() or 1
+    ctx = multiprocessing.get_context("spawn")
+    busy = 0.0
+    suspects = []    # ids of jobs in flight when the pool last broke
+    t0 = time.perf_counter()
+    while True:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                   max_tasks_per_child=1)
+        running = {}
+        broken = []
+        try:
+            while True:
+                while len(running) < (1 if suspects else workers):
+                    job = queue.claim(suspects[0] if suspects else None)
+                    if job is None:
+                        break
+                    if suspects and job["id"] != suspects[0]:
+                        suspects.pop(0)    # no longer pending
+                    fut = pool.submit(_worker, dict(job), str(queue.farm_dir))
+                    running[fut] = job
+                    print(f"  start {job['id']:>4} {Path(job['source']).name}")
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    job = running.pop(fut)
+                    if job["id"] in suspects:
+                        suspects.remove(job["id"])
+                    try:
+                        result = fut.result()
+                    except BrokenProcessPool:
+                        # A worker died: the pool is gone, and with it
+                        # every job still in flight
+                        broken.append(job)
+                        continue
+                    except Exception as e:
+                        queue.fail(job["id"], "".join(
+                            traceback.format_exception_only(e)).strip(),
+                            max_attempts)
+                        print(f"  FAIL  {job['id']:>4} "
+                              f"{Path(job['source']).name}: {e}")
+                        continue
+                    busy += result["wall"]
+                    queue.finish(job["id"], result)
+                    print(f"  done  {job['id']:>4} "
+                          f"{Path(job['source']).name:<32} "
+                          f"{result['wall']:7.1f}s "
+                          f"{result['frames'] / result['wall']:6.1f} fps")
+                if broken:
+                    broken += running.values()
+                    if len(broken) == 1:
+                        job = broken[0]
+                        queue.fail(job["id"], "worker process died",
+                                   max_attempts)
+                        print(f"  FAIL  {job['id']:>4} "
+                              f"{Path(job['source']).name}: worker died")
+                    else:
+                        for job in broken:
+                            queue.release(job["id"])
+                            if job["id"] not in suspects:
+                                suspects.append(job["id"])
+                        print(f"  a worker died with {len(broken)} jobs "
+                              "running; retrying them one at a time")
+                    break
+        finally:
+            pool.shutdown(wait=not broken, cancel_futures=True)
+        if not broken:
+            break
+    wall = time.perf_counter() - t0
+    return wall, busy / (wall * workers) if wall else 0.0
+
+
+def print_status(rows):
+    print(f"{'id':>4}  {'status':<8} {'q':<2} {'job':<32} {'wall':>8} "
+          f"{'video':>7} {'fps':>7} {'xRT':>6} {'segs':>6} {'RSS':>7}")
+    for r in rows:
+        name = Path(r["source"]).name
+        line = f"{r['id']:>4}  {r['status']:<8} {r['quality']:<2} {name:<32}"
+        if r["status"] == "done":
+            fps = r["frames"] / r["wall"] if r["wall"] else 0.0
+            rt = r["video_s"] / r["wall"] if r["wall"] else 0.0
+            line += (f" {r['wall']:7.1f}s {r['video_s']:6.1f}s {fps:7.1f} "
+                     f"{rt:6.2f} {r['rendered']:>2}/{r['segments']:<3} "
+                     f"{r['rss_mb']:5.0f}MB")
+        elif r["error"]:
+            line += f" {r['error'][:60]}"
+        print(line)
+    done = [r for r in rows if r["status"] == "done"]
+    frames = sum(r["frames"] for r in done)
+    wall = sum(r["wall"] for r in done)
+    if wall:
+        print(f"{len(done)}/{len(rows)} done: {frames} frames in {wall:.0f} "
+              f"worker-seconds ({frames / wall:.1f} fps per worker)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("inputs", nargs="*",
+                        help="scripts, specs, or directories of them")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITY_FLAGS),
+                        default="h", help="render quality (default: h)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--farm-dir", default="media/farm",
+                        help="queue, caches and output (default: media/farm)")
+    parser.add_argument("--max-attempts", type=int, default=2,
+                        help="tries per job before it is marked failed")
+    parser.add_argument("--status", action="store_true",
+                        help="print the queue and exit")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="requeue failed jobs")
+    args = parser.parse_args(argv)
+
+    queue = Queue(args.farm_dir)
+    if args.status:
+        print_status(queue.rows())
+        return 0
+
+    # One scheduler per farm dir: a second one would requeue our jobs
+    lock = open(queue.farm_dir / "farm.lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print(f"another render farm is running on {args.farm_dir}",
+              file=sys.stderr)
+        return 1
+
+    recovered = queue.recover()
+    if recovered:
+        print(f"requeued {recovered} job(s) left running by a crash")
+    if args.retry_failed:
+        print(f"requeued {queue.retry_failed()} failed job(s)")
+    for source in discover(args.inputs, queue.farm_dir):
+        try:
+            status = queue.enqueue(source, args.quality)
+        except Exception as e:    # bad spec: report it, queue the rest
+            print(f"  skip  {source.name}: {e}", file=sys.stderr)
+            continue
+        print(f"  {status:<8} {source.name}")
+
+    wall, utilization = run(queue, args.jobs, args.max_attempts)
+    print_status(queue.rows())
+    print(f"farm wall {wall:.1f}s, workers busy {utilization:.0%}")
+    failed = sum(r["status"] == "failed" for r in queue.rows())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Render a script's format x palette matrix in one job.
+
+The scaffold picks its palette (PALETTE=dark|light) and format
+(FORMAT=landscape|vertical|square) when it is imported: colors, data
+tables and the layout constants LABEL_LEFT, BAR_LEFT, MAX_W and BASE_Y
+are all bound then, and use_format() sizes Manim's frame. This tool
+renders every (format, palette) pair in the script's MATRIX, or the
+ones given with --variant, one after another in a single process:
+
+- Manim, Pango and the encoder are loaded once for the whole matrix.
+- The script is re-imported per variant, and every import is handed the
+  first one's GLYPHS cache. Glyph keys do not include the color, so a
+  label laid out for landscape/dark is a memory hit for vertical/light.
+- Formulas and the remaining labels are built up front (tex_cache.py,
+  prewarm_text.py), once for all variants.
+
+Usage:
+  python scripts/render_matrix.py script.py PaperVideo -qh
+  python scripts/render_matrix.py script.py PaperVideo -ql \\
+      --variant vertical:dark --variant square:light
+
+Writes media/matrix/<Class>/<Class>_<format>_<palette>.mp4.
+"""
+
+from pathlib import Path
+import argparse
+import os
+import shutil
+import sys
+import time
+
+from prewarm_text import prewarm_text
+from scene_tools import add_render_args, load_scene, peak_rss_mb, quality_config
+from scene_index import timeline_path
+from tex_cache import warm_tex
+
+DEFAULT_MATRIX = [("landscape", "dark")]
+
+
+def _variant(text):
+    fmt, _, palette = text.partition(":")
+    return fmt, palette or "dark"
+
+
+def _env(fmt, palette):
+    os.environ["FORMAT"] = fmt
+    os.environ["PALETTE"] = palette
+
+
+def render_matrix(script, scene_name=None, quality="l", media_dir="media",
+                  variants=None):
+    """Render every variant. Returns (scene_class, rows, wall seconds);
+    a row is (format, palette, pixel size, seconds, output path)."""
+    from manim import config, tempconfig
+
+    saved = {k: os.environ.get(k) for k in ("FORMAT", "PALETTE")}
+    t0 = time.perf_counter()
+    rows, glyphs = [], None
+    try:
+        # use_format() writes to config on import; keep that local
+        with tempconfig({"media_dir": str(media_dir)}):
+            module, base = load_scene(script, scene_name)
+            variants = variants or getattr(module, "MATRIX", DEFAULT_MATRIX)
+            for fmt, palette in variants:
+                for name, table in (("FORMATS", fmt), ("PALETTES", palette)):
+                    if table not in getattr(module, name, {}):
+                        raise SystemExit(f"{script}: no {table!r} in {name}")
+            # Formulas and labels, once: keys are the same in every
+            # format, and labels are recolored per palette
+            warm_tex(script, module=module)
+            prewarm_text(script, module=module, scene_class=base)
+
+        out_dir = Path(media_dir) / "matrix" / base.__name__
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for fmt, palette in variants:
+            _env(fmt, palette)
+            overrides = quality_config(quality)
+            overrides.update({
+                "input_file": str(Path(script).resolve()),
+                "media_dir": str(media_dir),
+                "output_file": f"{base.__name__}_{fmt}_{palette}",
+                "progress_bar": "none",
+            })
+            v0 = time.perf_counter()
+            with tempconfig(overrides):
+                # Re-import: colors, data tables and layout constants
+                # bind now; use_format() resizes the frame
+                module, scene_class = load_scene(script, base.__name__)
+                if glyphs is None:
+                    glyphs = getattr(module, "GLYPHS", None)
+                elif hasattr(module, "GLYPHS"):
+                    module.GLYPHS = glyphs
+                size = f"{config.pixel_width}x{config.pixel_height}"
+                scene = scene_class()
+                scene.render()
+                written = Path(scene.renderer.file_writer.movie_file_path)
+            output = out_dir / written.name
+            shutil.copyfile(written, output)
+            if timeline_path(written).exists():
+                shutil.copyfile(timeline_path(written), timeline_path(output))
+            rows.append((fmt, palette, size, time.perf_counter() - v0,
+                         output))
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    return base, rows, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_render_args(parser)
+    parser.add_argument("--variant", type=_variant, action="append",
+                        metavar="FORMAT[:PALETTE]",
+                        help="render this variant (repeatable; default: "
+                             "the script's MATRIX)")
+    args = parser.parse_args(argv)
+
+    base, rows, wall = render_matrix(args.script, args.scene, args.quality,
+                                     args.media_dir, args.variant)
+    for fmt, palette, size, seconds, output in rows:
+        print(f"  {fmt:<10} {palette:<6} {size:>10}  {seconds:6.1f}s  "
+              f"-> {output}")
+    print(f"{base.__name__}: {len(rows)} variants in {wall:.1f}s, "
+          f"peak RSS {peak_rss_mb():.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""Render once, rasterize and encode at several quality tiers.
+
+`manim -ql` and `manim -qh` each run construct() from scratch: every
+txt() is laid out again and every animation is interpolated again. This
+tool runs the scene once at the highest frame rate asked for. Each time
+the renderer draws a frame, the same mobjects are also drawn by one
+extra Cairo camera per additional tier that keeps that frame, and every
+tier feeds its own encoder thread.
+
+Lower frame rates take every k-th frame of a play (15 fps = every 4th
+frame at 60 fps). Those frames fall at the same times that np.arange
+would give a standalone render, and waits use each tier's own
+int(duration / dt). The frame counts match `manim -q<tier>` exactly.
+
+Usage:
+  python scripts/render_multi.py script.py PaperVideo -q l -q h
+  python scripts/render_multi.py script.py PaperVideo -q l -q h -q k
+
+Writes media/multi/<Class>/<height>p<fps>/<Class>.mp4 per tier. Every
+tier's frame rate must divide the highest one (true for l, m, h, p, k).
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import queue
+import sys
+import threading
+import time
+
+from scene_tools import QUALITY_FLAGS, load_scene, peak_rss_mb, quality_config
+
+HOLD_TAIL = 3    # closing copies of a held frame, as in the scaffold
+
+
+class Encoder:
+    """H.264 writer for one tier, on its own thread.
+
+    write(frame, n) queues a frame shown for n frame times; runs of
+    n > 1 are encoded as hold frames (first frame + HOLD_TAIL copies,
+    timestamps skipping the rest).
+    """
+
+    def __init__(self, path, width, height, fps, maxsize=8):
+        import av
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.container = av.open(str(path), mode="w")
+        self.stream = self.container.add_stream(
+            "libx264", rate=fps, options={"crf": "23"})
+        self.stream.pix_fmt = "yuv420p"
+        self.stream.width = width
+        self.stream.height = height
+        self.pts = 0
+        self.seconds = 0.0
+        self.queue = queue.Queue(maxsize)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def write(self, frame, n=1):
+        self.queue.put((frame, n))
+
+    def _encode(self, frame, pts):
+        import av
+
+        av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+        av_frame.pts = pts
+        for packet in self.stream.encode(av_frame):
+            self.container.mux(packet)
+
+    def _run(self):
+        while True:
+            frame, n = self.queue.get()
+            if frame is None:
+                break
+            t0 = time.perf_counter()
+            start = self.pts
+            tail = range(max(start + 1, start + n - HOLD_TAIL), start + n)
+            for pts in (start, *tail):
+                self._encode(frame, pts)
+            self.pts = start + n
+            self.seconds += time.perf_counter() - t0
+
+    def close(self):
+        self.queue.put((None, 0))
+        self.thread.join()
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+
+
+@dataclass
+class Tier:
+    flag: str
+    width: int
+    height: int
+    fps: int
+    step: int = 1             # master frames per frame of this tier
+    camera: object = None     # None for the master tier (the scene's own)
+    static_image: object = None
+    encoder: Encoder = None
+    frames: int = 0
+    raster_s: float = 0.0
+
+
+class MultiTarget:
+    """Mirrors one scene's renderer onto extra cameras and encoders."""
+
+    def __init__(self, flags, out_dir):
+        tiers = []
+        for flag in dict.fromkeys(flags):
+            q = quality_config(flag)
+            tiers.append(Tier(flag, q["pixel_width"], q["pixel_height"],
+                              q["frame_rate"]))
+        # The master tier drives the scene: highest fps, then largest
+        tiers.sort(key=lambda t: (t.fps, t.height), reverse=True)
+        self.tiers = tiers
+        self.master = tiers[0]
+        for tier in tiers:
+            if self.master.fps % tier.fps:
+                raise SystemExit(f"-q{tier.flag}: {tier.fps} fps does not "
+                                 f"divide {self.master.fps} fps")
+            tier.step = self.master.fps // tier.fps
+        self.out_dir = Path(out_dir)
+        self.index = 0            # frame index within the current play
+        self.freeze = None        # duration of the wait being frozen
+        self.rendering = False    # inside renderer.render(): one frame
+
+    def install(self, scene):
+        from manim import Camera
+
+        renderer = scene.renderer
+        master_cam = renderer.camera
+        for tier in self.tiers:
+            name = f"{scene.__class__.__name__}.mp4"
+            tier.encoder = Encoder(
+                self.out_dir / f"{tier.height}p{tier.fps}" / name,
+                tier.width, tier.height, tier.fps)
+            if tier is not self.master:
+                tier.camera = Camera(pixel_width=tier.width,
+                                     pixel_height=tier.height,
+                                     frame_rate=tier.fps)
+        extras = self.tiers[1:]
+
+        play = renderer.play
+        render = renderer.render
+        update_frame = renderer.update_frame
+        save_static = renderer.save_static_frame_data
+        add_frame = renderer.add_frame
+        freeze = renderer.freeze_current_frame
+
+        def draw(tier, mobjects, **kwargs):
+            from manim.utils.iterables import list_update
+
+            cam = tier.camera
+            t0 = time.perf_counter()
+            if (cam.background_color != master_cam.background_color
+                    or cam.background_opacity
+                    != master_cam.background_opacity):
+                cam.background_color = master_cam.background_color
+                cam.background_opacity = master_cam.background_opacity
+            if not mobjects:
+                mobjects = list_update(scene.mobjects,
+                                       scene.foreground_mobjects)
+            if tier.static_image is not None:
+                cam.set_frame_to_background(tier.static_image)
+            else:
+                cam.reset()
+            cam.capture_mobjects(mobjects, **kwargs)
+            tier.raster_s += time.perf_counter() - t0
+
+        def mirrored_play(*args, **kwargs):
+            self.index = 0
+            return play(*args, **kwargs)
+
+        def mirrored_render(*args, **kwargs):
+            self.rendering = True
+            try:
+                return render(*args, **kwargs)
+            finally:
+                self.rendering = False
+
+        def mirrored_update_frame(scene_, mobjects=None,
+                                  include_submobjects=True,
+                                  ignore_skipping=True, **kwargs):
+            t0 = time.perf_counter()
+            update_frame(scene_, mobjects, include_submobjects,
+                         ignore_skipping, **kwargs)
+            self.master.raster_s += time.perf_counter() - t0
+            if renderer.skip_animations and not ignore_skipping:
+                return
+            for tier in extras:
+                # A play's frame that mirrored_add_frame will drop for this
+                # tier (15 fps keeps every 4th at 60): skip the Cairo pass.
+                # Static images and frozen frames are always drawn
+                if self.rendering and self.index % tier.step:
+                    continue
+                draw(tier, mobjects, include_submobjects=include_submobjects,
+                     **kwargs)
+
+        def mirrored_save_static(scene_, static_mobjects):
+            for tier in extras:
+                tier.static_image = None
+            image = save_static(scene_, static_mobjects)
+            if image is not None:
+                for tier in extras:
+                    tier.static_image = tier.camera.pixel_array.copy()
+            return image
+
+        def mirrored_add_frame(frame, num_frames=1):
+            if not renderer.skip_animations:
+                for tier in self.tiers:
+                    if self.freeze is not None:
+                        n = int(self.freeze / (1 / tier.fps))
+                    elif self.index % tier.step == 0:
+                        n = 1
+                    else:
+                        continue
+                    if n:
+                        # the scaffold's frame_pipeline() passes the
+                        # camera's live array, so copy every tier
+                        image = (frame.copy() if tier is self.master
+                                 else tier.camera.pixel_array.copy())
+                        tier.encoder.write(image, n)
+                        tier.frames += n
+                if self.freeze is None:
+                    self.index += 1
+            return add_frame(frame, num_frames)
+
+        def mirrored_freeze(duration):
+            self.freeze = duration
+            try:
+                return freeze(duration)
+            finally:
+                self.freeze = None
+
+        renderer.play = mirrored_play
+        renderer.render = mirrored_render
+        renderer.update_frame = mirrored_update_frame
+        renderer.save_static_frame_data = mirrored_save_static
+        renderer.add_frame = mirrored_add_frame
+        renderer.freeze_current_frame = mirrored_freeze
+
+    def close(self):
+        for tier in self.tiers:
+            if tier.encoder is not None:
+                tier.encoder.close()
+
+
+def render_multi(script, scene_name=None, flags=("l", "h"),
+                 media_dir="media"):
+    """Run the scene once and write one MP4 per tier. Returns
+    (scene_class, tiers, wall seconds)."""
+    from manim import tempconfig
+
+    _, base = load_scene(script, scene_name)
+    multi = MultiTarget(flags, Path(media_dir) / "multi" / base.__name__)
+
+    class Multi(base):
+        def setup(self):
+            super().setup()
+            multi.install(self)
+
+    Multi.__name__ = base.__name__
+    overrides = quality_config(multi.master.flag)
+    overrides.update({
+        "input_file": str(Path(script).resolve()),
+        "media_dir": str(media_dir),
+        "write_to_movie": False,     # the tiers' encoders write instead
+        "disable_caching": True,
+        "progress_bar": "none",
+    })
+    t0 = time.perf_counter()
+    try:
+        with tempconfig(overrides):
+            Multi().render()
+    finally:
+        multi.close()
+    return base, multi.tiers, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("script", help="path to the Manim script")
+    parser.add_argument("scene", nargs="?", help="Scene class name")
+    parser.add_argument("-q", "--quality", action="append",
+                        choices=sorted(QUALITY_FLAGS),
+                        help="output tier (repeatable, default: l h)")
+    parser.add_argument("--media-dir", default="media",
+                        help="Manim media directory (default: media)")
+    args = parser.parse_args(argv)
+
+    base, tiers, wall = render_multi(args.script, args.scene,
+                                     args.quality or ["l", "h"],
+                                     args.media_dir)
+    raster = sum(t.raster_s for t in tiers)
+    for t in tiers:
+        role = "master" if t is tiers[0] else f"every {t.step}"
+        print(f"  -q{t.flag} {t.width}x{t.height}@{t.fps:<3} {role:<8} "
+              f"{t.frames:6d}f  raster {t.raster_s:6.2f}s  "
+              f"encode {t.encoder.seconds:6.2f}s  -> {t.encoder.path}")
+    print(f"{base.__name__}: {len(tiers)} tiers in {wall:.1f}s "
+          f"(scene evaluation ~{max(wall - raster, 0):.1f}s, once; "
+          f"encoding overlapped) peak RSS {peak_rss_mb():.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Process-pool parallel rendering of scene methods.
+
+Scene methods only depend on each other through the persistent
+character/logo and where each scene_wipe(target_pos=...) leaves them. A
+worker reaches that starting state cheaply by replaying the earlier
+segments as skipped sections (animations are stepped to their end state,
+no frames are encoded), then renders its own scene_N_* at full quality.
+Every stale segment gets its own process; the pieces are joined with the
+concat demuxer. Wall time approaches that of the slowest scene instead of
+the sum of all of them.
+
+Usage:
+  python scripts/render_parallel.py script.py PaperVideo -qh
+  python scripts/render_parallel.py script.py PaperVideo -qh -j 4
+  python scripts/render_parallel.py script.py PaperVideo -qh --all
+
+Shares its segment cache with render_segments.py: unchanged segments are
+reused, --all re-renders everything.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+from render_segments import plan_build, print_report, stitch
+from scene_index import timeline_path
+from scene_tools import (
+    add_render_args, load_scene, render_segments, split_construct,
+)
+
+
+def _worker(script, scene_name, quality, media_dir, index, path):
+    """Render one segment in a fresh interpreter.
+
+    Each worker gets its own Manim media dir so partial-movie lists and
+    cache cleanup never race between processes; keeping it per segment
+    index lets Manim's per-play cache work across runs.
+    """
+    t0 = time.perf_counter()
+    _, scene_class = load_scene(script, scene_name)
+    plan = split_construct(scene_class)
+    work_dir = (Path(media_dir) / "parallel" / scene_class.__name__
+                / f"seg_{index:02d}")
+    written = render_segments(plan, [index], script, quality,
+                              f"segment_{index:02d}", work_dir)
+    if written.exists():
+        os.replace(written, path)
+        if timeline_path(written).exists():
+            os.replace(timeline_path(written), timeline_path(path))
+    return index, time.perf_counter() - t0
+
+
+def render(build, jobs=None):
+    """Render build's stale segments across a process pool.
+
+    Longest segments (by dry-run duration) are submitted first so the
+    pool's makespan stays close to the slowest single scene.
+    """
+    stale = sorted((j for j in build.jobs if j.stale),
+                   key=lambda j: j.duration, reverse=True)
+    if not stale:
+        return
+    workers = min(jobs or os.cpu_count() or 1, len(stale))
+    by_index = {j.segment.index: j for j in stale}
+    # spawn, not fork: Cairo/Pango state must not be shared with the parent
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = [
+            pool.submit(_worker, build.script, build.scene_class.__name__,
+                        build.quality, build.media_dir,
+                        j.segment.index, j.path)
+            for j in stale
+        ]
+        for fut in as_completed(futures):
+            index, secs = fut.result()
+            by_index[index].seconds = secs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_render_args(parser)
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--all", action="store_true",
+                        help="ignore the segment cache and render every scene")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    build = plan_build(args.script, args.scene, args.quality, args.media_dir)
+    if args.all:
+        for job in build.jobs:
+            job.stale = True
+    render(build, args.jobs)
+    output = stitch(build)
+    print_report(build, output)
+
+    slowest = max((j.seconds for j in build.jobs), default=0.0)
+    total = sum(j.seconds for j in build.jobs)
+    print(f"wall {time.perf_counter() - t0:.1f}s | slowest scene "
+          f"{slowest:.1f}s | serial sum {total:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
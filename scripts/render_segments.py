@@ -0,0 +1,182 @@
+"""Per-scene segmented rendering with content-hash invalidation.
+
+Treats each scene_N_* call in construct() - plus the scene_wipe() after
+it - as a separately cached segment. A segment's key hashes its
+statements, the source of every method it reaches, the module-level data
+those read (CHART_DATA, THINK_DATA, ...) and the persistent-element state
+handed in from the previous segment (character, logo). Only segments
+whose key changed are re-rendered; the final MP4 is stitched with the
+concat demuxer, without re-encoding.
+
+Usage:
+  python scripts/render_segments.py script.py PaperVideo -ql
+  python scripts/render_segments.py script.py PaperVideo -qh
+  python scripts/render_segments.py script.py PaperVideo -ql --force 2
+
+Segments are stored in media/segments/<Class>/<height>p<fps>/ next to
+manifest.json; the stitched video is <Class>.mp4 in the same directory,
+with its scene timeline (scene_index.py) merged from the segments'.
+The script's formulas are batch-compiled (tex_cache.py) and its txt()
+labels pre-rendered in parallel (prewarm_text.py) first.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import json
+import os
+import sys
+import time
+
+from scene_tools import (
+    add_render_args, boundary_states, concat_copy, digest, load_scene,
+    quality_config, render_segments, segment_fingerprint, split_construct,
+)
+from prewarm_text import prewarm_text
+from scene_index import merge, timeline_path
+from tex_cache import warm_tex
+
+
+@dataclass
+class Job:
+    """One segment of a segmented build."""
+
+    segment: object
+    key: str
+    path: Path
+    start: float      # scene time at which the segment begins
+    duration: float
+    stale: bool
+    seconds: float = 0.0
+
+
+@dataclass
+class Build:
+    script: str
+    scene_class: type
+    plan: object
+    quality: str
+    media_dir: str
+    out_dir: Path
+    jobs: list
+
+
+def segment_dir(media_dir, scene_class, quality):
+    q = quality_config(quality)
+    res = f"{q['pixel_height']}p{q['frame_rate']}"
+    return Path(media_dir) / "segments" / scene_class.__name__ / res
+
+
+def plan_build(script, scene_name=None, quality="l", media_dir="media",
+               force=(), text_jobs=None):
+    """Load the script, key every segment (one dry run of construct())
+    and mark the ones whose file is missing or forced as stale.
+
+    The script's formulas and txt() labels are built into their disk
+    caches first (text_jobs worker processes, default one per core).
+    """
+    import manim
+    from manim import config
+
+    module, scene_class = load_scene(script, scene_name)
+    # Formulas and labels built up front are cache hits for the dry run
+    # and for every segment render
+    warm_tex(script, [config.get_dir("tex_dir"),
+                      config.get_dir("tex_dir", media_dir=media_dir)],
+             module=module)
+    prewarm_text(script, jobs=text_jobs, module=module,
+                 scene_class=scene_class)
+    plan = split_construct(scene_class)
+    out_dir = segment_dir(media_dir, scene_class, quality)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # A square and a landscape render share <height>p<fps>
+    size = (config.frame_width, config.frame_height)
+
+    states, times = boundary_states(plan)
+    jobs = []
+    for seg in plan.segments:
+        key = digest(manim.__version__, quality, size,
+                     segment_fingerprint(plan, seg), states[seg.index])
+        path = out_dir / f"{seg.index:02d}_{seg.name}_{key}.mp4"
+        jobs.append(Job(
+            segment=seg, key=key, path=path,
+            start=times[seg.index],
+            duration=times[seg.index + 1] - times[seg.index],
+            stale=seg.index in force or not path.exists(),
+        ))
+    return Build(script, scene_class, plan, quality, str(media_dir),
+                 out_dir, jobs)
+
+
+def render_job(build, job, media_dir=None):
+    """Render one segment and move it to its keyed path."""
+    seg = job.segment
+    written = render_segments(build.plan, [seg.index], build.script,
+                              build.quality, f"segment_{seg.index:02d}",
+                              media_dir or build.media_dir)
+    if written.exists():
+        os.replace(written, job.path)
+        if timeline_path(written).exists():
+            os.replace(timeline_path(written), timeline_path(job.path))
+    return job.path
+
+
+def stitch(build):
+    """Prune superseded segment files, concat, and write manifest.json."""
+    jobs = [j for j in build.jobs if j.path.exists()]
+    for job in build.jobs:
+        if not job.path.exists():
+            print(f"  {job.segment.name}: no frames, skipped", file=sys.stderr)
+        for old in build.out_dir.glob(f"{job.segment.index:02d}_*.mp4"):
+            if old != job.path:
+                old.unlink()
+                timeline_path(old).unlink(missing_ok=True)
+
+    output = concat_copy([j.path for j in jobs],
+                         build.out_dir / f"{build.scene_class.__name__}.mp4")
+    merge([j.path for j in jobs], output)
+    manifest = {
+        "script": str(Path(build.script).resolve()),
+        "scene": build.scene_class.__name__,
+        "quality": build.quality,
+        "segments": [
+            {"index": j.segment.index, "name": j.segment.name,
+             "key": j.key, "file": j.path.name,
+             "start": round(j.start, 4), "duration": round(j.duration, 4)}
+            for j in jobs
+        ],
+        "output": output.name,
+    }
+    (build.out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return output
+
+
+def print_report(build, output):
+    for job in build.jobs:
+        status = f"rendered {job.seconds:6.1f}s" if job.stale else "cached"
+        print(f"  [{job.segment.index}] {job.segment.name:<24} "
+              f"{job.duration:5.1f}s  {job.key}  {status}")
+    n = sum(job.stale for job in build.jobs)
+    print(f"{n}/{len(build.jobs)} segments re-rendered -> {output}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_render_args(parser)
+    parser.add_argument("--force", type=int, nargs="+", default=[],
+                        metavar="N", help="re-render these segment indices")
+    args = parser.parse_args(argv)
+
+    build = plan_build(args.script, args.scene, args.quality,
+                       args.media_dir, force=set(args.force))
+    for job in build.jobs:
+        if job.stale:
+            t0 = time.perf_counter()
+            render_job(build, job)
+            job.seconds = time.perf_counter() - t0
+    print_report(build, stitch(build))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
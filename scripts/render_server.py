@@ -0,0 +1,310 @@
+"""Warm render server: Manim stays imported between renders.
+
+`manim -ql script.py PaperVideo` spends its first seconds importing
+Manim, discovering fonts, initializing Pango and Cairo and loading the
+encoder, before the first frame. On a short test render that start-up is
+a large share of the wall time. This server does that once, then waits
+on a Unix socket. Each request re-imports only the user's script (and
+any module next to it) and renders the scene in the warm process.
+
+Usage:
+  python scripts/render_server.py render script.py PaperVideo -ql
+  python scripts/render_server.py render script.py PaperVideo -qh -s
+  python scripts/render_server.py serve              # in the foreground
+  python scripts/render_server.py status
+  python scripts/render_server.py stop
+
+`render` is a drop-in for the `manim` command in an agent loop: it
+starts the server in the background if none is listening, prints the
+output path, and exits 1 with Manim's traceback if the render failed.
+The socket is RENDER_SOCKET (default media/render.sock, relative to the
+directory the server was started in). Requests are rendered one at a
+time. Every render runs inside tempconfig(), so a script that changes
+`config` at import time does not affect the next one. The server exits
+after --max-renders renders, and the next `render` starts a fresh one.
+"""
+
+from pathlib import Path
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+import traceback
+
+from scene_tools import QUALITY_FLAGS, load_scene, peak_rss_mb, quality_config
+
+SOCKET = os.environ.get("RENDER_SOCKET", "media/render.sock")
+
+# Read by the scripts at import time; sent along with every request
+FORWARDED_ENV = ("GLYPH_CACHE_DIR", "TEX_CACHE_DIR")
+
+
+# ── Protocol: one JSON line each way ─────────────────────────────────
+
+def _send(conn, message):
+    conn.sendall(json.dumps(message).encode() + b"\n")
+
+
+def _receive(conn):
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data) if data else None
+
+
+def request(message, path=SOCKET, timeout=None):
+    """Send one request and return the reply (None if nobody listens)."""
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(timeout)
+    try:
+        conn.connect(str(path))
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    with conn:
+        try:
+            _send(conn, message)
+            return _receive(conn)
+        except ConnectionResetError:
+            return None    # the server closed as we connected
+
+
+# ── Server ───────────────────────────────────────────────────────────
+
+def warm_up():
+    """Pay Manim's start-up costs now rather than on the first render."""
+    import av
+    import manimpango
+    from manim import Camera, Square, Text, tempconfig
+
+    manimpango.list_fonts()
+    av.codec.Codec("libx264", "w")
+    with tempconfig({"pixel_width": 320, "pixel_height": 180,
+                     "disable_caching": True}):
+        camera = Camera()
+        camera.capture_mobjects([Square(), Text("Warm up")])
+
+
+def _forget_local_modules(directory):
+    """Drop modules imported from the script's directory, so helpers
+    next to the script are re-imported along with it."""
+    directory = Path(directory).resolve()
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if file and Path(file).resolve().parent == directory:
+            del sys.modules[name]
+
+
+class _Tail(logging.Handler):
+    """Keeps the last lines Manim logged during one render."""
+
+    def __init__(self, size=40):
+        super().__init__(logging.INFO)
+        self.lines = []
+        self.size = size
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        del self.lines[:-self.size]
+
+
+def render(req):
+    """Render one request in this process. Returns the reply."""
+    from manim import logger, tempconfig
+
+    script = Path(req["script"]).resolve()
+    os.chdir(req["cwd"])
+    saved_env = {k: os.environ.get(k) for k in FORWARDED_ENV}
+    os.environ.update(req.get("env", {}))
+    _forget_local_modules(script.parent)
+
+    overrides = quality_config(req["quality"])
+    overrides.update({
+        "input_file": str(script),
+        "media_dir": req["media_dir"],
+        "progress_bar": "none",
+        "format": req.get("format", "mp4"),
+    })
+    if req.get("last_frame"):
+        overrides.update({"save_last_frame": True, "write_to_movie": False})
+
+    tail = _Tail()
+    logger.addHandler(tail)
+    t0 = time.perf_counter()
+    try:
+        with tempconfig(overrides):
+            _, scene_class = load_scene(script, req.get("scene"))
+            scene = scene_class()
+            scene.render()
+            writer = scene.renderer.file_writer
+            if req.get("last_frame"):
+                output = writer.image_file_path
+            elif overrides["format"] == "gif":
+                output = writer.gif_file_path    # versioned, not the .mp4
+            else:
+                output = writer.movie_file_path
+        return {"ok": True, "output": str(output),
+                "seconds": round(time.perf_counter() - t0, 3),
+                "rss_mb": round(peak_rss_mb(), 1)}
+    except BaseException as exc:    # SystemExit from load_scene included
+        if isinstance(exc, KeyboardInterrupt):
+            raise
+        return {"ok": False, "error": traceback.format_exc(),
+                "log": tail.lines,
+                "seconds": round(time.perf_counter() - t0, 3)}
+    finally:
+        logger.removeHandler(tail)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def serve(path=SOCKET, max_renders=50):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if request({"op": "ping"}, path, timeout=2) is not None:
+        raise SystemExit(f"a render server is already listening on {path}")
+    path.unlink(missing_ok=True)
+
+    t0 = time.perf_counter()
+    warm_up()
+    home = os.getcwd()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen()
+    print(f"render server on {path} (warm in "
+          f"{time.perf_counter() - t0:.1f}s, pid {os.getpid()})", flush=True)
+
+    renders = 0
+    try:
+        while renders < max_renders:
+            conn, _ = server.accept()
+            with conn:
+                req = _receive(conn)
+                if req is None:
+                    continue
+                op = req.get("op")
+                if op == "ping":
+                    _send(conn, {"ok": True, "pid": os.getpid(),
+                                 "renders": renders,
+                                 "rss_mb": round(peak_rss_mb(), 1)})
+                elif op == "stop":
+                    _send(conn, {"ok": True})
+                    break
+                elif op == "render":
+                    reply = render(req)
+                    os.chdir(home)
+                    renders += 1
+                    print(f"  {Path(req['script']).name} -q{req['quality']}"
+                          f"  {reply['seconds']:6.2f}s  "
+                          f"{'ok' if reply['ok'] else 'FAILED'}", flush=True)
+                    try:
+                        _send(conn, reply)
+                    except BrokenPipeError:
+                        pass    # client gave up; the output is on disk
+                else:
+                    _send(conn, {"ok": False, "error": f"unknown op {op!r}"})
+    finally:
+        server.close()
+        path.unlink(missing_ok=True)
+
+
+# ── Client ───────────────────────────────────────────────────────────
+
+def start_server(path=SOCKET, timeout=60):
+    """Start a server in the background and wait until it answers."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    log = open(path.with_suffix(".log"), "ab")
+    proc = subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()),
+         "--socket", str(path), "serve"],
+        stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and proc.poll() is None:
+        if request({"op": "ping"}, path, timeout=2) is not None:
+            return
+        time.sleep(0.1)
+    raise SystemExit(f"render server did not start; see "
+                     f"{path.with_suffix('.log')}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--socket", default=SOCKET,
+                        help=f"Unix socket path (default: {SOCKET})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("render", help="render a scene on the server")
+    p.add_argument("script", help="path to the Manim script")
+    p.add_argument("scene", nargs="?", help="Scene class name")
+    p.add_argument("-q", "--quality", choices=sorted(QUALITY_FLAGS),
+                   default="l", help="as in `manim -q<flag>` (default: l)")
+    p.add_argument("--media-dir", default="media",
+                   help="Manim media directory (default: media)")
+    p.add_argument("--format", choices=["mp4", "gif", "mov", "webm"],
+                   default="mp4")
+    p.add_argument("-s", "--save-last-frame", action="store_true",
+                   help="write only the last frame as a PNG")
+    p.add_argument("--no-start", action="store_true",
+                   help="fail instead of starting a server")
+
+    p = sub.add_parser("serve", help="run the server in the foreground")
+    p.add_argument("--max-renders", type=int, default=50,
+                   help="exit after this many renders (default: 50)")
+    sub.add_parser("status", help="ping the server")
+    sub.add_parser("stop", help="stop the server")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.socket, args.max_renders)
+        return 0
+    if args.command in ("status", "stop"):
+        reply = request({"op": "ping" if args.command == "status"
+                         else "stop"}, args.socket, timeout=5)
+        if reply is None:
+            print(f"no render server on {args.socket}")
+            return 1
+        if args.command == "status":
+            print(f"pid {reply['pid']}: {reply['renders']} renders, "
+                  f"peak RSS {reply['rss_mb']:.0f} MB")
+        return 0
+
+    req = {
+        "op": "render",
+        "script": str(Path(args.script).resolve()),
+        "scene": args.scene,
+        "quality": args.quality,
+        "media_dir": args.media_dir,
+        "format": args.format,
+        "last_frame": args.save_last_frame,
+        "cwd": os.getcwd(),
+        "env": {k: os.environ[k] for k in FORWARDED_ENV if k in os.environ},
+    }
+    reply = request(req, args.socket)
+    if reply is None and not args.no_start:
+        start_server(args.socket)
+        reply = request(req, args.socket)
+    if reply is None:
+        print(f"no render server on {args.socket}", file=sys.stderr)
+        return 1
+    if not reply["ok"]:
+        print("\n".join(reply.get("log", [])), file=sys.stderr)
+        print(reply["error"], file=sys.stderr)
+        return 1
+    print(f"{reply['output']}  ({reply['seconds']:.2f}s, warm)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""Per-scene clips, chapters and thumbnails from a render's timeline.
+
+A scaffold-style script writes <movie>.timeline.json next to its MP4: the
+start and end of every scene_N_* method and scene wipe (see
+scene_timeline() in references/manim-scaffold.py). Each boundary is the
+first frame of one of Manim's partial movie files, so it is a keyframe
+of the MP4. Clips are therefore stream copies cut exactly on the
+boundaries, all in one pass. Chapters are metadata. A thumbnail decodes
+the one keyframe at the scene's end, where the scene is complete and the
+wipe has not started yet. Outputs are named <stem>_<NN>_<name>, NN being
+the entry's position in the index.
+
+Usage:
+  python scripts/scene_index.py media/videos/script/1080p60/PaperVideo.mp4
+  python scripts/scene_index.py PaperVideo.mp4 --clips --thumbs -o exports/
+  python scripts/scene_index.py PaperVideo.mp4 --chapters --wipes
+
+With no action it prints the index and checks every boundary against
+the MP4's keyframes (read from packet headers, no decoding).
+render_segments.py writes the same index for its stitched video.
+"""
+
+from pathlib import Path
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import time
+
+from scene_tools import concat_copy
+
+
+def timeline_path(movie):
+    return Path(movie).with_suffix(".timeline.json")
+
+
+def load(movie):
+    path = timeline_path(movie)
+    if not path.exists():
+        raise SystemExit(f"{path}: no timeline; render with a scaffold-style "
+                         "script (TIMELINE = True)")
+    return json.loads(path.read_text())
+
+
+def keyframe_times(movie):
+    """Presentation times of the video keyframes, from packets only."""
+    import av
+
+    with av.open(str(movie)) as container:
+        stream = container.streams.video[0]
+        return sorted(float(packet.pts * stream.time_base)
+                      for packet in container.demux(stream)
+                      if packet.is_keyframe and packet.pts is not None)
+
+
+def snap(timeline, keyframes):
+    """Move each start and end onto the keyframe within half a frame of
+    it, and mark the scenes whose start has none ("keyframe": False):
+    a stream copy of those starts at the keyframe before."""
+    tolerance = 0.5 / timeline["fps"]
+
+    def nearest(t):
+        best = min(keyframes, key=lambda k: abs(k - t), default=None)
+        if best is not None and abs(best - t) <= tolerance:
+            return best, True
+        return t, False
+
+    for i, scene in enumerate(timeline["scenes"]):
+        scene["index"] = i
+        scene["start"], scene["keyframe"] = nearest(scene["start"])
+        scene["end"] = nearest(scene["end"])[0]
+    return timeline
+
+
+def merge(parts, output):
+    """Timeline of `output`, the concatenation of the movies in `parts`,
+    from their own timelines. Movies without one shift the rest."""
+    scenes, offset, fps = [], 0.0, None
+    for movie in parts:
+        path = timeline_path(movie)
+        if path.exists():
+            part = json.loads(path.read_text())
+            fps = fps or part["fps"]
+            for scene in part["scenes"]:
+                scenes.append({**scene,
+                               "start": round(scene["start"] + offset, 4),
+                               "end": round(scene["end"] + offset, 4)})
+            offset += part["duration"]
+        else:
+            import av
+
+            with av.open(str(movie)) as container:
+                offset += container.duration / av.time_base
+    if fps is None:
+        return None
+    path = timeline_path(output)
+    path.write_text(json.dumps({
+        "movie": Path(output).name, "fps": fps,
+        "duration": round(offset, 4), "scenes": scenes,
+    }, indent=2))
+    return path
+
+
+# ── Actions ──────────────────────────────────────────────────────────
+
+def _run(cmd):
+    t0 = time.perf_counter()
+    subprocess.run(cmd, check=True)
+    return time.perf_counter() - t0
+
+
+def _stem(movie, scene):
+    return f"{Path(movie).stem}_{scene['index']:02d}_{scene['name']}"
+
+
+def clips(movie, scenes, fps, out_dir):
+    """Stream-copy each scene to <stem>_<NN>_<name>.mp4 in one pass.
+
+    The segment muxer splits on the first keyframe packet at or after
+    each boundary, so a cut is exact even with B-frames (a -ss/-t copy
+    keeps the packets that precede the next keyframe in decode order).
+    Returns (paths, seconds).
+    """
+    movie, out_dir = Path(movie), Path(out_dir)
+    cuts = sorted({t for s in scenes for t in (s["start"], s["end"])} - {0.0})
+    # A hair early, so rounding cannot push a cut past its keyframe
+    times = ",".join(f"{t - 0.25 / fps:.6f}" for t in cuts)
+    pattern = out_dir / f".{movie.stem}_part%03d.mp4"
+    seconds = _run([
+        "ffmpeg", "-y", "-loglevel", "error", "-i", str(movie),
+        "-map", "0", "-c", "copy", "-f", "segment",
+        "-segment_times", times, "-reset_timestamps", "1",
+        "-segment_format_options", "movflags=+faststart", str(pattern)])
+    bounds = [0.0, *cuts]
+    parts = [Path(str(pattern) % i) for i in range(len(bounds))]
+    paths = []
+    for scene in scenes:
+        first, end = bounds.index(scene["start"]), bounds.index(scene["end"])
+        out = out_dir / f"{_stem(movie, scene)}.mp4"
+        if end - first == 1:
+            shutil.copyfile(parts[first], out)
+        else:    # the span holds another entry's boundary
+            concat_copy(parts[first:end], out)
+        paths.append(out)
+    for part in parts:
+        part.unlink(missing_ok=True)
+    return paths, seconds
+
+
+def thumbnail(movie, scene, duration, output):
+    """The frame at the scene's end (its finished state). That is the
+    next scene's first frame, a keyframe, so one frame is decoded; the
+    last scene seeks back from the end of the movie instead."""
+    if scene["end"] < duration - 1e-3:
+        seek = ["-ss", f"{scene['end']:.4f}", "-noaccurate_seek"]
+    else:
+        seek = ["-sseof", "-0.1"]
+    return _run(["ffmpeg", "-y", "-loglevel", "error", *seek,
+                 "-i", str(movie), "-frames:v", "1", "-update", "1",
+                 str(output)])
+
+
+def chapter_title(name):
+    """scene_3_results -> "3. Results"."""
+    _, number, rest = (name.split("_", 2) + ["", ""])[:3]
+    if not number.isdigit():
+        return name
+    return f"{number}. {rest.replace('_', ' ').capitalize()}"
+
+
+def chapters(movie, scenes, duration, output):
+    """Copy the movie with one chapter per scene. A scene's chapter
+    runs on through the wipe after it."""
+    meta = Path(output).with_suffix(".chapters.txt")
+    lines = [";FFMETADATA1"]
+    for i, scene in enumerate(scenes):
+        end = scenes[i + 1]["start"] if i + 1 < len(scenes) else duration
+        lines += ["[CHAPTER]", "TIMEBASE=1/1000",
+                  f"START={round(scene['start'] * 1000)}",
+                  f"END={round(end * 1000)}",
+                  f"title={chapter_title(scene['name'])}"]
+    meta.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    try:
+        return _run(["ffmpeg", "-y", "-loglevel", "error", "-i", str(movie),
+                     "-f", "ffmetadata", "-i", str(meta), "-map", "0",
+                     "-map_chapters", "1", "-c", "copy",
+                     "-movflags", "+faststart", str(output)])
+    finally:
+        meta.unlink()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("movie", help="rendered MP4 with a .timeline.json")
+    parser.add_argument("-o", "--out-dir", default="exports")
+    parser.add_argument("--clips", action="store_true",
+                        help="one stream-copied MP4 per scene")
+    parser.add_argument("--thumbs", action="store_true",
+                        help="one PNG per scene, at its end")
+    parser.add_argument("--chapters", action="store_true",
+                        help="copy of the movie with a chapter per scene")
+    parser.add_argument("--wipes", action="store_true",
+                        help="include scene wipes in --clips and --thumbs")
+    parser.add_argument("--json", metavar="PATH",
+                        help="write the keyframe-checked index here")
+    args = parser.parse_args(argv)
+
+    movie = Path(args.movie)
+    t0 = time.perf_counter()
+    timeline = snap(load(movie), keyframe_times(movie))
+    indexed = time.perf_counter() - t0
+    scenes = timeline["scenes"]
+    for s in scenes:
+        flag = "" if s["keyframe"] else "  (no keyframe: cut lands earlier)"
+        print(f"  {s['index']:02d} {s['name']:<24} {s['start']:8.3f} - "
+              f"{s['end']:8.3f}s{flag}")
+    print(f"{len(scenes)} entries, keyframes checked in {indexed * 1000:.0f}ms")
+    if args.json:
+        Path(args.json).write_text(json.dumps(timeline, indent=2))
+
+    picked = [s for s in scenes if args.wipes or s["kind"] == "scene"]
+    out_dir = Path(args.out_dir)
+    if args.clips or args.thumbs or args.chapters:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    if args.clips:
+        paths, seconds = clips(movie, picked, timeline["fps"], out_dir)
+        for path in paths:
+            print(f"  {path}")
+        print(f"{len(paths)} clips in {seconds * 1000:.0f}ms")
+    if args.thumbs:
+        for scene in picked:
+            out = out_dir / f"{_stem(movie, scene)}.png"
+            seconds = thumbnail(movie, scene, timeline["duration"], out)
+            print(f"  {out}  {seconds * 1000:.0f}ms")
+    if args.chapters:
+        out = out_dir / f"{movie.stem}_chapters.mp4"
+        seconds = chapters(movie, [s for s in scenes if s["kind"] == "scene"],
+                           timeline["duration"], out)
+        print(f"  {out}  {seconds * 1000:.0f}ms")
+    return 0 if all(s["keyframe"] for s in scenes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,644 @@
+"""Shared helpers for the render tools in scripts/.
+
+Every tool here works on an unmodified PaperVideo-style script: one Scene
+class whose construct() calls scene_N_* methods in order, with a
+scene_wipe() between them. This module loads such a script by path,
+splits construct() into per-scene segments, runs it without rasterizing
+anything, and renders any subset of segments through Manim's own section
+mechanism.
+
+Import from a sibling tool:
+  from scene_tools import load_scene, split_construct, render_segments
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import ast
+import builtins
+import hashlib
+import importlib.util
+import inspect
+import linecache
+import re
+import sys
+import textwrap
+import types
+
+# Matches the storyboard convention: scene_1_hook, scene_2_setup, ...
+SCENE_METHOD = re.compile(r"^scene_\d+_\w+$")
+
+# manim -q<flag> -> key in manim.constants.QUALITIES
+QUALITY_FLAGS = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+# ── Loading ──────────────────────────────────────────────────────────
+
+def load_module(path):
+    """Import a script by file path (hyphenated names are fine)."""
+    path = Path(path).resolve()
+    name = re.sub(r"\W", "_", path.stem)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so inspect.getsource() can find class/method sources
+    sys.modules[name] = module
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_scene(path, class_name=None):
+    """Return (module, scene_class). class_name may be omitted if the
+    script defines exactly one Scene subclass."""
+    from manim import Scene
+
+    module = load_module(path)
+    if class_name:
+        return module, getattr(module, class_name)
+    scenes = [
+        obj for obj in vars(module).values()
+        if isinstance(obj, type) and issubclass(obj, Scene)
+        and obj.__module__ == module.__name__
+    ]
+    if len(scenes) != 1:
+        names = ", ".join(s.__name__ for s in scenes) or "none"
+        raise SystemExit(f"{path}: pass a scene class name (found: {names})")
+    return module, scenes[0]
+
+
+def add_render_args(parser):
+    """Add the `script [ClassName] -q{l,m,h,p,k}` arguments every tool takes."""
+    parser.add_argument("script", help="path to the Manim script")
+    parser.add_argument("scene", nargs="?", help="Scene class name")
+    parser.add_argument(
+        "-q", "--quality", choices=sorted(QUALITY_FLAGS), default="l",
+        help="render quality, as in `manim -q<flag>` (default: l)",
+    )
+    parser.add_argument("--media-dir", default="media",
+                        help="Manim media directory (default: media)")
+
+
+def quality_config(flag, frame=None):
+    """Config overrides for a quality flag.
+
+    tempconfig() silently drops unknown keys such as "quality", so the
+    resolution and frame rate are set explicitly. The pixel size follows
+    the aspect of `frame` (default: Manim's current frame, which the
+    scaffold's use_format() sets when the script is imported) the way
+    use_format() does: the short side keeps the quality's pixel count,
+    so -qh on a vertical script is 1080x1920, not a squeezed 1920x1080.
+    """
+    from manim import config
+    from manim.constants import QUALITIES
+
+    q = QUALITIES[QUALITY_FLAGS[flag]]
+    frame_w, frame_h = frame or (config.frame_width, config.frame_height)
+    px_per_unit = min(q["pixel_width"], q["pixel_height"]) / min(frame_w,
+                                                                 frame_h)
+    return {
+        "pixel_width": 2 * round(frame_w * px_per_unit / 2),
+        "pixel_height": 2 * round(frame_h * px_per_unit / 2),
+        "frame_rate": q["frame_rate"],
+    }
+
+
+# ── construct() → segments ───────────────────────────────────────────
+
+@dataclass
+class Segment:
+    """One scene_N_* call plus the statements after it (its wipe)."""
+
+    index: int
+    name: str
+    body: list = field(repr=False)
+    run: types.FunctionType = field(default=None, repr=False)
+
+    @property
+    def source(self):
+        return "\n".join(ast.unparse(stmt) for stmt in self.body)
+
+    @property
+    def self_calls(self):
+        """Names of self.<method>(...) calls made directly by this segment."""
+        return _self_attrs(self.body)
+
+
+@dataclass
+class Plan:
+    """construct() split into a preamble and ordered segments."""
+
+    scene_class: type
+    preamble: Segment
+    segments: list
+
+    def run(self, scene, only=None, before=None):
+        """Execute construct() piecewise on `scene`.
+
+        only:   segment indices to render; others run as skipped sections
+                and execution stops after the last one. None = all.
+        before: optional callback(segment, scene) invoked at each boundary.
+        """
+        last = max(only) if only else len(self.segments) - 1
+        if only is not None:
+            # Plays in the preamble belong to the first segment
+            scene.next_section("preamble", skip_animations=0 not in only)
+        self.preamble.run(scene)
+        for seg in self.segments[: last + 1]:
+            if before is not None:
+                before(seg, scene)
+            if only is not None:
+                scene.next_section(seg.name,
+                                   skip_animations=seg.index not in only)
+            seg.run(scene)
+
+
+def _self_attrs(nodes):
+    names = []
+    for stmt in nodes:
+        for node in ast.walk(stmt):
+            if (isinstance(node, ast.Attribute)
+                    and isinstance(node.value, ast.Name)
+                    and node.value.id == "self"
+                    and node.attr not in names):
+                names.append(node.attr)
+    return names
+
+
+def _starts_segment(stmt):
+    return (
+        isinstance(stmt, ast.Expr)
+        and isinstance(stmt.value, ast.Call)
+        and isinstance(stmt.value.func, ast.Attribute)
+        and isinstance(stmt.value.func.value, ast.Name)
+        and stmt.value.func.value.id == "self"
+        and bool(SCENE_METHOD.match(stmt.value.func.attr))
+    )
+
+
+def _compile_block(name, body, module, filename, first_line):
+    """Compile statements from construct() into a `fn(self)` that runs
+    in the script's globals, keeping real line numbers for tracebacks."""
+    tree = ast.parse(f"def {name}(self):\n    pass\n")
+    if body:
+        tree.body[0].body = body
+    ast.increment_lineno(tree, first_line - 1)
+    ns = {}
+    exec(compile(tree, filename, "exec"), vars(module), ns)
+    return ns[name]
+
+
+def split_construct(scene_class):
+    """Split scene_class.construct() into a Plan.
+
+    A segment starts at each `self.scene_N_*()` statement and runs until
+    the next one, so the wipe after a scene belongs to that scene. Any
+    statements before the first scene (background color, persistent
+    character/logo) form the preamble and run before every segment.
+    """
+    module = sys.modules[scene_class.__module__]
+    construct = scene_class.construct
+    lines, first_line = inspect.getsourcelines(construct)
+    tree = ast.parse(textwrap.dedent("".join(lines)))
+    func = tree.body[0]
+    filename = inspect.getsourcefile(construct)
+
+    blocks = [("preamble", [])]
+    for stmt in func.body:
+        if _starts_segment(stmt):
+            blocks.append((stmt.value.func.attr, []))
+        blocks[-1][1].append(stmt)
+    if len(blocks) == 1:
+        raise SystemExit(
+            f"{scene_class.__name__}.construct() has no self.scene_N_*() calls"
+        )
+
+    segs = []
+    for i, (name, body) in enumerate(blocks):
+        seg = Segment(index=i - 1, name=name, body=body)
+        seg.run = _compile_block(f"_{name}", body, module, filename,
+                                 first_line)
+        segs.append(seg)
+    return Plan(scene_class=scene_class, preamble=segs[0], segments=segs[1:])
+
+
+# ── Content fingerprints ─────────────────────────────────────────────
+
+def method_closure(scene_class, names):
+    """Transitively collect the user-defined methods reachable from
+    `names` through self.<attr> references (scene_wipe -> txt, ...)."""
+    module_name = scene_class.__module__
+    seen, todo = {}, list(names)
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        attr = inspect.getattr_static(scene_class, name, None)
+        func = getattr(attr, "__func__", attr)
+        if not inspect.isfunction(func) or func.__module__ != module_name:
+            continue
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+        seen[name] = tree
+        todo.extend(_self_attrs(tree.body))
+    return seen
+
+
+_MISSING = object()
+
+
+def _stable(value):
+    """Text form of plain data (strings, numbers, containers of them,
+    arrays, colors), or None for anything else. Caches and registries
+    (GLYPHS, CHARACTERS) have no content-stable form: their default
+    repr holds a memory address, which differs in every process."""
+    if value is None or isinstance(value, (bool, int, float, complex, str,
+                                           bytes)):
+        return repr(value)
+    if isinstance(value, (tuple, list)):
+        items = [_stable(v) for v in value]
+        if None in items:
+            return None
+        return f"{type(value).__name__}({', '.join(items)})"
+    if isinstance(value, (set, frozenset)):
+        items = [_stable(v) for v in value]
+        if None in items:
+            return None
+        return f"set({', '.join(sorted(items))})"
+    if isinstance(value, dict):
+        items = [(_stable(k), _stable(v)) for k, v in value.items()]
+        if any(None in pair for pair in items):
+            return None
+        return "{" + ", ".join(f"{k}: {v}" for k, v in items) + "}"
+    if hasattr(value, "dtype") and hasattr(value, "tolist"):    # ndarray
+        return f"array({value.tolist()!r})"
+    if type(value).__name__ == "ManimColor":
+        return value.to_hex(with_alpha=True)
+    return None
+
+
+def _reads(tree):
+    """(names, attribute reads) loaded by an AST. X.attr is an attribute
+    read (X, attr), not a read of X."""
+    bases = {id(node.value) for node in ast.walk(tree)
+             if isinstance(node, ast.Attribute)
+             and isinstance(node.value, ast.Name)}
+    names, attrs = set(), set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and isinstance(node.value,
+                                                          ast.Name):
+            attrs.add((node.value.id, node.attr))
+        elif (isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)
+              and id(node) not in bases):
+            names.add(node.id)
+    return names, attrs
+
+
+def _source_tree(obj):
+    try:
+        source = textwrap.dedent(inspect.getsource(obj))
+    except (OSError, TypeError):
+        return None, None
+    return source, ast.parse(source)
+
+
+def global_refs(module, trees, owner=None):
+    """Module-level names the given ASTs read, followed through every
+    same-module function and class they reach (BarSet -> bar_points ->
+    ARC), mapped to a stable text form.
+
+    Functions and classes are keyed by source, data by value (only plain
+    data, see _stable). A `Class.attr` read of a same-module class keys
+    that attribute alone, so txt() reading PaperVideo.FONT does not pull
+    in the whole scene class; `self.attr` reads of `owner`'s data
+    attributes are keyed the same way (its methods are method_closure's
+    job). Imports (manim names, numpy) are ignored.
+    """
+    env = vars(module)
+
+    def local_class(name):
+        value = env.get(name)
+        return (value if inspect.isclass(value)
+                and value.__module__ == module.__name__ else None)
+
+    refs, seen, todo = {}, set(), list(trees)
+    while todo:
+        names, attrs = _reads(todo.pop())
+        for base, attr in sorted(attrs):
+            target = owner if base == "self" else local_class(base)
+            if target is None:
+                names.add(base)
+                continue
+            key = f"{base}.{attr}"
+            if key in seen:
+                continue
+            seen.add(key)
+            value = inspect.getattr_static(target, attr, _MISSING)
+            func = getattr(value, "__func__", value)
+            if value is _MISSING:
+                continue
+            if inspect.isfunction(func) or inspect.isclass(func):
+                if base != "self" and func.__module__ == module.__name__:
+                    source, tree = _source_tree(func)
+                    if tree is not None:
+                        refs[key] = source
+                        todo.append(tree)
+            else:
+                text = _stable(value)
+                if text is not None:
+                    refs[key] = text
+        for name in sorted(names):
+            if name in seen or name not in env or hasattr(builtins, name):
+                continue
+            seen.add(name)
+            value = env[name]
+            if value is owner or isinstance(value, types.ModuleType):
+                continue
+            if inspect.isfunction(value) or inspect.isclass(value):
+                if value.__module__ == module.__name__:
+                    source, tree = _source_tree(value)
+                    if tree is not None:
+                        refs[name] = source
+                        todo.append(tree)
+            else:
+                text = _stable(value)
+                if text is not None:
+                    refs[name] = text
+    return dict(sorted(refs.items()))
+
+
+def segment_fingerprint(plan, seg):
+    """Everything a segment's pixels depend on, except the input state:
+    its statements, the methods they reach, the module data those read,
+    and the preamble."""
+    module = sys.modules[plan.scene_class.__module__]
+    trees = method_closure(plan.scene_class,
+                           seg.self_calls + plan.preamble.self_calls)
+    sources = {name: ast.unparse(tree) for name, tree in trees.items()}
+    refs = global_refs(module, list(trees.values())
+                       + seg.body + plan.preamble.body,
+                       owner=plan.scene_class)
+    return {
+        "statements": seg.source,
+        "preamble": plan.preamble.source,
+        "methods": sources,
+        "globals": refs,
+    }
+
+
+def state_digest(scene):
+    """Hash of everything visible on `scene`: the persistent-element
+    state handed from one segment to the next (character position and
+    variant, logo, anything a wipe left behind)."""
+    import numpy as np
+
+    h = hashlib.sha256()
+    for mob in scene.mobjects:
+        for m in mob.get_family():
+            h.update(type(m).__name__.encode())
+            h.update(np.round(np.asarray(m.points, dtype=float), 5).tobytes())
+            for attr in ("fill_rgbas", "stroke_rgbas", "stroke_width"):
+                value = getattr(m, attr, None)
+                if value is not None:
+                    h.update(np.asarray(value, dtype=float).tobytes())
+            pixels = getattr(m, "pixel_array", None)
+            if pixels is not None:
+                h.update(hashlib.sha1(np.ascontiguousarray(pixels)).digest())
+    return h.hexdigest()
+
+
+def digest(*parts):
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:16]
+
+
+# ── Static call scan ─────────────────────────────────────────────────
+
+# Expressions evaluated against the script's globals; no calls
+_SAFE_NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load, ast.Attribute,
+    ast.Tuple, ast.List, ast.Dict, ast.Set, ast.JoinedStr,
+    ast.FormattedValue, ast.BinOp, ast.UnaryOp, ast.Add, ast.Mult,
+    ast.USub, ast.Subscript, ast.Slice, ast.Starred,
+)
+MAX_LOOP_BINDINGS = 256   # iterations a scanned for loop expands into
+
+
+def _evaluable(node):
+    return all(isinstance(n, _SAFE_NODES) for n in ast.walk(node))
+
+
+def _evaluate(node, namespace):
+    expr = ast.Expression(body=node)
+    ast.fix_missing_locations(expr)
+    return eval(compile(expr, "<scan>", "eval"), namespace)
+
+
+def _bind(target, value, namespace):
+    """Assign `value` to a for-loop target (names and tuples of names)."""
+    if isinstance(target, ast.Name):
+        namespace[target.id] = value
+        return True
+    if isinstance(target, (ast.Tuple, ast.List)):
+        values = list(value)
+        if len(values) != len(target.elts):
+            return False
+        return all(_bind(t, v, namespace)
+                   for t, v in zip(target.elts, values))
+    return False
+
+
+def _call_args(node, namespace):
+    args = []
+    for arg in node.args:
+        if isinstance(arg, ast.Starred):
+            args.extend(_evaluate(arg.value, namespace))
+        else:
+            args.append(_evaluate(arg, namespace))
+    kwargs = {}
+    for kw in node.keywords:
+        value = _evaluate(kw.value, namespace)
+        if kw.arg is None:
+            kwargs.update(value)
+        else:
+            kwargs[kw.arg] = value
+    return args, kwargs
+
+
+def literal_calls(module, path, names):
+    """(line, name, args, kwargs) of every call to a function or method
+    in `names` whose arguments are known without running the script.
+
+    Arguments may be literals, module constants, f-strings of those, or
+    the target of an enclosing `for` loop over module data (one call per
+    iteration: `for name, *_ in CHART_DATA: self.txt(name)`). Anything
+    assigned inside a function is treated as unknown.
+    """
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    calls = []
+
+    def visit(node, envs):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef,
+                             ast.Lambda)):
+            local = {n.id for n in ast.walk(node)
+                     if isinstance(n, ast.Name)
+                     and isinstance(n.ctx, ast.Store)}
+            local |= {a.arg for a in ast.walk(node.args)
+                      if isinstance(a, ast.arg)}
+            envs = [{k: v for k, v in env.items() if k not in local}
+                    for env in envs]
+        elif isinstance(node, ast.For) and _evaluable(node.iter):
+            bound = []
+            try:
+                for env in envs:
+                    for item in _evaluate(node.iter, env):
+                        ns = dict(env)
+                        if not _bind(node.target, item, ns):
+                            raise ValueError(node.target)
+                        bound.append(ns)
+            except Exception:
+                bound = None
+            if bound is not None and len(bound) <= MAX_LOOP_BINDINGS:
+                for stmt in node.body:
+                    visit(stmt, bound)
+                for stmt in node.orelse:
+                    visit(stmt, envs)
+                return
+        elif isinstance(node, ast.Call):
+            func = node.func
+            name = getattr(func, "id", None) or getattr(func, "attr", None)
+            parts = [*node.args, *(kw.value for kw in node.keywords)]
+            if name in names and all(_evaluable(p) for p in parts):
+                for env in envs:
+                    try:
+                        args, kwargs = _call_args(node, env)
+                    except Exception:
+                        continue    # a local variable after all
+                    calls.append((node.lineno, name, args, kwargs))
+        for child in ast.iter_child_nodes(node):
+            visit(child, envs)
+
+    visit(tree, [dict(vars(module))])
+    return sorted(calls, key=lambda c: c[0])
+
+
+# ── Execution ────────────────────────────────────────────────────────
+
+def _noop(*args, **kwargs):
+    return None
+
+
+def dry_run_scene(scene_class):
+    """Instantiate scene_class so construct() runs its full logic (every
+    play() updates mobjects to their end state) without rasterizing or
+    encoding a single frame. Call inside tempconfig({"dry_run": True})."""
+    scene = scene_class(skip_animations=True)
+    renderer = scene.renderer
+    renderer.update_frame = _noop
+    renderer.save_static_frame_data = _noop
+    renderer.get_frame = _noop
+    return scene
+
+
+def call_site(script):
+    """(method, line, code) of the innermost frame inside `script` on
+    the current stack; the method is the nearest enclosing scene_N_* if
+    there is one. Used to attribute a play() to the line that made it."""
+    script = Path(script).resolve()
+    frame = sys._getframe(1)
+    site = None
+    while frame is not None:
+        code = frame.f_code
+        if Path(code.co_filename).resolve() == script:
+            if site is None:
+                site = (code.co_name, frame.f_lineno)
+            if SCENE_METHOD.match(code.co_name):
+                return code.co_name, site[1], linecache.getline(
+                    str(script), site[1]).strip()
+        frame = frame.f_back
+    if site is None:
+        return "?", 0, ""
+    return site[0], site[1], linecache.getline(str(script), site[1]).strip()
+
+
+def boundary_states(plan):
+    """Dry-run the whole plan.
+
+    Returns (states, times): the state digest at the start of each
+    segment, and the scene time at each boundary plus the final time, so
+    segment i runs from times[i] to times[i + 1].
+    """
+    from manim import tempconfig
+
+    states, times = [], []
+
+    def record(seg, scene):
+        states.append(state_digest(scene))
+        times.append(scene.renderer.time)
+
+    with tempconfig({"dry_run": True, "progress_bar": "none"}):
+        scene = dry_run_scene(plan.scene_class)
+        scene.setup()
+        plan.run(scene, before=record)
+        times.append(scene.renderer.time)
+    return states, times
+
+
+def render_segments(plan, indices, script, quality, output_file,
+                    media_dir="media"):
+    """Render only `indices` (other segments run as skipped sections) to
+    one movie file. Returns the path Manim wrote."""
+    from manim import tempconfig
+
+    only = set(indices)
+    base = plan.scene_class
+    scene_cls = type(base.__name__, (base,), {
+        "construct": lambda self: plan.run(self, only=only),
+    })
+    overrides = quality_config(quality)
+    overrides.update({
+        "input_file": str(Path(script).resolve()),
+        "media_dir": str(media_dir),
+        "output_file": str(output_file),
+        "write_to_movie": True,
+        "progress_bar": "none",
+    })
+    with tempconfig(overrides):
+        scene = scene_cls()
+        scene.render()
+        return Path(scene.renderer.file_writer.movie_file_path)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process, in MB."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ── ffmpeg ───────────────────────────────────────────────────────────
+
+def concat_copy(files, output):
+    """Join same-codec MP4s with the concat demuxer, no re-encode."""
+    import subprocess
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    listing = output.with_suffix(".concat.txt")
+    listing.write_text(
+        "".join(f"file '{Path(f).resolve().as_posix()}'\n" for f in files),
+        encoding="utf-8",
+    )
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+         "-i", str(listing), "-c", "copy", "-movflags", "+faststart",
+         str(output)],
+        check=True,
+    )
+    listing.unlink()
+    return output
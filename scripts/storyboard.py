@@ -0,0 +1,439 @@
+"""Declarative storyboard spec: zero-render timing check and compiler.
+
+A storyboard.toml (see references/storyboard-template.toml) lists the
+scenes, their archetype, the data block and every beat's run_time or
+wait. `check` adds the beats up - frame-accurate at --fps, plus one
+scene_wipe() per transition - and compares the total against the budget
+without importing Manim. `compile` writes a PaperVideo-style script from
+references/manim-scaffold.py: the data block as module constants,
+construct() calling scene_N_<name> with the wipes in between, and one
+method per scene with every beat already timed.
+
+Usage:
+  python scripts/storyboard.py check storyboard.toml
+  python scripts/storyboard.py check storyboard.toml --fps 15 --json t.json
+  python scripts/storyboard.py compile storyboard.toml -o my_video.py
+
+check exits with status 1 if the spec is invalid or the total falls
+outside the budget.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import argparse
+import ast
+import json
+import math
+import re
+import sys
+import tomllib
+
+ROOT = Path(__file__).resolve().parent.parent
+SCAFFOLD = ROOT / "references" / "manim-scaffold.py"
+
+# Nominal length of each archetype (rules/storyboard-design.md), seconds
+ARCHETYPES = {
+    "hook": 5.0,
+    "setup": 5.0,
+    "framework": 5.0,
+    "results": 7.0,
+    "insight": 5.0,
+    "closing": 3.0,
+}
+
+# transition -> PaperVideo method played after the scene
+TRANSITIONS = {
+    "wipe": "scene_wipe",
+    "wipe_simple": "scene_wipe_simple",
+    "none": None,
+}
+
+HEADER_WIDTH = 72   # "# ── Title ───" comment lines in the scaffold
+
+
+class SpecError(ValueError):
+    """The storyboard spec is malformed."""
+
+
+@dataclass
+class Beat:
+    """One self.play() (kind "play") or self.wait() (kind "wait")."""
+
+    kind: str
+    seconds: float
+    say: str = ""
+    code: list = field(default_factory=list)
+
+
+@dataclass
+class StoryScene:
+    index: int
+    name: str
+    archetype: str
+    purpose: str
+    beats: list
+    transition: str
+    target: str
+    setup: str = ""
+
+    @property
+    def method(self):
+        return f"scene_{self.index}_{self.name}"
+
+
+@dataclass
+class Storyboard:
+    title: str
+    scene_class: str
+    budget: tuple
+    wipe: float
+    data: dict
+    scenes: list
+
+
+# ── Loading ──────────────────────────────────────────────────────────
+
+def _seconds(value, where):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise SpecError(f"{where}: expected a number of seconds")
+    if value <= 0:
+        raise SpecError(f"{where}: must be > 0 (Manim rejects it)")
+    return float(value)
+
+
+def _python(source, where, mode="eval"):
+    try:
+        ast.parse(source, mode=mode)
+    except SyntaxError as e:
+        raise SpecError(f"{where}: not valid Python: {e.msg}") from None
+    return source
+
+
+def _beat(raw, where):
+    if not isinstance(raw, dict):
+        raise SpecError(f"{where}: expected a table")
+    if ("run_time" in raw) == ("wait" in raw):
+        raise SpecError(f"{where}: give exactly one of run_time or wait")
+    code = raw.get("code", [])
+    if isinstance(code, str):
+        code = [code]
+    code = [_python(c, f"{where}.code") for c in code]
+    if "wait" in raw:
+        if code:
+            raise SpecError(f"{where}: a wait beat cannot have code")
+        return Beat("wait", _seconds(raw["wait"], f"{where}.wait"),
+                    raw.get("say", ""))
+    return Beat("play", _seconds(raw["run_time"], f"{where}.run_time"),
+                raw.get("say", ""), code)
+
+
+def parse_spec(raw):
+    """Validate a decoded spec (dict) and return a Storyboard."""
+    video = raw.get("video", {})
+    budget = tuple(video.get("budget", (25, 35)))
+    if len(budget) != 2 or not 0 <= budget[0] <= budget[1]:
+        raise SpecError("video.budget: expected [min, max] seconds")
+    scene_class = video.get("scene_class", "PaperVideo")
+    if not scene_class.isidentifier():
+        raise SpecError(f"video.scene_class: {scene_class!r} is not a name")
+    data = raw.get("data", {})
+    for name in data:
+        if not name.isidentifier():
+            raise SpecError(f"data.{name}: not a valid Python name")
+
+    entries = raw.get("scenes", [])
+    if not entries:
+        raise SpecError("no [[scenes]]")
+    scenes, seen = [], set()
+    for i, entry in enumerate(entries, start=1):
+        where = f"scenes[{i}]"
+        name = entry.get("name", entry.get("archetype", ""))
+        if not re.fullmatch(r"[a-z][a-z0-9_]*", name):
+            raise SpecError(f"{where}.name: {name!r} must be snake_case")
+        if name in seen:
+            raise SpecError(f"{where}.name: duplicate scene {name!r}")
+        seen.add(name)
+        default = "none" if i == len(entries) else "wipe"
+        transition = entry.get("transition", default)
+        if transition not in TRANSITIONS:
+            raise SpecError(f"{where}.transition: one of "
+                            f"{', '.join(TRANSITIONS)}")
+        beats = [_beat(b, f"{where}.beats[{j}]")
+                 for j, b in enumerate(entry.get("beats", []), start=1)]
+        if not beats:
+            raise SpecError(f"{where}: no beats")
+        scenes.append(StoryScene(
+            index=i, name=name,
+            archetype=entry.get("archetype", name),
+            purpose=entry.get("purpose", ""),
+            beats=beats,
+            transition=transition,
+            target=_python(entry.get("target", "ORIGIN"), f"{where}.target"),
+            setup=_python(entry.get("setup", ""), f"{where}.setup", "exec"),
+        ))
+    return Storyboard(
+        title=video.get("title", "[Paper Title]"),
+        scene_class=scene_class,
+        budget=(float(budget[0]), float(budget[1])),
+        wipe=_seconds(video.get("wipe", 0.5), "video.wipe"),
+        data=data,
+        scenes=scenes,
+    )
+
+
+def load_spec(path):
+    """Read a storyboard from .toml (or .json, same structure)."""
+    path = Path(path)
+    if path.suffix == ".json":
+        raw = json.loads(path.read_text())
+    else:
+        with open(path, "rb") as f:
+            raw = tomllib.load(f)
+    return parse_spec(raw)
+
+
+# ── Timing ───────────────────────────────────────────────────────────
+
+def frame_count(seconds, fps, wait=False):
+    """Frames Manim renders for a play() or wait() of this length. A
+    play() renders one per step of np.arange(0, run_time, 1 / fps); a
+    wait() holds one frozen frame for int(duration / dt) frames, so it
+    rounds down."""
+    if wait:
+        return int(seconds / (1 / fps))
+    return math.ceil(seconds * fps - 1e-9)
+
+
+def timing(board, fps=60):
+    """Per-scene and total duration in ms, frame-accurate at `fps`."""
+    def ms(frames):
+        return round(frames * 1000 / fps)
+
+    wipe = frame_count(board.wipe, fps)
+    rows, notes, clock = [], [], 0
+    for scene in board.scenes:
+        frames = sum(frame_count(b.seconds, fps, b.kind == "wait")
+                     for b in scene.beats)
+        wipe_frames = wipe if TRANSITIONS[scene.transition] else 0
+        slot = ARCHETYPES.get(scene.archetype)
+        rows.append({
+            "method": scene.method,
+            "archetype": scene.archetype,
+            "start_ms": ms(clock),
+            "ms": ms(frames),
+            "wipe_ms": ms(wipe_frames),
+            "slot_ms": round(slot * 1000) if slot else None,
+            "beats": len(scene.beats),
+        })
+        clock += frames + wipe_frames
+
+        if slot and frames / fps > slot * 1.5:
+            notes.append(f"{scene.method}: {frames / fps:.2f}s is well over "
+                         f"the {slot:g}s {scene.archetype} slot")
+        for j, beat in enumerate(scene.beats, start=1):
+            if beat.kind == "play" and beat.seconds > 2.0:
+                notes.append(f"{scene.method} beat {j}: {beat.seconds:g}s "
+                             f"play() - keep animations snappy")
+            elif beat.kind == "wait" and beat.seconds > 3.0:
+                notes.append(f"{scene.method} beat {j}: {beat.seconds:g}s "
+                             f"hold - viewers scroll away")
+    if not 0.4 <= board.wipe <= 0.6:
+        notes.append(f"wipe {board.wipe:g}s is outside the 0.4-0.6s range")
+
+    lo, hi = (round(b * 1000) for b in board.budget)
+    total = ms(clock)
+    return {
+        "fps": fps,
+        "total_ms": total,
+        "budget_ms": [lo, hi],
+        "ok": lo <= total <= hi,
+        "scenes": rows,
+        "notes": notes,
+    }
+
+
+def print_timing(report):
+    for row in report["scenes"]:
+        slot = f"slot {row['slot_ms']:>5}" if row["slot_ms"] else " " * 10
+        wipe = f"+ wipe {row['wipe_ms']}" if row["wipe_ms"] else ""
+        print(f"  {row['start_ms']:>6} ms  {row['method']:<26} "
+              f"{row['ms']:>6} ms  {slot}  {wipe}")
+    lo, hi = report["budget_ms"]
+    verdict = "OK" if report["ok"] else "OUT OF BUDGET"
+    print(f"total {report['total_ms']} ms at {report['fps']} fps "
+          f"(budget {lo}-{hi} ms): {verdict}")
+    for note in report["notes"]:
+        print(f"  note: {note}")
+
+
+# ── Compiling ────────────────────────────────────────────────────────
+
+def _header(title, indent=""):
+    head = f"{indent}# ── {title} "
+    return head + "─" * max(HEADER_WIDTH - len(head), 2)
+
+
+def _py(value):
+    """Python source for a scalar or a table row (rows become tuples)."""
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, list):
+        items = ", ".join(_py(v) for v in value)
+        return f"({items},)" if len(value) == 1 else f"({items})"
+    return repr(value)
+
+
+def _constant(name, value):
+    if isinstance(value, dict):
+        body = "".join(f"    {_py(k)}: {_py(v)},\n" for k, v in value.items())
+        return f"{name} = {{\n{body}}}\n"
+    if isinstance(value, list) and any(isinstance(v, list) for v in value):
+        body = "".join(f"    {_py(v)},\n" for v in value)
+        return f"{name} = [\n{body}]\n"
+    if isinstance(value, list):
+        return f"{name} = [{', '.join(_py(v) for v in value)}]\n"
+    return f"{name} = {_py(value)}\n"
+
+
+def _replace(src, start, end, text):
+    """Replace src[start marker:end marker) with text."""
+    a = src.index(start)
+    b = src.index(end, a)
+    return src[:a] + text + src[b:]
+
+
+def _method(scene):
+    title = scene.name.replace("_", " ").title()
+    lines = [
+        _header(f"Scene {scene.index}: {title}", "    "),
+        "",
+        f"    def {scene.method}(self):",
+        f'        """{scene.purpose or title}"""',
+    ]
+    for line in scene.setup.strip().splitlines():
+        lines.append(f"        {line}".rstrip())
+    for j, beat in enumerate(scene.beats, start=1):
+        if beat.kind == "wait":
+            comment = f"  # {beat.say}" if beat.say else ""
+            lines.append(f"        self.wait({beat.seconds:g}){comment}")
+            continue
+        if beat.say:
+            lines.append(f"        # {beat.say}")
+        if beat.code:
+            lines.append("        self.play(")
+            lines += [f"            {c}," for c in beat.code]
+            lines.append(f"            run_time={beat.seconds:g},")
+            lines.append("        )")
+        else:
+            # A card with the beat's line fades in and out over the
+            # beat's run_time, so the draft renders at its final length
+            card = f"beat {j}: {beat.say}" if beat.say else f"beat {j}"
+            lines += [
+                f"        # PLACEHOLDER: beat {j} has no code in the spec",
+                "        placeholder = self.txt(",
+                f"            {_py(card)},",
+                "            font_size=20, color=MUTED,",
+                "        ).to_edge(DOWN)",
+                "        self.play(",
+                "            FadeIn(placeholder, rate_func=there_and_back,",
+                "                   remover=True),",
+                f"            run_time={beat.seconds:g},",
+                "        )",
+            ]
+    return "\n".join(lines) + "\n"
+
+
+def placeholders(board):
+    """The play() beats with no code, as "scene_N_name beat J"."""
+    return [f"{scene.method} beat {j}"
+            for scene in board.scenes
+            for j, beat in enumerate(scene.beats, start=1)
+            if beat.kind == "play" and not beat.code]
+
+
+def compile_script(board, spec_name="storyboard.toml", scaffold=SCAFFOLD):
+    """Return the source of a PaperVideo-style script for `board`."""
+    src = Path(scaffold).read_text()
+
+    src = src.replace(
+        '"""Paper Explainer Video - Scaffold',
+        f'"""{board.title} - Paper Explainer Video', 1,
+    ).replace(
+        "Replace [PAPER_NAME] and fill in scene methods.",
+        f"Compiled from {spec_name}; replace every PLACEHOLDER beat.", 1,
+    )
+
+    data = dict(board.data)
+    if "COLORS" in data:
+        src = _replace(
+            src, "# ── Paper-Specific Colors", "# ── Data (from paper)",
+            _header("Paper-Specific Colors") + "\n"
+            + _constant("COLORS", data.pop("COLORS")) + "\n",
+        )
+    if data:
+        src = _replace(
+            src, "# ── Data (from paper)", "# ── Assets",
+            _header("Data (from paper)") + "\n"
+            + "\n".join(_constant(k, v) for k, v in data.items()) + "\n",
+        )
+
+    calls = []
+    for scene in board.scenes:
+        calls.append(f"        self.{scene.method}()")
+        wipe = TRANSITIONS[scene.transition]
+        if wipe:
+            calls.append(f"        self.{wipe}(target_pos={scene.target})")
+    src = _replace(src, "        # ── Scene sequence ──\n",
+                   "\n    # ── Utilities",
+                   "        # ── Scene sequence ──\n" + "\n".join(calls) + "\n")
+
+    src = src[:src.index("    # ── Scene 1:")]
+    src += "\n".join(_method(scene) for scene in board.scenes)
+    src = re.sub(r"\bPaperVideo\b", board.scene_class, src)
+    ast.parse(src)   # a bad code/setup snippet fails here, not in Manim
+    return src
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check", help="timing report, no rendering")
+    check.add_argument("spec")
+    check.add_argument("--fps", type=int, default=60,
+                       help="frame rate to quantize to (default: 60, -qh)")
+    check.add_argument("--json", metavar="PATH", help="write report as JSON")
+    build = sub.add_parser("compile", help="write the Manim script")
+    build.add_argument("spec")
+    build.add_argument("-o", "--output", default=None,
+                       help="script path (default: <spec stem>.py)")
+    args = parser.parse_args(argv)
+
+    try:
+        board = load_spec(args.spec)
+    except (SpecError, tomllib.TOMLDecodeError) as e:
+        print(f"{args.spec}: {e}", file=sys.stderr)
+        return 1
+
+    if args.command == "check":
+        report = timing(board, args.fps)
+        print_timing(report)
+        if args.json:
+            Path(args.json).write_text(json.dumps(report, indent=2))
+        return 0 if report["ok"] else 1
+
+    output = Path(args.output or Path(args.spec).with_suffix(".py").name)
+    output.write_text(compile_script(board, Path(args.spec).name))
+    report = timing(board)
+    print(f"wrote {output} ({len(board.scenes)} scenes, "
+          f"{report['total_ms']} ms)")
+    missing = placeholders(board)
+    if missing:
+        print(f"{len(missing)} beats play a placeholder card until their "
+              f"code is written:")
+        for name in missing:
+            print(f"  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
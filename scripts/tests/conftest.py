@@ -0,0 +1,98 @@
+"""Shared fixtures for the scripts/ tests.
+
+The tools import their siblings by bare name (`from scene_tools import
+...`), as they do when run as `python scripts/<tool>.py`, so scripts/ goes
+on sys.path. Nothing here needs Manim: tests that would are not written.
+"""
+
+from pathlib import Path
+import json
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+# A PaperVideo-shaped script without Manim: scene methods, a wipe, a
+# glyph cache, a chart helper chain (BarSet -> bar_points -> ARC) and a
+# class attribute read the way txt() reads PaperVideo.FONT
+DEMO = textwrap.dedent('''
+    ARC = 0.5523
+    LABEL_LEFT = -5.8
+    PALETTE = {"WHITE": "#e6edf3", "ACCENT": "#58a6ff"}
+
+
+    class GlyphCache:
+        def __init__(self):
+            self.entries = {}
+
+
+    GLYPHS = GlyphCache()
+
+
+    def bar_points(width):
+        return [width * ARC]
+
+
+    class BarSet:
+        def __init__(self, width):
+            self.points = bar_points(width)
+
+
+    class DemoVideo:
+        FONT = "Inter"
+
+        def construct(self):
+            self.color = PALETTE["WHITE"]
+            self.scene_1_hook()
+            self.scene_wipe()
+            self.scene_2_chart()
+            self.scene_wipe()
+            self.scene_3_outro()
+
+        def txt(self, text):
+            GLYPHS.entries[text] = DemoVideo.FONT
+            return text
+
+        def scene_wipe(self):
+            self.txt("wipe")
+
+        def scene_1_hook(self):
+            self.txt("hook")
+
+        def scene_2_chart(self):
+            BarSet(LABEL_LEFT)
+
+        def scene_3_outro(self):
+            self.txt("outro")
+''')
+
+_KEYS = """
+import json, sys
+sys.path.insert(0, {scripts!r})
+from scene_tools import digest, load_module, segment_fingerprint, split_construct
+
+plan = split_construct(load_module(sys.argv[1]).DemoVideo)
+print(json.dumps({{seg.name: digest(segment_fingerprint(plan, seg))
+                  for seg in plan.segments}}))
+"""
+
+
+@pytest.fixture
+def demo_script(tmp_path):
+    path = tmp_path / "demo_video.py"
+    path.write_text(DEMO)
+    return path
+
+
+def segment_keys(script):
+    """{segment name: key} computed in a fresh interpreter, as a new
+    render_segments / watch_preview run would."""
+    out = subprocess.run(
+        [sys.executable, "-c", _KEYS.format(scripts=str(SCRIPTS)),
+         str(script)],
+        check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
@@ -0,0 +1,54 @@
+import itertools
+
+import numpy as np
+
+from check_layout import GridIndex, _intersection
+
+
+def _boxes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x0 = rng.uniform(-7, 6, n)
+    y0 = rng.uniform(-4, 3, n)
+    w = rng.uniform(0.05, 2.5, n)
+    h = rng.uniform(0.05, 0.6, n)
+    return list(zip(x0, y0, x0 + w, y0 + h))
+
+
+def _overlapping(boxes, pairs):
+    return {(i, j) for i, j in pairs
+            if min(_intersection(boxes[i], boxes[j])) > 0}
+
+
+def test_grid_finds_every_overlap_brute_force_finds():
+    boxes = _boxes(300)
+    index = GridIndex()
+    for i, box in enumerate(boxes):
+        index.insert(i, box)
+    found = _overlapping(boxes, index.pairs())
+    assert found
+    assert found == _overlapping(
+        boxes, itertools.combinations(range(len(boxes)), 2))
+
+
+def test_grid_yields_each_pair_once():
+    boxes = _boxes(200, seed=1)
+    index = GridIndex(cell=0.5)
+    for i, box in enumerate(boxes):
+        index.insert(i, box)
+    pairs = list(index.pairs())
+    assert len(pairs) == len(set(pairs))
+
+
+def test_grid_skips_boxes_in_other_cells():
+    index = GridIndex()
+    index.insert(0, (-6.5, 3.1, -5.2, 3.4))      # top left
+    index.insert(1, (5.0, -3.6, 6.4, -3.2))      # bottom right
+    index.insert(2, (-5.5, 3.2, -4.1, 3.6))      # next to 0, spans cells
+    assert list(index.pairs()) == [(0, 2)]
+
+
+def test_box_spanning_cells_is_filed_in_each():
+    index = GridIndex(cell=1.0)
+    index.insert(0, (-0.5, -0.5, 1.5, 0.5))
+    assert sorted(index.cells) == [(-1, -1), (-1, 0), (0, -1), (0, 0),
+                                   (1, -1), (1, 0)]
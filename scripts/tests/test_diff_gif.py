@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from diff_gif import _header, _image, dirty_rects, lzw
+
+
+def unlzw(blocks):
+    """Reference GIF LZW decoder (sub-blocks in, palette indices out)."""
+    min_size, pos, data = blocks[0], 1, bytearray()
+    while blocks[pos]:
+        data += blocks[pos + 1:pos + 1 + blocks[pos]]
+        pos += 1 + blocks[pos]
+    assert pos == len(blocks) - 1, "data after the block terminator"
+
+    clear, end = 1 << min_size, (1 << min_size) + 1
+    acc = nbits = 0
+    reader = iter(data)
+    out, table, size, prev = bytearray(), None, min_size + 1, None
+    while True:
+        while nbits < size:
+            acc |= next(reader) << nbits
+            nbits += 8
+        code = acc & ((1 << size) - 1)
+        acc >>= size
+        nbits -= size
+        if code == clear:
+            table = [bytes([i]) for i in range(clear)] + [b"", b""]
+            size, prev = min_size + 1, None
+            continue
+        if code == end:
+            return bytes(out)
+        if prev is None:
+            entry = table[code]
+        elif code < len(table):
+            entry = table[code]
+            if len(table) < 4096:
+                table.append(prev + entry[:1])
+        else:
+            assert code == len(table), f"code {code} is not in the table"
+            entry = prev + prev[:1]
+            table.append(entry)
+        out += entry
+        prev = entry
+        if len(table) == 1 << size and size < 12:
+            size += 1
+
+
+@pytest.mark.parametrize("data", [
+    bytes([7]),
+    bytes([3, 3]),
+    bytes(5000),                                          # one long run
+    bytes(range(256)) * 3,
+    np.random.default_rng(0).integers(0, 256, 40000, np.uint8).tobytes(),
+    np.random.default_rng(1).integers(0, 4, 40000, np.uint8).tobytes(),
+], ids=["one", "two", "run", "ramp", "noise", "few-colors"])
+def test_lzw_round_trip(data):
+    assert unlzw(lzw(data)) == data
+
+
+def test_lzw_sub_blocks_are_at_most_255_bytes():
+    blocks = lzw(np.random.default_rng(2).integers(0, 256, 5000,
+                                                   np.uint8).tobytes())
+    pos = 1
+    while blocks[pos]:
+        assert blocks[pos] <= 255
+        pos += 1 + blocks[pos]
+
+
+def _frames():
+    base = np.zeros((24, 32), np.uint8)
+    moved = base.copy()
+    moved[5:8, 10:14] = 3
+    moved[20, 30] = 4
+    return [base, base.copy(), moved, moved.copy(), moved.copy()]
+
+
+def test_dirty_rects_merges_unchanged_frames():
+    rects = list(dirty_rects(_frames()))
+    assert [repeat for *_, repeat in rects] == [2, 3]
+    x, y, sub, _ = rects[0]
+    assert (x, y, sub.shape) == (0, 0, (24, 32))
+
+
+def test_dirty_rects_writes_the_changed_bounding_box():
+    (_, _, _, _), (x, y, sub, _) = dirty_rects(_frames(), transparent=255)
+    assert (x, y, sub.shape) == (10, 5, (16, 21))
+    assert (sub[:3, :4] == 3).all() and sub[15, 20] == 4
+    # Unchanged pixels inside the box are transparent
+    assert (sub == 255).sum() == sub.size - 12 - 1
+
+
+def test_dirty_rects_fuzz_ignores_near_colors():
+    colors = np.zeros((256, 3), np.uint8)
+    colors[1] = (4, 4, 4)          # dither neighbor of black
+    colors[2] = (200, 0, 0)
+    a = np.zeros((8, 8), np.uint8)
+    b = a.copy()
+    b[0, 0] = 1
+    c = b.copy()
+    c[4, 4] = 2
+    rects = list(dirty_rects([a, b, c], colors=colors, fuzz=8))
+    assert [repeat for *_, repeat in rects] == [2, 1]
+    x, y, sub, _ = rects[1]
+    assert (x, y, sub.shape) == (4, 4, (1, 1))
+
+
+def test_gif_decodes_to_the_input_frames(tmp_path):
+    av = pytest.importorskip("av")
+    colors = np.random.default_rng(3).integers(0, 256, (256, 3), np.uint8)
+    transparent = 255
+    frames = _frames()
+    path = tmp_path / "out.gif"
+    with open(path, "wb") as f:
+        f.write(_header(32, 24, colors))
+        for i, (x, y, sub, repeat) in enumerate(
+                dirty_rects(frames, transparent)):
+            f.write(_image(x, y, sub.shape[1], sub.shape[0], 7 * repeat,
+                           transparent if i else None,
+                           lzw(np.ascontiguousarray(sub).tobytes())))
+        f.write(b"\x3B")
+
+    with av.open(str(path)) as container:
+        decoded = [frame.to_ndarray(format="rgb24")
+                   for frame in container.decode(video=0)]
+    assert len(decoded) == 2
+    np.testing.assert_array_equal(decoded[0], colors[frames[0]])
+    np.testing.assert_array_equal(decoded[1], colors[frames[2]])
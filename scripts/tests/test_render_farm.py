@@ -0,0 +1,126 @@
+import json
+import shutil
+
+import pytest
+
+from conftest import SCRIPTS
+from render_farm import Queue, _job_dir, discover
+
+TEMPLATE = SCRIPTS.parent / "references" / "storyboard-template.toml"
+
+
+def _status(queue):
+    return {row["id"]: (row["status"], row["attempts"])
+            for row in queue.rows()}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return Queue(tmp_path / "farm")
+
+
+@pytest.fixture
+def scripts(tmp_path, demo_script):
+    # Discovery wants a Scene subclass; the demo only needs the name
+    text = demo_script.read_text().replace("class DemoVideo:",
+                                           "class DemoVideo(Scene):")
+    paths = []
+    for name in ("a_video.py", "b_video.py"):
+        path = tmp_path / name
+        path.write_text(text)
+        paths.append(path)
+    return paths
+
+
+def test_enqueue_is_idempotent_until_the_file_changes(queue, scripts):
+    a, _ = scripts
+    assert queue.enqueue(a, "h") == "pending"
+    job = queue.claim()
+    queue.finish(job["id"], dict.fromkeys(
+        ("wall", "video_s", "frames", "segments", "rendered", "rss_mb",
+         "output")))
+    assert queue.enqueue(a, "h") == "done"
+    assert queue.enqueue(a, "l") == "pending"     # another quality, new job
+
+    a.write_text(a.read_text() + "\n# edit\n")
+    assert queue.enqueue(a, "h") == "pending"
+    assert _status(queue)[job["id"]] == ("pending", 0)
+
+
+def test_claim_takes_the_oldest_or_the_preferred_job(queue, scripts):
+    for path in scripts:
+        queue.enqueue(path, "h")
+    first, second = (row["id"] for row in queue.rows())
+    assert queue.claim(prefer=second)["id"] == second
+    assert queue.claim()["id"] == first
+    assert queue.claim() is None
+    assert _status(queue) == {first: ("running", 1), second: ("running", 1)}
+
+
+def test_fail_retries_until_max_attempts(queue, scripts):
+    queue.enqueue(scripts[0], "h")
+    job = queue.claim()
+    queue.fail(job["id"], "boom", max_attempts=2)
+    assert _status(queue)[job["id"]] == ("pending", 1)
+    queue.claim()
+    queue.fail(job["id"], "boom", max_attempts=2)
+    assert _status(queue)[job["id"]] == ("failed", 2)
+    assert queue.claim() is None
+
+    assert queue.retry_failed() == 1
+    assert _status(queue)[job["id"]] == ("pending", 0)
+
+
+def test_release_does_not_use_up_an_attempt(queue, scripts):
+    queue.enqueue(scripts[0], "h")
+    job = queue.claim()
+    queue.release(job["id"])
+    assert _status(queue)[job["id"]] == ("pending", 0)
+
+
+def test_spec_is_compiled_into_the_farm(queue, tmp_path):
+    spec = tmp_path / "paper.toml"
+    shutil.copyfile(TEMPLATE, spec)
+    queue.enqueue(spec, "l")
+    row = queue.rows()[0]
+    assert row["source"] == str(spec)
+    assert row["script"].startswith(str(queue.farm_dir / "compiled"))
+    assert row["scene"] == "PaperVideo"
+
+
+def test_discover_keeps_scripts_and_specs_only(tmp_path, scripts):
+    shutil.copyfile(TEMPLATE, tmp_path / "paper.toml")
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+    (tmp_path / "report.json").write_text(json.dumps({"runs": []}))
+    (tmp_path / "helpers.py").write_text("def f():\n    pass\n")
+    farm = tmp_path / "farm"
+    farm.mkdir()
+    (farm / "compiled.py").write_text(scripts[0].read_text())
+
+    found = discover([tmp_path], skip=farm)
+    assert [p.name for p in found] == ["a_video.py", "b_video.py",
+                                       "paper.toml"]
+    # Named explicitly, a broken spec is queued and fails loudly
+    assert discover([tmp_path / "report.json"]) == [tmp_path / "report.json"]
+
+
+def test_resume_renders_into_the_same_segment_cache(tmp_path, demo_script):
+    farm = tmp_path / "farm"
+    Queue(farm).enqueue(demo_script, "h")
+    job = Queue(farm).claim()
+    before = _job_dir(farm, job["id"], job["source"])
+
+    # The farm dies mid-job; the next run reopens the queue
+    queue = Queue(farm)
+    assert queue.recover() == 1
+    job = queue.claim()
+    assert _job_dir(farm, job["id"], job["source"]) == before
+
+    # An edited script keeps its row, so its unchanged segments are reused
+    queue.finish(job["id"], dict.fromkeys(
+        ("wall", "video_s", "frames", "segments", "rendered", "rss_mb",
+         "output")))
+    demo_script.write_text(demo_script.read_text() + "\n# edit\n")
+    assert queue.enqueue(demo_script, "h") == "pending"
+    job = queue.claim()
+    assert _job_dir(farm, job["id"], job["source"]) == before
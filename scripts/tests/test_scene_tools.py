@@ -0,0 +1,52 @@
+from conftest import segment_keys
+from scene_tools import (
+    global_refs, load_module, segment_fingerprint, split_construct,
+)
+
+
+def test_keys_match_across_processes(demo_script):
+    assert segment_keys(demo_script) == segment_keys(demo_script)
+
+
+def test_cache_objects_are_not_keyed(demo_script):
+    module = load_module(demo_script)
+    plan = split_construct(module.DemoVideo)
+    refs = segment_fingerprint(plan, plan.segments[0])["globals"]
+    assert "GLYPHS" not in refs
+    assert all("0x" not in text for text in refs.values())
+
+
+def test_class_attribute_keys_the_value_only(demo_script):
+    module = load_module(demo_script)
+    plan = split_construct(module.DemoVideo)
+    refs = segment_fingerprint(plan, plan.segments[0])["globals"]
+    assert refs["DemoVideo.FONT"] == "'Inter'"
+    assert "DemoVideo" not in refs
+
+
+def test_globals_are_followed_through_helpers(demo_script):
+    module = load_module(demo_script)
+    refs = global_refs(module, [], owner=None)
+    assert refs == {}
+    plan = split_construct(module.DemoVideo)
+    chart = segment_fingerprint(plan, plan.segments[1])["globals"]
+    assert {"BarSet", "bar_points", "ARC", "LABEL_LEFT"} <= set(chart)
+
+
+def test_helper_edit_invalidates_only_its_users(demo_script):
+    before = segment_keys(demo_script)
+    demo_script.write_text(demo_script.read_text().replace(
+        "ARC = 0.5523", "ARC = 0.55"))
+    after = segment_keys(demo_script)
+    changed = {name for name in before if before[name] != after[name]}
+    assert changed == {"scene_2_chart"}
+
+
+def test_class_attribute_edit_invalidates_every_reader(demo_script):
+    before = segment_keys(demo_script)
+    demo_script.write_text(demo_script.read_text().replace(
+        'FONT = "Inter"', 'FONT = "Roboto"'))
+    after = segment_keys(demo_script)
+    changed = {name for name in before if before[name] != after[name]}
+    # every segment ends in a wipe, and the wipe labels with txt()
+    assert changed == set(before)
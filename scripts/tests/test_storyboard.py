@@ -0,0 +1,65 @@
+import ast
+
+import numpy as np
+import pytest
+
+from storyboard import (
+    compile_script, frame_count, parse_spec, placeholders, timing,
+)
+
+
+def _spec(*beats, budget=(0, 60)):
+    return parse_spec({
+        "video": {"budget": list(budget), "wipe": 0.5},
+        "scenes": [
+            {"name": "hook", "beats": list(beats)},
+            {"name": "closing", "beats": [{"wait": 1.0}]},
+        ],
+    })
+
+
+@pytest.mark.parametrize("seconds", [0.1, 0.5, 0.6, 1.0, 1.2, 2.5])
+@pytest.mark.parametrize("fps", [15, 30, 60])
+def test_play_frames_match_manim_time_progression(seconds, fps):
+    assert frame_count(seconds, fps) == len(np.arange(0, seconds, 1 / fps))
+
+
+@pytest.mark.parametrize("seconds", [0.1, 0.5, 1.0, 1.5, 2.3])
+@pytest.mark.parametrize("fps", [15, 30, 60])
+def test_wait_frames_round_down_like_a_frozen_frame(seconds, fps):
+    dt = 1 / fps
+    assert frame_count(seconds, fps, wait=True) == int(seconds / dt)
+
+
+def test_timing_counts_waits_and_wipes():
+    board = _spec({"run_time": 1.01}, {"wait": 1.01})
+    report = timing(board, fps=15)
+    hook = report["scenes"][0]
+    # play 1.01 s -> 16 frames, wait 1.01 s -> 15 frames, wipe 0.5 s -> 8
+    assert hook["ms"] == round(31 * 1000 / 15)
+    assert hook["wipe_ms"] == round(8 * 1000 / 15)
+    assert report["total_ms"] == round((31 + 8 + 15) * 1000 / 15)
+    assert report["ok"]
+
+
+def test_timing_flags_out_of_budget():
+    assert not timing(_spec({"run_time": 1.0}, budget=(25, 35)))["ok"]
+
+
+def test_beats_without_code_compile_to_placeholder_plays():
+    board = _spec({"run_time": 0.8, "say": "Counter rolls up"},
+                  {"run_time": 0.6, "code": ["FadeIn(title)"]},
+                  {"wait": 1.0})
+    assert placeholders(board) == ["scene_1_hook beat 1"]
+
+    src = compile_script(board)
+    assert "TODO" not in src
+    method = next(node for node in ast.walk(ast.parse(src))
+                  if isinstance(node, ast.FunctionDef)
+                  and node.name == "scene_1_hook")
+    plays = [ast.unparse(node) for node in ast.walk(method)
+             if isinstance(node, ast.Call)
+             and ast.unparse(node.func) == "self.play"]
+    assert len(plays) == 2
+    assert "remover=True" in plays[0] and "run_time=0.8" in plays[0]
+    assert "'beat 1: Counter rolls up'" in ast.unparse(method)
@@ -0,0 +1,42 @@
+from conftest import segment_keys
+from scene_tools import load_module, segment_fingerprint, split_construct
+from watch_preview import changes
+
+
+def _prints(script):
+    # Watcher.build re-loads the script in the same process on each save
+    plan = split_construct(load_module(script).DemoVideo)
+    return {seg.name: segment_fingerprint(plan, seg) for seg in plan.segments}
+
+
+def _edit(script, old, new):
+    text = script.read_text()
+    assert text.count(old) == 1
+    script.write_text(text.replace(old, new))
+
+
+def test_unchanged_script_reports_nothing(demo_script):
+    old, new = _prints(demo_script), _prints(demo_script)
+    assert all(changes(old[name], new[name]) == [] for name in old)
+
+
+def test_scene_edit_marks_one_segment_stale(demo_script):
+    before = segment_keys(demo_script)
+    old = _prints(demo_script)
+    _edit(demo_script, 'self.txt("hook")', 'self.txt("a new hook")')
+    after = segment_keys(demo_script)
+    new = _prints(demo_script)
+
+    stale = {name for name in before if before[name] != after[name]}
+    assert stale == {"scene_1_hook"}
+    assert changes(old["scene_1_hook"], new["scene_1_hook"]) == [
+        "scene_1_hook"]
+
+
+def test_helper_edit_names_the_helper(demo_script):
+    old = _prints(demo_script)
+    _edit(demo_script, "return [width * ARC]", "return [width * ARC * 2]")
+    new = _prints(demo_script)
+    assert changes(old["scene_2_chart"], new["scene_2_chart"]) == [
+        "bar_points"]
+    assert changes(old["scene_3_outro"], new["scene_3_outro"]) == []
@@ -0,0 +1,292 @@
+"""Batch-compile a script's MathTex/Tex formulas into a shared cache.
+
+Manim compiles every formula on its own: one latex run and one dvisvgm
+run per MathTex, each paying process start-up and TeX's format load. A
+script with a dozen equations pays that a dozen times, in the dry run
+and again in every render process. This pre-pass finds the
+MathTex/Tex/SingleStringMathTex/Title/BulletedList calls in a script
+whose arguments are known without running construct() (literals, module
+constants, f-strings of those, loops over module data), builds each
+one's TeX code exactly as Manim would, and compiles every formula that
+is not cached yet as one page of a single document: one latex run, one
+dvisvgm run for all pages.
+
+Each SVG is stored in a content-addressed cache (TEX_CACHE_DIR, default
+media/tex_cache) keyed by the full TeX code, compiler and output format,
+so scripts share formulas across runs and projects. The SVGs are then
+linked into Manim's Tex directory under the name Manim looks up
+(tex_hash of the TeX code), and MathTex finds them without compiling.
+
+Usage:
+  python scripts/tex_cache.py script.py
+  python scripts/tex_cache.py script.py --media-dir media --list
+
+render_segments.py (and so watch_preview.py and render_farm.py) run this
+pass before the dry run. Formulas it cannot find - built from local
+variables, or in a batch page that failed - compile as usual.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from scene_tools import literal_calls, load_module
+
+TEX_CACHE_DIR = os.environ.get("TEX_CACHE_DIR", "media/tex_cache")
+
+# Mobjects that compile their whole TeX string in one latex run
+TEX_CLASSES = {"MathTex", "Tex", "SingleStringMathTex", "Title",
+               "BulletedList"}
+
+_STANDALONE = re.compile(r"\\documentclass(\[([^\]]*)\])?\{standalone\}")
+_BEGIN, _END = r"\begin{document}", r"\end{document}"
+
+
+@dataclass
+class Formula:
+    """One compiled TeX string, as Manim would write it."""
+
+    line: int
+    code: str             # the full .tex document
+    compiler: str
+    output_format: str    # ".dvi", ".xdv" or ".pdf"
+
+    @property
+    def manim_name(self):
+        from manim.utils.tex_file_writing import tex_hash
+
+        return tex_hash(self.code) + ".svg"
+
+    @property
+    def key(self):
+        h = hashlib.sha256()
+        for part in (self.code, self.compiler, self.output_format):
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.hexdigest()[:24]
+
+
+# ── Finding formulas ─────────────────────────────────────────────────
+
+class _Recorded(Exception):
+    pass
+
+
+def collect(script, module=None):
+    """Formulas of the script, in source order, without duplicates.
+
+    Each call is run through the real Manim class up to the point where
+    it asks for its SVG, so arg_separator, tex_environment, substring
+    splitting and the script's tex_template all apply as in a render.
+    """
+    import manim
+    from manim import config
+    from manim.mobject.text import tex_mobject
+
+    module = module or load_module(script)
+    found = {}
+
+    def record(expression, environment=None, tex_template=None):
+        template = tex_template or config["tex_template"]
+        if environment is not None:
+            code = template.get_texcode_for_expression_in_env(
+                expression, environment)
+        else:
+            code = template.get_texcode_for_expression(expression)
+        raise _Recorded(code, template.tex_compiler, template.output_format)
+
+    stock = tex_mobject.tex_to_svg_file
+    tex_mobject.tex_to_svg_file = record
+    try:
+        for line, name, args, kwargs in literal_calls(module, script,
+                                                      TEX_CLASSES):
+            try:
+                getattr(manim, name)(*args, **kwargs)
+            except _Recorded as rec:
+                formula = Formula(line, *rec.args)
+                found.setdefault(formula.key, formula)
+            except Exception:
+                continue    # invalid call: the render will report it
+    finally:
+        tex_mobject.tex_to_svg_file = stock
+    return list(found.values())
+
+
+# ── Batch compilation ────────────────────────────────────────────────
+
+def _split(code):
+    """(head, page): the document before \\begin{document} and the body
+    between it and \\end{document}."""
+    head, _, rest = code.partition(_BEGIN)
+    page, _, _ = rest.rpartition(_END)
+    return head, page
+
+
+def batch_document(formulas):
+    """One document with a page per formula. All formulas must share
+    the head (document class and preamble)."""
+    head, _ = _split(formulas[0].code)
+    pages = [_split(f.code)[1] for f in formulas]
+    match = _STANDALONE.search(head)
+    if match:
+        # standalone crops each `standalone` environment to its own page
+        # under `multi`, the same box it draws round a whole document
+        options = ",".join(filter(None, [match.group(2), "multi"]))
+        head = (head[:match.start()]
+                + rf"\documentclass[{options}]{{standalone}}"
+                + head[match.end():])
+        body = "\n".join(rf"\begin{{standalone}}{p}\end{{standalone}}"
+                         for p in pages)
+    else:
+        body = "\n\\clearpage\n".join(pages)
+    return f"{head}{_BEGIN}\n{body}\n{_END}\n"
+
+
+def _compile(formulas, workdir):
+    """Compile one batch. Returns the per-page SVGs in order, or None if
+    LaTeX failed or the page count does not match."""
+    from manim.utils.tex_file_writing import make_tex_compilation_command
+
+    first = formulas[0]
+    tex_file = workdir / "batch.tex"
+    tex_file.write_text(batch_document(formulas), encoding="utf-8")
+    command = make_tex_compilation_command(
+        first.compiler, first.output_format, tex_file, workdir)
+    if subprocess.run(command, stdout=subprocess.DEVNULL).returncode != 0:
+        return None
+    dvi = tex_file.with_suffix(first.output_format)
+    subprocess.run([
+        "dvisvgm",
+        *(["--pdf"] if first.output_format == ".pdf" else []),
+        "--page=1-",
+        "--no-fonts",
+        "--verbosity=0",
+        f"--output={(workdir / 'page-%p.svg').as_posix()}",
+        dvi.as_posix(),
+    ], stdout=subprocess.DEVNULL)
+    svgs = sorted(workdir.glob("page-*.svg"),
+                  key=lambda p: int(p.stem.rpartition("-")[2]))
+    return svgs if len(svgs) == len(formulas) else None
+
+
+def compile_batch(formulas, cache_dir):
+    """Compile `formulas` (one head) into the cache. A failed batch is
+    split in half until the failing formulas are isolated; those are
+    returned and left to Manim, which reports the LaTeX error."""
+    with tempfile.TemporaryDirectory(prefix="tex-batch-") as tmp:
+        svgs = _compile(formulas, Path(tmp))
+        if svgs is not None:
+            for formula, svg in zip(formulas, svgs):
+                _store(svg, cache_dir / f"{formula.key}.svg")
+            return []
+    if len(formulas) == 1:
+        return formulas
+    mid = len(formulas) // 2
+    return (compile_batch(formulas[:mid], cache_dir)
+            + compile_batch(formulas[mid:], cache_dir))
+
+
+def _store(src, dst):
+    """Copy atomically: concurrent renders may share the directory."""
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _link(src, dst):
+    if dst.exists():
+        return
+    try:
+        os.link(src, dst)
+    except OSError:    # another filesystem, or already linked
+        _store(src, dst)
+
+
+# ── Entry points ─────────────────────────────────────────────────────
+
+def warm_tex(script, tex_dirs=None, cache_dir=None, module=None):
+    """Make every findable formula of `script` a cache hit for Manim.
+
+    tex_dirs are the Manim Tex directories to link into (default: the
+    current config's); pass `module` if the script is already loaded.
+    Returns a stats dict.
+    """
+    from manim import config
+
+    t0 = time.perf_counter()
+    cache_dir = Path(cache_dir or TEX_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tex_dirs = dict.fromkeys(Path(d) for d in
+                             tex_dirs or [config.get_dir("tex_dir")])
+    formulas = collect(script, module)
+
+    missing = [f for f in formulas
+               if not (cache_dir / f"{f.key}.svg").exists()]
+    groups = {}
+    for f in missing:
+        head = _split(f.code)[0]
+        groups.setdefault((head, f.compiler, f.output_format), []).append(f)
+    failed = []
+    for (_, compiler, _), batch in groups.items():
+        if shutil.which(compiler) and shutil.which("dvisvgm"):
+            failed += compile_batch(batch, cache_dir)
+        else:
+            failed += batch
+
+    linked = 0
+    for tex_dir in tex_dirs:
+        tex_dir.mkdir(parents=True, exist_ok=True)
+        for f in formulas:
+            cached = cache_dir / f"{f.key}.svg"
+            if cached.exists():
+                _link(cached, tex_dir / f.manim_name)
+                linked += 1
+    return {
+        "formulas": len(formulas),
+        "cached": len(formulas) - len(missing),
+        "compiled": len(missing) - len(failed),
+        "batches": len(groups),
+        "failed": [f.line for f in failed],
+        "linked": linked,
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("script", help="path to the Manim script")
+    parser.add_argument("--media-dir", default="media",
+                        help="Manim media directory (default: media)")
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"shared SVG cache (default: {TEX_CACHE_DIR})")
+    parser.add_argument("--list", action="store_true",
+                        help="print the formulas found and exit")
+    args = parser.parse_args(argv)
+
+    from manim import config
+
+    if args.list:
+        for f in collect(args.script):
+            print(f"  line {f.line:<5} {f.key}  {_split(f.code)[1].strip()}")
+        return 0
+    tex_dir = config.get_dir("tex_dir", media_dir=args.media_dir)
+    stats = warm_tex(args.script, [tex_dir], args.cache_dir)
+    print(f"{stats['formulas']} formulas: {stats['cached']} cached, "
+          f"{stats['compiled']} compiled in {stats['batches']} batch(es), "
+          f"{len(stats['failed'])} left to Manim "
+          f"({stats['seconds']:.2f}s) -> {tex_dir}")
+    for line in stats["failed"]:
+        print(f"  line {line}: not batch-compiled", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
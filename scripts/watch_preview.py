@@ -0,0 +1,135 @@
+"""Watch a script and keep its preview video up to date.
+
+Builds the segmented preview once (render_segments.py's cache, -ql by
+default), then polls the script. On every save it re-keys the segments,
+re-renders only the ones whose key changed and splices them back into
+the preview with the concat demuxer. It also prints what changed: the
+scene method, a helper it calls, a data tuple it reads, or the state
+handed in by the scene before it.
+
+Staying in one process keeps Manim imported and its font state warm,
+so a save costs one dry run of construct() plus the edited scene.
+
+Usage:
+  python scripts/watch_preview.py script.py PaperVideo
+  python scripts/watch_preview.py script.py PaperVideo -qm --interval 0.5
+
+The preview is media/segments/<Class>/<height>p<fps>/<Class>.mp4, the
+same file render_segments.py writes. Ctrl-C stops watching.
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+import traceback
+
+from render_segments import plan_build, render_job, stitch
+from scene_tools import add_render_args, segment_fingerprint
+
+
+def changes(old, new):
+    """Names of what differs between two segment fingerprints."""
+    if old is None:
+        return ["new"]
+    found = []
+    for part in ("statements", "preamble"):
+        if old[part] != new[part]:
+            found.append(part)
+    for part in ("methods", "globals"):
+        for name in sorted(old[part].keys() | new[part].keys()):
+            if old[part].get(name) != new[part].get(name):
+                found.append(name)
+    return found
+
+
+def _mtime(path):
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class Watcher:
+    def __init__(self, script, scene_name, quality, media_dir):
+        self.script = Path(script)
+        self.scene_name = scene_name
+        self.quality = quality
+        self.media_dir = media_dir
+        self.prints = {}     # segment name -> fingerprint of the last build
+
+    def build(self):
+        """Re-key, render what is stale, splice. Returns the preview path."""
+        t0 = time.perf_counter()
+        build = plan_build(self.script, self.scene_name, self.quality,
+                           self.media_dir)
+        t_plan = time.perf_counter() - t0
+
+        prints = {seg.name: segment_fingerprint(build.plan, seg)
+                  for seg in build.plan.segments}
+        for job in build.jobs:
+            if not job.stale:
+                continue
+            name = job.segment.name
+            why = changes(self.prints.get(name), prints[name]) or ["state"]
+            t1 = time.perf_counter()
+            render_job(build, job)
+            job.seconds = time.perf_counter() - t1
+            print(f"  [{job.segment.index}] {name:<24} {job.seconds:5.1f}s  "
+                  f"({', '.join(why)})")
+        output = stitch(build)
+        self.prints = prints
+
+        n = sum(job.stale for job in build.jobs)
+        print(f"preview updated in {time.perf_counter() - t0:.2f}s "
+              f"(plan {t_plan:.2f}s, {n}/{len(build.jobs)} segments) "
+              f"-> {output}")
+        return output
+
+    def watch(self, interval=0.25):
+        self._try_build()
+        seen = _mtime(self.script)
+        print(f"watching {self.script} (Ctrl-C to stop)")
+        while True:
+            time.sleep(interval)
+            mtime = _mtime(self.script)
+            if mtime is None or mtime == seen:
+                continue
+            # Editors often save in two writes: wait for the file to settle
+            time.sleep(0.05)
+            if _mtime(self.script) != mtime:
+                continue
+            seen = mtime
+            self._try_build()
+
+    def _try_build(self):
+        try:
+            self.build()
+        except (Exception, SystemExit):
+            # A half-typed edit must not end the session
+            traceback.print_exc(limit=-3)
+            print("build failed - waiting for the next save", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_render_args(parser)
+    parser.add_argument("--interval", type=float, default=0.25,
+                        help="seconds between checks of the script")
+    parser.add_argument("--once", action="store_true",
+                        help="build the preview once and exit")
+    args = parser.parse_args(argv)
+
+    watcher = Watcher(args.script, args.scene, args.quality, args.media_dir)
+    if args.once:
+        watcher.build()
+        return 0
+    try:
+        watcher.watch(args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())